@@ -38,14 +38,99 @@ import time
 import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Mapping
 
 from ..core import get_logger
 
 logger = get_logger("mock")
 
-
-@dataclass
+# 响应体支持的模板变量 / Template variables supported in response bodies
+_TEMPLATE_TOKENS = ("uuid", "timestamp")
+
+# 路由路径参数，如 /users/{id} / Route path parameters such as /users/{id}
+_PATH_PARAM_RE = re.compile(r"\{([^}]+)\}")
+
+
+def _compile_path(path: str) -> re.Pattern[str]:
+    """
+    将路由路径编译为正则 / Compile a route path into a regex
+
+    字面片段一律经 re.escape 转义，参数只展开为 [^/]+，因此用户提供的路径
+    无法引入回溯爆炸（ReDoS），匹配耗时与请求路径长度呈线性关系。
+    Literal segments are always re.escape'd and parameters only expand to
+    [^/]+, so user-supplied paths cannot introduce catastrophic backtracking
+    and match time stays linear in the request path length.
+    """
+    parts = _PATH_PARAM_RE.split(path)
+    # split 结果中偶数下标为字面片段，奇数下标为参数名
+    pattern = "".join(
+        f"(?P<{part}>[^/]+)" if i % 2 else re.escape(part)
+        for i, part in enumerate(parts)
+    )
+    return re.compile(f"^{pattern}$", re.ASCII)
+
+
+def _compile_template(value: str) -> str | None:
+    """
+    将含 {{uuid}}/{{timestamp}} 的字符串转换为 format_map 格式串
+    / Convert a templated string into a format_map format string
+
+    Returns:
+        格式串；不含模板变量时返回 None / Format string, or None if untemplated
+    """
+    if "{{" not in value:
+        return None
+
+    # 先转义所有花括号，再还原受支持的模板变量
+    fmt = value.replace("{", "{{").replace("}", "}}")
+    templated = False
+    for token in _TEMPLATE_TOKENS:
+        marker = "{{{{" + token + "}}}}"
+        if marker in fmt:
+            fmt = fmt.replace(marker, "{" + token + "}")
+            templated = True
+    return fmt if templated else None
+
+
+def _compile_template_plan(data: dict[str, Any]) -> dict[str, str]:
+    """为字典中的模板字符串生成格式串映射 / Build key -> format string plan"""
+    plan = {}
+    for key, value in data.items():
+        if isinstance(value, str):
+            fmt = _compile_template(value)
+            if fmt is not None:
+                plan[key] = fmt
+    return plan
+
+
+class _TemplateValues:
+    """
+    按需生成模板变量值 / Lazily produce template variable values
+
+    同一次渲染内 {{uuid}} 与 {{timestamp}} 均只生成一次，所有出现处取相同值。
+    Within one render {{uuid}} and {{timestamp}} are produced once and
+    shared by every occurrence.
+    """
+
+    __slots__ = ("_uuid", "_timestamp")
+
+    def __init__(self) -> None:
+        self._uuid: str | None = None
+        self._timestamp: str | None = None
+
+    def __getitem__(self, key: str) -> str:
+        if key == "uuid":
+            if self._uuid is None:
+                self._uuid = str(uuid.uuid4())
+            return self._uuid
+        if key == "timestamp":
+            if self._timestamp is None:
+                self._timestamp = str(int(time.time()))
+            return self._timestamp
+        raise KeyError(key)
+
+
+@dataclass(slots=True)
 class MockRoute:
     """Mock路由定义 / Mock route definition"""
 
@@ -53,7 +138,115 @@ class MockRoute:
     method: str
     response: dict[str, Any]
     when: dict[str, Any] | None = None
-    route_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    route_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    _header_conds: list[tuple[str, Any]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _template_plan: dict[str, str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _is_literal: bool = field(default=True, init=False, repr=False, compare=False)
+    _regex: re.Pattern[str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _status: int = field(default=200, init=False, repr=False, compare=False)
+    _encoded_body: bytes | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _response_headers: dict[str, str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # 不含路径参数的路由直接比较字符串，否则预编译正则
+        self._is_literal = _PATH_PARAM_RE.search(self.path) is None
+        if not self._is_literal:
+            self._regex = _compile_path(self.path)
+
+        # 预解析header条件为 (小写键, 期望值) 列表，避免每次请求重复处理
+        if self.when and "headers" in self.when:
+            self._header_conds = [
+                (key.lower(), value) for key, value in self.when["headers"].items()
+            ]
+
+        self._prepare_response()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        # 构造完成后重新赋值 response 时同步刷新预编码结果；
+        # _response_headers 是最后一个槽位，构造期间尚未赋值
+        if name == "response" and hasattr(self, "_response_headers"):
+            self._prepare_response()
+
+    def _prepare_response(self) -> None:
+        """
+        预处理响应状态码、模板与静态响应体 / Precompute status, templates and static body
+
+        静态响应体按 Flask jsonify 的输出预先编码（sort_keys、紧凑分隔符、
+        结尾换行），请求时直接复用字节与响应头。
+        Static bodies are pre-encoded exactly as Flask's jsonify renders them
+        (sorted keys, compact separators, trailing newline) and reused as is.
+        """
+        # 预编译响应体中的模板字符串，无模板的路由在请求时直接跳过
+        self._status = self.response.get("status", 200)
+        body = self.response.get("body", {})
+        self._template_plan = (
+            _compile_template_plan(body) if isinstance(body, dict) else None
+        )
+        self._encoded_body = None
+        self._response_headers = None
+
+        if not self._template_plan:
+            try:
+                encoded = json.dumps(body, sort_keys=True, separators=(",", ":"))
+            except (TypeError, ValueError):
+                return
+            self._encoded_body = (encoded + "\n").encode("utf-8")
+            self._response_headers = {
+                "Content-Type": "application/json",
+                "Content-Length": str(len(self._encoded_body)),
+            }
+
+    def match_target(self, path: str, method_upper: str) -> bool:
+        """检查路径和方法是否匹配 / Check if path and method match"""
+        if self.method != method_upper:
+            return False
+        if self._is_literal:
+            return self.path == path
+        return self._regex is not None and self._regex.match(path) is not None
+
+    def check_conditions(
+        self, headers: Mapping[str, str], get_body: Callable[[], Any]
+    ) -> bool:
+        """
+        检查条件是否满足 / Check if conditions are met
+
+        headers 须为键已小写化的映射；请求体仅在存在body条件时才求值。
+        headers must have lower-cased keys; the body is only evaluated
+        when there is a body condition.
+        """
+        when = self.when
+        if not when:
+            return True
+
+        # 检查headers条件
+        if self._header_conds:
+            for key, value in self._header_conds:
+                if headers.get(key) != value:
+                    return False
+
+        # 检查body条件（简化实现）
+        if "body" in when:
+            body = get_body()
+            if not body:
+                return True
+            condition = when["body"]
+            if isinstance(condition, dict) and isinstance(body, dict):
+                for key, value in condition.items():
+                    if body.get(key) != value:
+                        return False
+
+        return True
 
     def to_dict(self) -> dict[str, Any]:
         """转换为字典 / Convert to dictionary"""
@@ -78,7 +271,7 @@ class MockRoute:
         return route
 
 
-@dataclass
+@dataclass(slots=True)
 class MockRequest:
     """Mock请求记录 / Mock request record"""
 
@@ -87,7 +280,7 @@ class MockRequest:
     headers: dict[str, str]
     body: Any
     timestamp: float = field(default_factory=time.time)
-    request_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    request_id: str = field(default_factory=lambda: uuid.uuid4().hex)
 
     def to_dict(self) -> dict[str, Any]:
         """转换为字典 / Convert to dictionary"""
@@ -101,15 +294,21 @@ class MockRequest:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class MockConfig:
-    """Mock服务器配置 / Mock server configuration"""
+    """
+    Mock服务器配置 / Mock server configuration
+
+    request_history_limit 为 0 时不记录请求历史。
+    A request_history_limit of 0 disables request history tracking.
+    """
 
     name: str
     port: int = 8080
     host: str = "127.0.0.1"
     routes: list[MockRoute] = field(default_factory=list)
     request_history_limit: int = 1000
+    record_headers: bool = True
 
     def to_dict(self) -> dict[str, Any]:
         """转换为字典 / Convert to dictionary"""
@@ -119,6 +318,7 @@ class MockConfig:
             "host": self.host,
             "routes": [route.to_dict() for route in self.routes],
             "request_history_limit": self.request_history_limit,
+            "record_headers": self.record_headers,
         }
 
     @classmethod
@@ -131,6 +331,7 @@ class MockConfig:
             host=data.get("host", "127.0.0.1"),
             routes=[MockRoute.from_dict(route) for route in routes_data],
             request_history_limit=data.get("request_history_limit", 1000),
+            record_headers=data.get("record_headers", True),
         )
 
 
@@ -186,71 +387,58 @@ class MockServer:
         return False
 
     def find_matching_route(
-        self, path: str, method: str, headers: dict[str, str], body: Any
+        self, path: str, method: str, headers: Mapping[str, str], body: Any
     ) -> MockRoute | None:
         """
         查找匹配的路由 / Find matching route
 
         根据路径、方法和条件匹配查找最合适的路由。
         Finds the most appropriate route based on path, method, and conditions.
-        """
-        # 先匹配路径和方法
-        matching_routes = [
-            r
-            for r in self.config.routes
-            if self._path_matches(r.path, path) and r.method == method.upper()
-        ]
-
-        if not matching_routes:
-            return None
-
-        # 如果有条件匹配，筛选最匹配的
-        for route in matching_routes:
-            if route.when and self._check_conditions(route.when, headers, body):
-                return route
-
-        # 返回第一个无条件的匹配路由
-        for route in matching_routes:
-            if not route.when:
-                return route
-
-        return matching_routes[0] if matching_routes else None
-
-    def _path_matches(self, route_path: str, request_path: str) -> bool:
-        """检查路径是否匹配 / Check if paths match"""
-        # 支持简单的路径参数，如 /users/{id}
-        pattern = route_path.replace("{", "(?P<").replace("}", ">[^/]+)")
-        pattern = f"^{pattern}$"
-        return bool(re.match(pattern, request_path))
-
-    def _check_conditions(
-        self, when: dict[str, Any], headers: dict[str, str], body: Any
-    ) -> bool:
-        """检查条件是否满足 / Check if conditions are met"""
-        # 检查headers条件
-        if "headers" in when:
-            for key, value in when["headers"].items():
-                if headers.get(key) != value:
-                    return False
-
-        # 检查body条件（简化实现）
-        if "body" in when and body:
-            condition = when["body"]
-            if isinstance(condition, dict):
-                for key, value in condition.items():
-                    if isinstance(body, dict) and body.get(key) != value:
-                        return False
 
-        return True
+        Args:
+            path: 请求路径 / Request path
+            method: HTTP方法 / HTTP method
+            headers: 请求头映射 / Request header mapping
+            body: 请求体，或返回请求体的零参可调用对象（仅在需要时求值）
+                / Request body, or a zero-arg callable returning it
+                (evaluated only when a body condition needs it)
+        """
+        method_upper = method.upper()
+        get_body: Callable[[], Any] = body if callable(body) else (lambda: body)
+
+        # 单次遍历：条件匹配的路由优先，其次是第一个无条件路由
+        first_match: MockRoute | None = None
+        first_unconditional: MockRoute | None = None
+        lower_headers: dict[str, Any] | None = None
+        for route in self.config.routes:
+            if not route.match_target(path, method_upper):
+                continue
+
+            if first_match is None:
+                first_match = route
+
+            if route.when:
+                if route._header_conds and lower_headers is None:
+                    # 每个请求最多构建一次小写header字典
+                    lower_headers = {k.lower(): v for k, v in headers.items()}
+                if route.check_conditions(lower_headers or {}, get_body):
+                    return route
+            elif first_unconditional is None:
+                first_unconditional = route
+
+        return first_unconditional if first_unconditional else first_match
 
     def _record_request(
-        self, method: str, path: str, headers: dict[str, str], body: Any
+        self, method: str, path: str, headers: Mapping[str, str], body: Any
     ) -> None:
         """记录请求 / Record request"""
+        if self.config.request_history_limit <= 0:
+            return
+
         request = MockRequest(
             method=method,
             path=path,
-            headers=headers,
+            headers=dict(headers) if self.config.record_headers else {},
             body=body,
         )
 
@@ -283,7 +471,7 @@ class MockServer:
             return
 
         try:
-            from flask import Flask, request, jsonify  # type: ignore[import-not-found]
+            from flask import Flask, Response, request, jsonify  # type: ignore[import-not-found]
         except ImportError:
             raise ImportError(
                 "Flask is required for mock server. Install with: pip install flask"
@@ -300,26 +488,45 @@ class MockServer:
 
         @self._app.route("/<path:path>", methods=["GET", "POST", "PUT", "DELETE"])
         def handle_request(path):
+            # method is already uppercase per WSGI spec
             method = request.method
-            headers = dict(request.headers)
-            body = request.get_json() if request.is_json else request.data.decode()
-
-            # 记录请求
-            self._record_request(method, f"/{path}", headers, body)
+            # request.headers 本身即为大小写不敏感映射，无需复制
+            headers = request.headers
+            body_cache: list[Any] = []
+
+            def get_body() -> Any:
+                # 延迟解析请求体，且每个请求最多解析一次
+                if not body_cache:
+                    body_cache.append(
+                        request.get_json() if request.is_json else request.data.decode()
+                    )
+                return body_cache[0]
+
+            # JSON请求体总是先解析，格式错误时 get_json 直接返回400
+            if request.is_json:
+                get_body()
+
+            # 记录请求（历史记录关闭时不解析请求体）
+            if self.config.request_history_limit > 0:
+                self._record_request(method, f"/{path}", headers, get_body())
 
             # 查找匹配的路由
-            route = self.find_matching_route(f"/{path}", method, headers, body)
+            route = self.find_matching_route(f"/{path}", method, headers, get_body)
 
             if route:
-                response_data = route.response
-                status_code = response_data.get("status", 200)
-                body_data = response_data.get("body", {})
+                # 静态响应直接返回预编码的字节
+                if route._encoded_body is not None:
+                    return Response(
+                        route._encoded_body,
+                        status=route._status,
+                        headers=route._response_headers,
+                    )
 
                 # 处理模板变量
-                if isinstance(body_data, dict):
-                    body_data = self._process_template(body_data)
-
-                return jsonify(body_data), status_code
+                body_data = self._process_template(
+                    route.response.get("body", {}), route._template_plan
+                )
+                return jsonify(body_data), route._status
             else:
                 return jsonify({"error": "No matching route"}), 404
 
@@ -368,17 +575,26 @@ class MockServer:
                 f"/ Mock server started"
             )
 
-    def _process_template(self, data: dict[str, Any]) -> dict[str, Any]:
-        """处理模板变量 / Process template variables"""
-        result = {}
-        for key, value in data.items():
-            if isinstance(value, str):
-                # 简单的模板替换
-                if "{{uuid}}" in value:
-                    value = value.replace("{{uuid}}", str(uuid.uuid4()))
-                if "{{timestamp}}" in value:
-                    value = value.replace("{{timestamp}}", str(int(time.time())))
-            result[key] = value
+    def _process_template(
+        self, data: dict[str, Any], plan: dict[str, str] | None = None
+    ) -> dict[str, Any]:
+        """
+        处理模板变量 / Process template variables
+
+        Args:
+            data: 响应体 / Response body
+            plan: 预编译的格式串映射，None 时现场编译
+                / Precompiled format strings; compiled on the fly if None
+        """
+        if plan is None:
+            plan = _compile_template_plan(data)
+        if not plan:
+            return data
+
+        result = dict(data)
+        values = _TemplateValues()
+        for key, fmt in plan.items():
+            result[key] = fmt.format_map(values)
         return result
 
     def stop(self) -> None:
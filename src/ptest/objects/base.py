@@ -7,6 +7,9 @@ from ..models import OBJECT_STATUS_STOPPED
 class BaseManagedObject(ABC):
     """被测对象基类"""
 
+    # 子类可声明自己的 __slots__ 以去掉实例 __dict__
+    __slots__ = ("name", "type_name", "status", "installed", "env_manager", "_log")
+
     def __init__(
         self,
         name: str,
@@ -18,6 +21,8 @@ class BaseManagedObject(ABC):
         self.status = OBJECT_STATUS_STOPPED
         self.installed = False
         self.env_manager = env_manager
+        # 直接持有日志器，省去每次日志调用的 env_manager.logger 属性链查找
+        self._log = env_manager.logger
 
     @abstractmethod
     def install(self, params: object) -> object:
@@ -43,3 +48,13 @@ class BaseManagedObject(ABC):
     def uninstall(self) -> object:
         """卸载对象"""
         pass
+
+    @staticmethod
+    def _format_result(result: tuple[bool, str]) -> str:
+        """将 (是否成功, 消息) 格式化为带 ✓/✗ 前缀的结果字符串"""
+        success, message = result
+        return f"{'✓' if success else '✗'} {message}"
+
+    def delete(self) -> object:
+        """删除对象（默认即卸载）"""
+        return self.uninstall()
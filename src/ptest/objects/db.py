@@ -1,8 +1,32 @@
 # ptest/objects/db.py
+import asyncio
+import importlib
+import itertools
+import json
+import queue
+import re
+import sys
+import threading
+from collections.abc import Mapping
+from contextlib import closing, contextmanager
 from .base import BaseManagedObject
-from typing import Dict, Any, Optional, Tuple
+from types import MappingProxyType, ModuleType, TracebackType
+from typing import (
+    Callable,
+    ClassVar,
+    Dict,
+    Any,
+    Iterable,
+    Iterator,
+    Optional,
+    Self,
+    Tuple,
+)
 from dataclasses import dataclass, field
 
+from ..core import get_logger
+from ..utils import json_loads as _json_loads
+
 try:
     from ..utils import get_colored_text
 except ImportError:
@@ -11,6 +35,9 @@ except ImportError:
         return str(text)
 
 
+logger = get_logger("objects.db")
+
+
 @dataclass
 class DatabaseConfig:
     """数据库配置类 - 提供类型安全的配置管理"""
@@ -70,10 +97,69 @@ class DatabaseConfig:
 # 内置数据库连接器已通过底部的注册完成
 # DatabaseRegistry.register 在文件末尾统一注册
 
+# 各驱动的候选模块（按优先级排列）
+_DRIVER_CANDIDATES: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+    {
+        "sqlite": ("sqlite3",),
+        "mysql": ("pymysql", "mysql.connector"),
+        "postgresql": ("psycopg2", "pg8000"),
+        "oracle": ("cx_Oracle", "oracledb"),
+        "sqlserver": ("pyodbc", "pymssql"),
+        "mongodb": ("pymongo",),
+    }
+)
+
+# 判断是否为SELECT查询，避免为 strip().upper() 复制整条SQL
+_SELECT_RE = re.compile(r"\s*SELECT\b", re.IGNORECASE)
+
+# 驱动原生的轻量存活检测（pymysql/mysql.connector 的 ping 不经过SQL解析）
+_PING: Dict[str, Callable[[Any], Any]] = {
+    "mysql": lambda conn: conn.ping(reconnect=True),
+}
+
+# 各驱动的能力标志（不随连接变化），替代每次查询时的 hasattr 探测；
+# 内置SQL驱动均遵循 DB-API 2.0，fetchmany/commit/rowcount 均可用
+_SQL_CAPS: Mapping[str, bool] = MappingProxyType(
+    {"fetchmany": True, "commit": True, "rowcount": True}
+)
+_DRIVER_CAPS: Mapping[str, Mapping[str, bool]] = MappingProxyType(
+    {
+        "sqlite": _SQL_CAPS,
+        "mysql": _SQL_CAPS,
+        "postgresql": _SQL_CAPS,
+        "oracle": _SQL_CAPS,
+        "sqlserver": _SQL_CAPS,
+    }
+)
+
+# SQL Server ODBC连接串模板
+_ODBC_TEMPLATE = "DRIVER={driver};SERVER={host};DATABASE={database};UID={uid};PWD={pwd}"
+
+
+def _odbc_quote(value: Any) -> str:
+    """按ODBC规则用花括号包裹含特殊字符的值，防止分号注入额外的连接键"""
+    text = str(value)
+    if any(ch in text for ch in ";{}") or text != text.strip():
+        return "{" + text.replace("}", "}}") + "}"
+    return text
+
+
+# 驱动缺失时提示安装的包
+_DRIVER_INSTALL_HINTS: Dict[str, str] = {
+    "sqlite": "sqlite3",
+    "mysql": "pymysql",
+    "postgresql": "psycopg2-binary",
+    "oracle": "cx_Oracle",
+    "sqlserver": "pyodbc",
+    "mongodb": "pymongo",
+}
+
 
 class DatabaseConnector:
     """数据库连接器基类"""
 
+    __slots__ = ("config",)
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
 
@@ -81,10 +167,21 @@ class DatabaseConnector:
         """建立数据库连接"""
         raise NotImplementedError("Subclasses must implement connect method")
 
-    def execute_query(self, query: str) -> Tuple[bool, Any]:
+    def execute_query(self, query: str, params: Any = None) -> Tuple[bool, Any]:
         """执行查询并返回结果"""
         raise NotImplementedError("Subclasses must implement execute_query method")
 
+    async def execute_query_async(
+        self, query: str, params: Any = None
+    ) -> Tuple[bool, Any]:
+        """在线程池中执行查询，不阻塞事件循环"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.execute_query, query, params)
+
+    def execute_many(self, query: str, param_rows: Iterable[Any]) -> Tuple[bool, Any]:
+        """用多行参数批量执行同一条语句"""
+        return self.execute_query(query, list(param_rows))
+
     def close(self):
         """关闭数据库连接"""
         raise NotImplementedError("Subclasses must implement close method")
@@ -97,7 +194,7 @@ class DatabaseConnector:
 class DatabaseRegistry:
     """数据库连接器注册表，支持动态注册和发现数据库类型"""
 
-    _connectors: dict[str, type] = {}
+    _connectors: ClassVar[dict[str, type]] = {}
 
     @classmethod
     def register(cls, db_type: str, connector_class):
@@ -125,197 +222,424 @@ class DatabaseRegistry:
         return connector_class(config)
 
 
+class _ConnectionPool:
+    """有界DBAPI连接池
+
+    空闲连接保存在容量为 pool_size 的队列中；并发需要时最多额外创建
+    max_overflow 个连接，归还时队列已满则直接关闭。连接全部借出时等待
+    timeout 秒后抛出 TimeoutError。
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        timeout: float = 30,
+        initial: Optional[list] = None,
+    ):
+        self._factory = factory
+        self._idle: "queue.Queue[Any]" = queue.Queue(maxsize=max(pool_size, 1))
+        self._max_connections = max(pool_size, 1) + max(max_overflow, 0)
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._closed = False
+        self._created = 0
+
+        for conn in initial or []:
+            self._idle.put_nowait(conn)
+            self._created += 1
+
+    def acquire(self) -> Any:
+        """借出一个连接，必要时新建"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self._max_connections
+            if can_create:
+                self._created += 1
+
+        if can_create:
+            try:
+                return self._factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self._timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No database connection available within {self._timeout}s"
+            )
+
+    def release(self, conn: Any) -> None:
+        """归还连接；连接池已关闭或已满时关闭该连接"""
+        if not self._closed:
+            try:
+                self._idle.put_nowait(conn)
+                return
+            except queue.Full:
+                pass
+        self._discard(conn)
+
+    def _discard(self, conn: Any) -> None:
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except Exception:
+            logger.debug("Failed to close pooled connection", exc_info=True)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """借出连接并在使用后自动归还"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """关闭所有空闲连接，借出中的连接在归还时关闭"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+class _RowStream:
+    """流式查询结果迭代器
+
+    迭代结束、出错、调用 close() 或退出 with 块时关闭游标并归还连接；
+    未迭代完的结果须显式 close() 或在 with 块中使用，否则会一直占住连接。
+    """
+
+    __slots__ = ("_conn", "_cursor", "_release", "_rows")
+
+    def __init__(
+        self,
+        rows: Iterator[Any],
+        conn: Any,
+        cursor: Any,
+        release: Callable[[Any], None],
+    ):
+        self._rows = rows
+        self._conn = conn
+        self._cursor = cursor
+        self._release = release
+
+    def __iter__(self) -> "_RowStream":
+        return self
+
+    def __next__(self) -> Any:
+        if self._conn is None:
+            raise StopIteration
+        try:
+            return next(self._rows)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """关闭游标并归还连接（可重复调用）"""
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            self._cursor.close()
+        except Exception:
+            logger.debug("Failed to close streaming cursor", exc_info=True)
+        self._release(conn)
+
+
 class GenericDatabaseConnector(DatabaseConnector):
-    """通用数据库连接器，支持通过配置自定义连接逻辑"""
+    """通用数据库连接器，支持通过配置自定义连接逻辑
+
+    SQL类驱动通过有界连接池执行查询，池参数取自配置中的 pool_size、
+    max_overflow、pool_timeout 与 pool_min_size；MongoDB 使用 pymongo
+    自带的连接池（maxPoolSize）。
+    """
+
+    # 驱动别名，在初始化时统一规范化
+    _DRIVER_ALIASES: ClassVar[Mapping[str, str]] = MappingProxyType(
+        {"postgres": "postgresql"}
+    )
+
+    # 配置键别名 -> 规范键，初始化时统一映射
+    _CONFIG_KEY_ALIASES: ClassVar[Mapping[str, str]] = MappingProxyType(
+        {
+            "user": "username",
+            "db": "database",
+            "db_file": "database",
+        }
+    )
+
+    # 驱动 -> 建立连接的方法名
+    _CONNECT_DISPATCH: ClassVar[Mapping[str, str]] = MappingProxyType(
+        {
+            "sqlite": "_connect_sqlite",
+            "mysql": "_connect_mysql",
+            "postgresql": "_connect_postgresql",
+            "oracle": "_connect_oracle",
+            "sqlserver": "_connect_sqlserver",
+            "mongodb": "_connect_mongodb",
+        }
+    )
+
+    __slots__ = (
+        "connection_module",
+        "connection",
+        "_pool",
+        "_collections",
+        "_odbc_conn_str",
+        "_caps",
+        "_driver",
+        "_is_mongo",
+        "_connect_fn",
+        "_setup_done",
+        "_async_limit",
+    )
+
+    # 服务端游标命名计数器
+    _cursor_counter = itertools.count()
+
+    # 进程级驱动模块注册表，在所有实例间共享；只缓存导入成功的模块，
+    # 进程内后来安装的驱动仍可被解析
+    _MODULE_REGISTRY: ClassVar[Dict[str, ModuleType]] = {}
+    _registry_lock = threading.Lock()
+
+    # 自定义 connection_module 的能力标志，按模块名探测一次后缓存
+    _probed_caps: ClassVar[Dict[str, Mapping[str, bool]]] = {}
 
     def __init__(self, config: Dict[str, Any]):
-        super().__init__(config)
+        super().__init__(self._normalize_config(config))
         self.connection_module = None
         self.connection = None
-        self._setup_connection()
+        self._pool: Optional[_ConnectionPool] = None
+        self._collections: Dict[Tuple[str, bool], Any] = {}
+        self._odbc_conn_str: Optional[str] = None
+        self._caps: Optional[Mapping[str, bool]] = None
+        self._normalize_driver()
+
+        # 热路径上反复使用的派生值，初始化时计算一次
+        self._driver: str = self.config.get("driver", "")
+        self._is_mongo = self._driver == "mongodb"
+        self._connect_fn: Callable[[], Any] = self._resolve_connect_fn()
+
+        # 驱动模块延迟到首次 connect() 时才导入
+        self._setup_done = False
+        self._async_limit: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def _normalize_config(cls, config: Dict[str, Any]) -> Dict[str, Any]:
+        """复制配置并将别名键映射为规范键
+
+        规范键缺失或为空值时才采用别名的值，避免空的 username 遮蔽有效的 user。
+        """
+        normalized = dict(config)
+        for alias, key in cls._CONFIG_KEY_ALIASES.items():
+            if alias in normalized:
+                value = normalized.pop(alias)
+                if normalized.get(key) in (None, ""):
+                    normalized[key] = value
+        return normalized
+
+    def _normalize_driver(self):
+        """一次性规范化驱动名（小写、别名、由db_type推断）"""
+        if "driver" in self.config:
+            raw = str(self.config["driver"]).lower()
+        elif "connection_module" not in self.config and self.config.get("db_type"):
+            raw = str(self.config["db_type"]).lower()
+        else:
+            return
+        self.config["driver"] = self._DRIVER_ALIASES.get(raw, raw)
 
     def _setup_connection(self):
-        """根据配置设置连接模块"""
+        """根据配置设置连接模块（仅导入当前驱动对应的模块）"""
         # 支持多种连接配置方式
         if "connection_module" in self.config:
             # 方式1：直接指定连接模块
             module_name = self.config["connection_module"]
             self.connection_module = self._import_module(module_name)
         elif "driver" in self.config:
-            # 方式2：通过driver配置自动选择连接方式
-            driver = self.config["driver"].lower()
-            if driver == "sqlite":
-                self._setup_sqlite()
-            elif driver == "mysql":
-                self._setup_mysql()
-            elif driver == "postgresql" or driver == "postgres":
-                self._setup_postgresql()
-            elif driver == "oracle":
-                self._setup_oracle()
-            elif driver == "sqlserver":
-                self._setup_sqlserver()
-            elif driver == "mongodb":
-                self._setup_mongodb()
-            else:
-                raise ValueError(f"Unsupported driver: {driver}")
+            # 方式2：通过driver配置自动选择连接方式（db_type已在初始化时映射为driver）
+            self.connection_module = type(self)._resolve_module(self.config["driver"])
         else:
-            # 方式3：通过db_type自动推断
-            db_type = self.config.get("db_type", "").lower()
-            if db_type:
-                self.config["driver"] = db_type
-                self._setup_connection()
-            else:
-                raise ValueError(
-                    "Must specify either 'connection_module', 'driver', or 'db_type' in config"
-                )
+            raise ValueError(
+                "Must specify either 'connection_module', 'driver', or 'db_type' in config"
+            )
 
-    def _import_module(self, module_name: str):
-        """动态导入模块"""
-        try:
-            import importlib
+    @staticmethod
+    def _import_module(module_name: str):
+        """动态导入模块（优先复用已加载的模块）"""
+        module = sys.modules.get(module_name)
+        if module is not None:
+            return module
 
+        try:
             return importlib.import_module(module_name)
         except ImportError as e:
             raise ImportError(f"Failed to import module '{module_name}': {str(e)}")
 
-    def _setup_sqlite(self):
-        """设置SQLite连接"""
-        import sqlite3
-
-        self.connection_module = sqlite3
-
-    def _setup_mysql(self):
-        """设置MySQL连接"""
-        try:
-            import pymysql  # type: ignore[import-untyped]
-
-            self.connection_module = pymysql
-        except ImportError:
-            try:
-                import mysql.connector  # type: ignore
-
-                self.connection_module = mysql.connector
-            except ImportError:
-                raise ImportError(
-                    "Neither pymysql nor mysql.connector is available. Install with: pip install pymysql"
-                )
-
-    def _setup_postgresql(self):
-        """设置PostgreSQL连接"""
-        try:
-            import psycopg2  # type: ignore
-
-            self.connection_module = psycopg2
-        except ImportError:
-            try:
-                import pg8000  # type: ignore
-
-                self.connection_module = pg8000
-            except ImportError:
-                raise ImportError(
-                    "Neither psycopg2 nor pg8000 is available. Install with: pip install psycopg2-binary"
-                )
-
-    def _setup_oracle(self):
-        """设置Oracle连接"""
-        try:
-            import cx_Oracle  # type: ignore
-
-            self.connection_module = cx_Oracle
-        except ImportError:
-            try:
-                import oracledb  # type: ignore
+    @classmethod
+    def _resolve_module(cls, driver: str) -> ModuleType:
+        """按候选列表解析驱动模块，结果登记到进程级注册表
 
-                self.connection_module = oracledb
-            except ImportError:
-                raise ImportError(
-                    "Neither cx_Oracle nor oracledb is available. Install with: pip install cx_Oracle"
-                )
+        注册表命中时直接返回，N 个实例的探测开销为 O(驱动数)。
+        """
+        module = cls._MODULE_REGISTRY.get(driver)
+        if module is not None:
+            return module
 
-    def _setup_sqlserver(self):
-        """设置SQL Server连接"""
-        try:
-            import pyodbc  # type: ignore
+        candidates = _DRIVER_CANDIDATES.get(driver)
+        if candidates is None:
+            raise ValueError(f"Unsupported driver: {driver}")
 
-            self.connection_module = pyodbc
-        except ImportError:
-            try:
-                import pymssql  # type: ignore
+        with cls._registry_lock:
+            # 等待锁期间可能已被其他线程解析
+            module = cls._MODULE_REGISTRY.get(driver)
+            if module is not None:
+                return module
+
+            for module_name in candidates:
+                try:
+                    module = cls._import_module(module_name)
+                except ImportError:
+                    continue
+                cls._MODULE_REGISTRY[driver] = module
+                return module
+
+        hint = _DRIVER_INSTALL_HINTS[driver]
+        if len(candidates) == 1:
+            raise ImportError(
+                f"{candidates[0]} is not available. Install with: pip install {hint}"
+            )
+        raise ImportError(
+            f"Neither {' nor '.join(candidates)} is available. "
+            f"Install with: pip install {hint}"
+        )
 
-                self.connection_module = pymssql
-            except ImportError:
-                raise ImportError(
-                    "Neither pyodbc nor pymssql is available. Install with: pip install pyodbc"
-                )
+    def connect(self):
+        """建立数据库连接
+
+        新建的连接作为主连接保存在 self.connection 上，同时作为连接池
+        的首个连接；重复调用会先释放之前的连接。
+        """
+        self.close()
+        if not self._setup_done:
+            self._setup_connection()
+            self._setup_done = True
+        self.connection = self._create_connection()
+
+        if not self._is_mongo:
+            self._pool = self._build_pool(self.connection)
+        return self.connection
 
-    def _setup_mongodb(self):
-        """设置MongoDB连接"""
-        try:
-            import pymongo  # type: ignore
+    def _build_pool(self, primary) -> _ConnectionPool:
+        """以主连接为首个连接创建连接池"""
+        pool_size, max_overflow = self._pool_limits()
+        initial = [primary]
+        for _ in range(min(self.config.get("pool_min_size", 0), pool_size) - 1):
+            initial.append(self._create_connection())
+
+        return _ConnectionPool(
+            self._create_connection,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            timeout=self.config.get("pool_timeout", 30),
+            initial=initial,
+        )
 
-            self.connection_module = pymongo
-        except ImportError:
-            raise ImportError(
-                "pymongo is not available. Install with: pip install pymongo"
+    def _pool_limits(self) -> Tuple[int, int]:
+        """连接池的 (pool_size, max_overflow)"""
+        if self._is_sqlite_memory():
+            # 每个内存数据库连接互相独立，只能共享同一个连接
+            return 1, 0
+        return self.config.get("pool_size", 5), self.config.get("max_overflow", 10)
+
+    def _is_sqlite_memory(self) -> bool:
+        """是否为SQLite内存数据库"""
+        if self._driver != "sqlite":
+            return False
+        database = str(self.config.get("database", ":memory:"))
+        return database == ":memory:" or "mode=memory" in database
+
+    def _resolve_connect_fn(self) -> Callable[[], Any]:
+        """解析当前驱动对应的建连方法（同时校验配置，无需导入驱动）"""
+        if "connection_module" not in self.config and "driver" not in self.config:
+            raise ValueError(
+                "Must specify either 'connection_module', 'driver', or 'db_type' in config"
             )
+        method_name = self._CONNECT_DISPATCH.get(self._driver)
+        if method_name is not None:
+            return getattr(self, method_name)
+        if "connection_module" in self.config:
+            return self._connect_generic
+        raise ValueError(f"Unsupported driver: {self._driver}")
 
-    def connect(self):
-        """建立数据库连接"""
-        driver = self.config.get("driver", "").lower()
-
-        if driver == "sqlite":
-            return self._connect_sqlite()
-        elif driver == "mysql":
-            return self._connect_mysql()
-        elif driver in ["postgresql", "postgres"]:
-            return self._connect_postgresql()
-        elif driver == "oracle":
-            return self._connect_oracle()
-        elif driver == "sqlserver":
-            return self._connect_sqlserver()
-        elif driver == "mongodb":
-            return self._connect_mongodb()
-        elif "connection_module" in self.config:
-            return self._connect_generic()
-        else:
-            raise ValueError(f"Unsupported driver: {driver}")
+    def _create_connection(self):
+        """按驱动创建一个新的数据库连接"""
+        return self._connect_fn()
 
     def _connect_sqlite(self):
         """连接SQLite数据库"""
-        database = self.config.get("database", self.config.get("db_file", ":memory:"))
+        database = self.config.get("database", ":memory:")
         timeout = self.config.get("timeout", 30)
 
-        self.connection = self.connection_module.connect(database, timeout=timeout)  # type: ignore
-        if hasattr(self.connection, "row_factory"):
-            self.connection.row_factory = self.connection_module.Row  # type: ignore
-        return self.connection
+        # 连接由连接池保证独占使用，允许在不同线程间借出；
+        # cached_statements 控制每个连接复用的预编译语句数量
+        connection = self.connection_module.connect(  # type: ignore
+            database,
+            timeout=timeout,
+            check_same_thread=False,
+            cached_statements=self.config.get("statement_cache_size", 128),
+        )
+        connection.row_factory = self.connection_module.Row  # type: ignore
+        return connection
 
     def _connect_mysql(self):
         """连接MySQL数据库"""
-        self.connection = self.connection_module.connect(  # type: ignore
+        return self.connection_module.connect(  # type: ignore
             host=self.config.get("host", "localhost"),
             port=self.config.get("port", 3306),
-            user=self.config.get("username", self.config.get("user", "root")),
+            user=self.config.get("username", "root"),
             password=self.config.get("password", ""),
-            database=self.config.get("database", self.config.get("db", "")),
+            database=self.config.get("database", ""),
             charset=self.config.get("charset", "utf8mb4"),
             connect_timeout=self.config.get("timeout", 30),
             **self.config.get("connection_params", {}),
         )
-        return self.connection
 
     def _connect_postgresql(self):
         """连接PostgreSQL数据库"""
-        self.connection = self.connection_module.connect(  # type: ignore
+        return self.connection_module.connect(  # type: ignore
             host=self.config.get("host", "localhost"),
             port=self.config.get("port", 5432),
-            user=self.config.get("username", self.config.get("user", "postgres")),
+            user=self.config.get("username", "postgres"),
             password=self.config.get("password", ""),
-            database=self.config.get("database", self.config.get("db", "")),
+            database=self.config.get("database", ""),
             connect_timeout=self.config.get("timeout", 30),
             **self.config.get("connection_params", {}),
         )
-        return self.connection
 
     def _connect_oracle(self):
         """连接Oracle数据库"""
@@ -324,37 +648,41 @@ class GenericDatabaseConnector(DatabaseConnector):
             f"{self.config.get('host', 'localhost')}/{self.config.get('service_name', 'ORCL')}",
         )
 
-        self.connection = self.connection_module.connect(  # type: ignore
-            user=self.config.get("username", self.config.get("user", "")),
+        return self.connection_module.connect(  # type: ignore
+            user=self.config.get("username", ""),
             password=self.config.get("password", ""),
             dsn=dsn,
             **self.config.get("connection_params", {}),
         )
-        return self.connection
 
     def _connect_sqlserver(self):
         """连接SQL Server数据库"""
-        driver = self.config.get("odbc_driver", "{ODBC Driver 17 for SQL Server}")
-        connection_string = (
-            f"DRIVER={driver};"
-            f"SERVER={self.config.get('host', 'localhost')};"
-            f"DATABASE={self.config.get('database', '')};"
-            f"UID={self.config.get('username', self.config.get('user', ''))};"
-            f"PWD={self.config.get('password', '')}"
+        if self.connection_module.__name__ == "pyodbc":  # type: ignore
+            return self.connection_module.connect(self._odbc_connection_string())  # type: ignore
+        # pymssql
+        return self.connection_module.connect(  # type: ignore
+            server=self.config.get("host", "localhost"),
+            user=self.config.get("username", ""),
+            password=self.config.get("password", ""),
+            database=self.config.get("database", ""),
+            port=self.config.get("port", 1433),
+            **self.config.get("connection_params", {}),
         )
 
-        if self.connection_module.__name__ == "pyodbc":  # type: ignore
-            self.connection = self.connection_module.connect(connection_string)  # type: ignore
-        else:  # pymssql
-            self.connection = self.connection_module.connect(  # type: ignore
-                server=self.config.get("host", "localhost"),
-                user=self.config.get("username", self.config.get("user", "")),
-                password=self.config.get("password", ""),
-                database=self.config.get("database", ""),
-                port=self.config.get("port", 1433),
-                **self.config.get("connection_params", {}),
+    def _odbc_connection_string(self) -> str:
+        """构建ODBC连接串（配置不变，构建一次后缓存）"""
+        if self._odbc_conn_str is None:
+            self._odbc_conn_str = _ODBC_TEMPLATE.format(
+                # 驱动名按惯例已用花括号包裹，原样使用
+                driver=self.config.get(
+                    "odbc_driver", "{ODBC Driver 17 for SQL Server}"
+                ),
+                host=_odbc_quote(self.config.get("host", "localhost")),
+                database=_odbc_quote(self.config.get("database", "")),
+                uid=_odbc_quote(self.config.get("username", "")),
+                pwd=_odbc_quote(self.config.get("password", "")),
             )
-        return self.connection
+        return self._odbc_conn_str
 
     def _connect_mongodb(self):
         """连接MongoDB数据库"""
@@ -363,82 +691,279 @@ class GenericDatabaseConnector(DatabaseConnector):
             f"mongodb://{self.config.get('host', 'localhost')}:{self.config.get('port', 27017)}",
         )
 
+        # pymongo 自带连接池，沿用 pool_size 作为其上限
+        connection_params = {
+            "maxPoolSize": self.config.get("pool_size", 5)
+            + self.config.get("max_overflow", 10),
+            **self.config.get("connection_params", {}),
+        }
         client = self.connection_module.MongoClient(  # type: ignore
-            connection_string, **self.config.get("connection_params", {})
+            connection_string, **connection_params
         )
-        database_name = self.config.get("database", self.config.get("db", "test"))
-        self.connection = client[database_name]
-        return self.connection
+        database_name = self.config.get("database", "test")
+        return client[database_name]
 
     def _connect_generic(self):
         """通用连接方式"""
         connection_config = self.config.get("connection_config", {})
         if hasattr(self.connection_module, "connect"):
-            self.connection = self.connection_module.connect(**connection_config)  # type: ignore
+            return self.connection_module.connect(**connection_config)  # type: ignore
         elif hasattr(self.connection_module, "Connection"):
-            self.connection = self.connection_module.Connection(**connection_config)  # type: ignore
+            return self.connection_module.Connection(**connection_config)  # type: ignore
         else:
             raise ValueError(
                 f"Cannot determine how to connect using module {self.connection_module}"
             )
-        return self.connection
 
-    def execute_query(self, query: str) -> Tuple[bool, Any]:
-        """执行查询并返回结果"""
+    def execute_query(self, query: str, params: Any = None) -> Tuple[bool, Any]:
+        """执行查询并返回结果
+
+        params 按驱动的占位符风格绑定参数，同一SQL文本因此可复用驱动端的
+        语句缓存；params 为多行参数（元组/列表/字典组成的列表）时走
+        executemany。配置 stream=True 时，SELECT 查询返回按 fetch_size
+        分批读取的行迭代器，迭代结束（或迭代器被关闭）后才归还连接。
+        """
         try:
-            if not hasattr(self, "connection") or not self.connection:
+            if not self.connection:
                 self.connect()
 
-            driver = self.config.get("driver", "").lower()
-
-            if driver == "mongodb":
+            if self._pool is None:
                 return self._execute_mongodb_query(query)
-            else:
-                return self._execute_sql_query(query)
+
+            if self.config.get("stream", False) and self._is_select(query):
+                return self._stream_sql_query(query, params)
+
+            with self._pool.connection() as conn:
+                return self._execute_sql_query(conn, query, params)
 
         except Exception as e:
             return False, f"Database query error: {str(e)}"
 
-    def _execute_sql_query(self, query: str) -> Tuple[bool, Any]:
-        """执行SQL查询"""
-        cursor = self.connection.cursor()  # type: ignore
-        cursor.execute(query)
-
-        if query.strip().upper().startswith("SELECT"):
-            if hasattr(cursor, "fetchall"):
-                result = cursor.fetchall()
-                # 尝试转换为字典列表
-                if result and hasattr(cursor, "description") and cursor.description:
-                    columns = [desc[0] for desc in cursor.description]
-                    if isinstance(result[0], (tuple, list)):
-                        result = [dict(zip(columns, row)) for row in result]
+    async def execute_query_async(
+        self, query: str, params: Any = None
+    ) -> Tuple[bool, Any]:
+        """异步执行查询
+
+        查询在默认线程池中执行，驱动等待网络期间释放GIL，多个查询的
+        往返时间得以重叠；并发数以连接池容量为上限，避免线程阻塞在借连接上。
+        """
+        if self._async_limit is None:
+            pool_size, max_overflow = self._pool_limits()
+            self._async_limit = asyncio.Semaphore(max(pool_size + max_overflow, 1))
+
+        async with self._async_limit:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.execute_query, query, params)
+
+    @staticmethod
+    def _is_select(query: str) -> bool:
+        return _SELECT_RE.match(query) is not None
+
+    @staticmethod
+    def _is_param_rows(params: Any) -> bool:
+        """判断参数是否为多行参数"""
+        return (
+            isinstance(params, list)
+            and bool(params)
+            and all(isinstance(row, (tuple, list, dict)) for row in params)
+        )
+
+    def _execute_sql_query(
+        self, conn, query: str, params: Any = None
+    ) -> Tuple[bool, Any]:
+        """在给定连接上执行SQL查询，游标在返回前关闭以释放服务端资源"""
+        with closing(self._open_cursor(conn)) as cursor:
+            caps = self._caps or self._resolve_caps(conn, cursor)
+            if params is None:
+                cursor.execute(query)
+            elif self._is_param_rows(params):
+                self._executemany(cursor, query, params)
             else:
-                result = []
-        else:
-            if hasattr(self.connection, "commit"):
-                self.connection.commit()  # type: ignore
-            if hasattr(cursor, "rowcount"):
-                result = (
-                    f"Query executed successfully. Rows affected: {cursor.rowcount}"
-                )
+                cursor.execute(query, params)
+
+            if self._is_select(query):
+                if caps["fetchmany"]:
+                    result = list(self._iter_rows(cursor))
+                else:
+                    result = []
             else:
-                result = "Query executed successfully"
+                if caps["commit"]:
+                    conn.commit()
+                if caps["rowcount"]:
+                    result = (
+                        f"Query executed successfully. Rows affected: {cursor.rowcount}"
+                    )
+                else:
+                    result = "Query executed successfully"
 
         return True, result
 
+    def execute_many(self, query: str, param_rows: Iterable[Any]) -> Tuple[bool, Any]:
+        """批量执行写入/更新语句，N 行参数只需一次往返
+
+        MongoDB 下 query 视为集合名，param_rows 为待插入的文档。
+        """
+        try:
+            if not self.connection:
+                self.connect()
+
+            if self._pool is None:
+                return self.insert_many(query, param_rows)
+
+            rows = list(param_rows)
+            if not rows:
+                return True, "Query executed successfully. Rows affected: 0"
+
+            with (
+                self._pool.connection() as conn,
+                closing(self._open_cursor(conn)) as cursor,
+            ):
+                caps = self._caps or self._resolve_caps(conn, cursor)
+                self._executemany(cursor, query, rows)
+                if caps["commit"]:
+                    conn.commit()
+                return (
+                    True,
+                    f"Query executed successfully. Rows affected: {cursor.rowcount}",
+                )
+
+        except Exception as e:
+            return False, f"Database query error: {str(e)}"
+
+    def _resolve_caps(self, conn, cursor) -> Mapping[str, bool]:
+        """获取当前驱动的能力标志，未知驱动按模块名探测一次"""
+        caps = _DRIVER_CAPS.get(self._driver)
+        if caps is None:
+            key = getattr(self.connection_module, "__name__", "")
+            caps = self._probed_caps.get(key)
+            if caps is None:
+                caps = {
+                    "fetchmany": hasattr(cursor, "fetchmany"),
+                    "commit": hasattr(conn, "commit"),
+                    "rowcount": hasattr(cursor, "rowcount"),
+                }
+                self._probed_caps[key] = caps
+        self._caps = caps
+        return caps
+
+    def _executemany(self, cursor, query: str, rows: Any) -> None:
+        """调用 executemany，pyodbc 下开启 fast_executemany 批量发送参数"""
+        if getattr(self.connection_module, "__name__", "") == "pyodbc":
+            cursor.fast_executemany = True
+        cursor.executemany(query, rows)
+
+    def _stream_sql_query(
+        self, query: str, params: Any = None
+    ) -> Tuple[bool, Iterator[Any]]:
+        """执行SELECT并返回流式结果，尽量使用服务端游标"""
+        conn = self._pool.acquire()  # type: ignore[union-attr]
+        cursor = None
+        try:
+            cursor = self._open_cursor(conn, server_side=True)
+            if params is None:
+                cursor.execute(query)
+            else:
+                cursor.execute(query, params)
+        except Exception:
+            if cursor is not None:
+                cursor.close()
+            self._pool.release(conn)  # type: ignore[union-attr]
+            raise
+        return True, _RowStream(
+            self._iter_rows(cursor),
+            conn,
+            cursor,
+            self._pool.release,  # type: ignore[union-attr]
+        )
+
+    def _open_cursor(self, conn, server_side: bool = False):
+        """打开游标，尽量让驱动直接产出字典行
+
+        pymysql、mysql.connector、psycopg2、pymssql 使用各自的字典游标；
+        server_side=True 时 psycopg2 使用命名游标、pymysql 使用 SSDictCursor。
+        """
+        module_name = getattr(self.connection_module, "__name__", "")
+        if module_name == "pymysql":
+            cursors = self.connection_module.cursors  # type: ignore[union-attr]
+            return conn.cursor(
+                cursors.SSDictCursor if server_side else cursors.DictCursor
+            )
+        if module_name == "psycopg2":
+            from psycopg2.extras import RealDictCursor  # type: ignore
+
+            if server_side:
+                return conn.cursor(
+                    name=f"ptest_{next(self._cursor_counter)}",
+                    cursor_factory=RealDictCursor,
+                )
+            return conn.cursor(cursor_factory=RealDictCursor)
+        if module_name == "mysql.connector":
+            return conn.cursor(dictionary=True)
+        if module_name == "pymssql":
+            return conn.cursor(as_dict=True)
+        return conn.cursor()
+
+    def _iter_rows(self, cursor) -> Iterator[Any]:
+        """按 fetch_size 分批读取游标结果
+
+        字典游标产出的行原样返回；仅对没有字典游标的驱动（如 pyodbc、
+        Oracle）将元组行按列名转换为字典。
+        """
+        fetch_size = self.config.get("fetch_size", 1000)
+        columns = None
+        while True:
+            rows = cursor.fetchmany(fetch_size)
+            if not rows:
+                return
+            if columns is None:
+                # 服务端游标在首次读取后才有 description
+                description = getattr(cursor, "description", None)
+                columns = [desc[0] for desc in description] if description else []
+            for row in rows:
+                if columns and isinstance(row, (tuple, list)):
+                    yield dict(zip(columns, row))
+                else:
+                    yield row
+
+    def _get_collection(self, name: str, raw: bool = False):
+        """获取MongoDB集合句柄（按名称缓存）
+
+        raw=True 时集合以 RawBSONDocument 作为文档类型，结果保持BSON
+        原始字节，访问字段时才解码。
+        """
+        key = (name, raw)
+        collection = self._collections.get(key)
+        if collection is None:
+            if raw:
+                from bson.codec_options import CodecOptions  # type: ignore
+                from bson.raw_bson import RawBSONDocument  # type: ignore
+
+                collection = self.connection.get_collection(  # type: ignore
+                    name, codec_options=CodecOptions(document_class=RawBSONDocument)
+                )
+            else:
+                collection = self.connection[name]  # type: ignore
+            self._collections[key] = collection
+        return collection
+
     def _execute_mongodb_query(self, query: str) -> Tuple[bool, Any]:
-        """执行MongoDB查询（查询应该是JSON格式或集合名）"""
+        """执行MongoDB查询（查询应该是JSON格式或集合名）
+
+        JSON查询中指定 "stream": true 时返回逐个产出文档的迭代器，
+        不在内存中一次性物化整个结果集；指定 "raw": true 时返回
+        RawBSONDocument（只读，_id 保持 ObjectId，doc.raw 为BSON字节），
+        跳过逐字段解码为Python对象。
+        """
         try:
             # 尝试解析为JSON查询
-            import json
-
-            query_data = json.loads(query)
+            query_data = _json_loads(query)
 
             collection_name = query_data.get("collection")
             if not collection_name:
                 return False, "MongoDB query must specify 'collection'"
 
-            collection = self.connection[collection_name]  # type: ignore
+            raw = bool(query_data.get("raw", False))
+            collection = self._get_collection(collection_name, raw)
             query_filter = query_data.get("filter", {})
             projection = query_data.get("projection", None)
             limit = query_data.get("limit", None)
@@ -447,18 +972,15 @@ class GenericDatabaseConnector(DatabaseConnector):
             if limit:
                 cursor = cursor.limit(limit)
 
-            result = list(cursor)
-            # 将ObjectId转换为字符串
-            for doc in result:
-                if "_id" in doc and hasattr(doc["_id"], "str"):
-                    doc["_id"] = str(doc["_id"])
-
-            return True, result
+            documents = self._iter_documents(cursor, raw)
+            if query_data.get("stream", False):
+                return True, documents
+            return True, list(documents)
 
-        except json.JSONDecodeError:  # type: ignore
+        except json.JSONDecodeError:
             # 如果不是JSON，当作集合名处理，返回所有文档
             if query in self.connection.list_collection_names():  # type: ignore
-                collection = self.connection[query]  # type: ignore
+                collection = self._get_collection(query)
                 result = list(collection.find({}, {"_id": 0}))  # 排除_id字段
                 return True, result
             else:
@@ -466,44 +988,108 @@ class GenericDatabaseConnector(DatabaseConnector):
         except Exception as e:
             return False, f"MongoDB query error: {str(e)}"
 
+    def insert_many(
+        self, collection_name: str, documents: Iterable[Dict[str, Any]]
+    ) -> Tuple[bool, Any]:
+        """批量插入MongoDB文档
+
+        使用 ordered=False，单个文档失败不会阻止其余文档写入，
+        服务端也可以并行处理插入。
+        """
+        try:
+            if not self.connection:
+                self.connect()
+
+            docs = list(documents)
+            if not docs:
+                return True, "Inserted 0 documents"
+
+            collection = self._get_collection(collection_name)
+            result = collection.insert_many(docs, ordered=False)
+            return True, f"Inserted {len(result.inserted_ids)} documents"
+        except Exception as e:
+            return False, f"MongoDB insert error: {str(e)}"
+
+    def _iter_documents(self, cursor, raw: bool = False) -> Iterator[Any]:
+        """逐个产出文档，并将ObjectId类型的_id转换为字符串
+
+        raw=True 时文档为只读的 RawBSONDocument，原样产出。
+        迭代结束或流式迭代器被提前关闭时关闭游标，立即释放服务端游标。
+        """
+        try:
+            if raw:
+                yield from cursor
+                return
+
+            from bson import ObjectId  # type: ignore[import-not-found]  # 随pymongo安装
+
+            # 绑定为局部变量，循环内仅做指针比较，避免每个文档的全局查找与isinstance
+            object_id, to_str = ObjectId, str
+            for doc in cursor:
+                oid = doc.get("_id")
+                if type(oid) is object_id:
+                    doc["_id"] = to_str(oid)
+                yield doc
+        finally:
+            close = getattr(cursor, "close", None)
+            if close is not None:
+                close()
+
     def close(self):
-        """关闭数据库连接"""
-        if hasattr(self, "connection") and self.connection:
-            driver = self.config.get("driver", "").lower()
-
-            if driver == "mongodb":
-                # MongoDB需要关闭客户端连接
-                if hasattr(self.connection, "client"):
-                    self.connection.client.close()  # type: ignore
-                elif hasattr(self.connection, "close"):
-                    self.connection.close()
-            else:
-                # SQL数据库直接关闭连接
-                if hasattr(self.connection, "close"):
-                    self.connection.close()
+        """关闭数据库连接及连接池"""
+        self._collections.clear()
+        if self._pool is not None:
+            # 主连接也在池中，由连接池统一关闭
+            self._pool.close()
+            self._pool = None
+        elif self._is_mongo and self.connection is not None:
+            # MongoDB需要关闭客户端连接
+            self.connection.client.close()  # type: ignore
+        self.connection = None
 
     def test_connection(self) -> Tuple[bool, str]:
-        """测试数据库连接"""
+        """测试数据库连接
+
+        复用连接池中的连接并使用驱动原生的 ping；已有连接失效时重新连接一次。
+        """
         try:
-            conn = self.connect()
-            driver = self.config.get("driver", "").lower()
-
-            if driver == "mongodb":
-                # MongoDB测试：运行一个简单的查询
-                result = conn.command("ping")  # type: ignore
-                if result.get("ok"):
-                    return True, "MongoDB connection successful"
-                else:
-                    return False, f"MongoDB connection test failed: {result}"
-            else:
-                # SQL数据库测试：执行简单查询
-                cursor = conn.cursor()
-                cursor.execute("SELECT 1")
-                return True, f"{driver.title()} connection successful"
+            reconnected = not self.connection
+            if reconnected:
+                self.connect()
+
+            try:
+                self._ping()
+            except Exception:
+                if reconnected:
+                    raise
+                self.connect()
+                self._ping()
+
+            if self._is_mongo:
+                return True, "MongoDB connection successful"
+            return True, f"{self._driver.title()} connection successful"
 
         except Exception as e:
             return False, f"Connection test failed: {str(e)}"
 
+    def _ping(self):
+        """对一个连接执行驱动原生的存活检测，失败时抛出异常"""
+        if self._pool is None:
+            # MongoDB测试：运行ping命令
+            result = self.connection.command("ping")  # type: ignore[union-attr]
+            if not result.get("ok"):
+                raise ConnectionError(f"MongoDB connection test failed: {result}")
+            return
+
+        with self._pool.connection() as conn:
+            ping = _PING.get(self._driver)
+            if ping is not None and hasattr(conn, "ping"):
+                ping(conn)
+                return
+            # 其他SQL数据库：执行简单查询并释放游标
+            with closing(conn.cursor()) as cursor:
+                cursor.execute("SELECT 1")
+
 
 # 注册预定义的数据库连接器
 DatabaseRegistry.register("generic", GenericDatabaseConnector)
@@ -518,6 +1104,8 @@ DatabaseRegistry.register("mongodb", GenericDatabaseConnector)
 class DBObject(BaseManagedObject):
     """通用数据库对象实现"""
 
+    __slots__ = ("connector", "db_config")
+
     def __init__(self, name: str, env_manager):
         super().__init__(name, "database", env_manager)
         self.connector = None
@@ -527,7 +1115,7 @@ class DBObject(BaseManagedObject):
         if not params:
             return "✗ Database installation requires parameters"
 
-        self.env_manager.logger.info(f"Installing database object: {self.name}")
+        self._log.info(f"Installing database object: {self.name}")
         self.db_config = params.copy() if params else {}  # type: ignore
         # 使用通用数据库连接器
         try:
@@ -551,14 +1139,14 @@ class DBObject(BaseManagedObject):
     def start(self):
         if not self.installed:
             return f"✗ Database object '{self.name}' not installed"
-        self.env_manager.logger.info(f"Starting database object: {self.name}")
+        self._log.info(f"Starting database object: {self.name}")
         self.status = "running"
         return f"✓ {get_colored_text('Database', 92)} object '{self.name}' started"
 
     def stop(self):
         if self.status != "running":
             return f"✗ Database object '{self.name}' not running"
-        self.env_manager.logger.info(f"Stopping database object: {self.name}")
+        self._log.info(f"Stopping database object: {self.name}")
 
         if self.connector:
             self.connector.close()
@@ -575,7 +1163,7 @@ class DBObject(BaseManagedObject):
     def uninstall(self):
         if self.status == "running":
             self.stop()
-        self.env_manager.logger.info(f"Removing database object: {self.name}")
+        self._log.info(f"Removing database object: {self.name}")
 
         if self.connector:
             self.connector.close()
@@ -586,12 +1174,28 @@ class DBObject(BaseManagedObject):
         self.db_config = {}
         return f"✓ {get_colored_text('Database', 92)} object '{self.name}' uninstalled"
 
-    def execute_query(self, query: str) -> Tuple[bool, Any]:
+    def execute_query(self, query: str, params: Any = None) -> Tuple[bool, Any]:
         """执行数据库查询"""
         if not self.installed or not self.connector:
             return False, f"Database '{self.name}' not properly installed"
 
-        return self.connector.execute_query(query)
+        return self.connector.execute_query(query, params)
+
+    async def execute_query_async(
+        self, query: str, params: Any = None
+    ) -> Tuple[bool, Any]:
+        """异步执行数据库查询"""
+        if not self.installed or not self.connector:
+            return False, f"Database '{self.name}' not properly installed"
+
+        return await self.connector.execute_query_async(query, params)
+
+    def execute_many(self, query: str, param_rows: Iterable[Any]) -> Tuple[bool, Any]:
+        """批量执行写入/更新语句"""
+        if not self.installed or not self.connector:
+            return False, f"Database '{self.name}' not properly installed"
+
+        return self.connector.execute_many(query, param_rows)
 
     def get_connector(self) -> Optional[DatabaseConnector]:
         """获取数据库连接器"""
@@ -35,6 +35,9 @@ class DatabaseClientComponent(ServiceClientComponent):
                 "password": self.password,
                 "database": self.db_name,
                 "timeout": self.config.get("timeout", 30),
+                # 查询经连接器的有界连接池执行，connection_params 可覆盖池参数
+                "pool_size": self.config.get("pool_size", 10),
+                "max_overflow": self.config.get("max_overflow", 10),
                 **self.connection_params,
             }
 
@@ -132,13 +135,13 @@ class DatabaseClientComponent(ServiceClientComponent):
         except Exception as e:
             return False, f"Connection test failed: {str(e)}"
 
-    def execute_query(self, query: str) -> Tuple[bool, Any]:
+    def execute_query(self, query: str, params: Any = None) -> Tuple[bool, Any]:
         """执行数据库查询"""
         if not self.connector:
             return False, "Database connector not available"
 
         try:
-            return self.connector.execute_query(query)
+            return self.connector.execute_query(query, params)
         except Exception as e:
             return False, f"Query execution failed: {str(e)}"
 
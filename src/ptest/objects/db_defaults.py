@@ -0,0 +1,50 @@
+# ptest/objects/db_defaults.py
+"""
+数据库对象共用的默认端口与 install 参数表（db_enhanced 与 db_v2 共用）
+"""
+
+from types import MappingProxyType
+
+# 各数据库默认端口（只读）
+DEFAULT_PORTS = MappingProxyType(
+    {
+        "mysql": 3306,
+        "postgresql": 5432,
+        "postgres": 5432,
+        "mongodb": 27017,
+        "oracle": 1521,
+        "sqlserver": 1433,
+        "redis": 6379,
+    }
+)
+
+# install 参数名 -> 服务端组件配置键（未提供的参数使用默认值）
+SERVER_PARAM_KEYS = MappingProxyType(
+    {
+        "server_host": "host",
+        "server_port": "port",
+        "data_dir": "data_dir",
+        "log_file": "log_file",
+        "pid_file": "pid_file",
+        "config_file": "config_file",
+        "mysql_config": "mysql_config",
+        "postgresql_config": "postgresql_config",
+        "mongodb_config": "mongodb_config",
+    }
+)
+
+# 客户端组件直接沿用的 install 参数
+CLIENT_PARAM_KEYS = (
+    "server_host",
+    "server_port",
+    "database",
+    "username",
+    "password",
+    "timeout",
+    "connection_params",
+)
+
+
+def default_port(db_type: str) -> int:
+    """获取数据库默认端口，未知类型返回0"""
+    return DEFAULT_PORTS.get(db_type.lower(), 0)
@@ -7,12 +7,14 @@ import shutil
 import subprocess
 import tarfile
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from .base import BaseManagedObject
 from .db_server import DatabaseServerComponent
 from .db_client import DatabaseClientComponent
-from typing import Dict, Any, Optional, Tuple
+from .db_defaults import CLIENT_PARAM_KEYS, SERVER_PARAM_KEYS, default_port
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 try:
     from ..utils import get_colored_text
@@ -22,6 +24,28 @@ except ImportError:
         return str(text)
 
 
+# 状态消息中使用的彩色标签（常量，模块加载时生成一次）
+_DB_SERVER_OK = get_colored_text("Database Server", 92)
+_DB_SERVER_ERR = get_colored_text("Database Server", 91)
+_DB_CLIENT_OK = get_colored_text("Database Client", 92)
+_DB_CLIENT_ERR = get_colored_text("Database Client", 91)
+
+
+def batch_health_check(
+    objs: Iterable[Any], max_workers: int = 16
+) -> List[Tuple[str, str]]:
+    """并发检查多个数据库对象的健康状态，返回 [(name, health_check结果)]
+
+    健康检查以I/O等待为主，并发执行后总耗时取决于最慢的一个而非全部之和；
+    需要检查多个对象时优先使用本函数。
+    """
+    objs = list(objs)
+    if not objs:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(objs))) as executor:
+        return list(executor.map(lambda obj: (obj.name, obj.health_check()), objs))
+
+
 class DatabaseServerObject(BaseManagedObject):
     """数据库服务端对象"""
 
@@ -34,38 +58,34 @@ class DatabaseServerObject(BaseManagedObject):
         if not params:
             return "✗ Database server installation requires parameters"
 
-        self.env_manager.logger.info(f"Installing database server: {self.name}")
+        self._log.info(f"Installing database server: {self.name}")
 
         db_type = str(params.get("db_type", "sqlite")).lower()
         if db_type == "mysql":
             return self._install_mysql_managed_instance(params)
 
-        # 准备服务端配置
+        # 准备服务端配置：默认值与用户参数合并，数据库特定配置仅在提供时加入
         server_config = {
             "db_type": db_type,
-            "host": params.get("server_host", "localhost"),
-            "port": params.get("server_port", self._get_default_port(db_type)),
-            "data_dir": params.get("data_dir", f"/tmp/{self.name}_data"),
-            "log_file": params.get("log_file", f"/tmp/{self.name}.log"),
-            "pid_file": params.get("pid_file", f"/tmp/{self.name}.pid"),
-            "config_file": params.get("config_file", ""),
+            "host": "localhost",
+            "port": self._get_default_port(db_type),
+            "data_dir": f"/tmp/{self.name}_data",
+            "log_file": f"/tmp/{self.name}.log",
+            "pid_file": f"/tmp/{self.name}.pid",
+            "config_file": "",
+            **{
+                key: params[name]
+                for name, key in SERVER_PARAM_KEYS.items()
+                if name in params
+            },
         }
 
-        # 添加数据库特定配置
-        if "mysql_config" in params:
-            server_config["mysql_config"] = params["mysql_config"]
-        if "postgresql_config" in params:
-            server_config["postgresql_config"] = params["postgresql_config"]
-        if "mongodb_config" in params:
-            server_config["mongodb_config"] = params["mongodb_config"]
-
         try:
             self.server_component = DatabaseServerComponent(server_config)
             self.installed = True
             self.status = "installed"
 
-            db_type = server_config["db_type"]
-            return f"✓ {get_colored_text('Database Server', 92)} object '{self.name}' ({db_type}) installed and ready"
+            return f"✓ {_DB_SERVER_OK} object '{self.name}' ({db_type}) installed and ready"
 
         except Exception as e:
             return f"✗ Failed to install database server: {str(e)}"
@@ -205,7 +225,7 @@ class DatabaseServerObject(BaseManagedObject):
             self.installed = True
             self.status = "installed"
             return (
-                f"✓ {get_colored_text('Database Server', 92)} object '{self.name}' "
+                f"✓ {_DB_SERVER_OK} object '{self.name}' "
                 f"(mysql) installed in managed workspace"
             )
         except Exception as e:
@@ -444,13 +464,13 @@ class DatabaseServerObject(BaseManagedObject):
         if not self.installed or not self.server_component:
             return f"✗ Database server '{self.name}' not installed"
 
-        self.env_manager.logger.info(f"Starting database server: {self.name}")
+        self._log.info(f"Starting database server: {self.name}")
 
         try:
             success, message = self.server_component.start()
             if success:
                 self.status = "running"
-                return f"✓ {get_colored_text('Database Server', 92)} '{self.name}' started: {message}"
+                return f"✓ {_DB_SERVER_OK} '{self.name}' started: {message}"
             else:
                 return f"✗ Failed to start database server: {message}"
         except Exception as e:
@@ -461,13 +481,13 @@ class DatabaseServerObject(BaseManagedObject):
         if self.status != "running":
             return f"✗ Database server '{self.name}' not running"
 
-        self.env_manager.logger.info(f"Stopping database server: {self.name}")
+        self._log.info(f"Stopping database server: {self.name}")
 
         try:
             success, message = self.server_component.stop()  # type: ignore
             if success:
                 self.status = "stopped"
-                return f"✓ {get_colored_text('Database Server', 92)} '{self.name}' stopped: {message}"
+                return f"✓ {_DB_SERVER_OK} '{self.name}' stopped: {message}"
             else:
                 return f"✗ Failed to stop database server: {message}"
         except Exception as e:
@@ -475,27 +495,38 @@ class DatabaseServerObject(BaseManagedObject):
 
     def restart(self) -> str:
         """重启数据库服务端"""
-        result = self.stop()
-        if "✓" in result:
-            return self.start()
-        return result
+        if not self.installed or not self.server_component:
+            return f"✗ Database server '{self.name}' not installed"
+        if self.status != "running":
+            return f"✗ Database server '{self.name}' not running"
+
+        self._log.info("Restarting database server: %s", self.name)
+
+        try:
+            # 直接调用组件重启，避免经由 stop()/start() 的消息字符串判断结果
+            success, message = self.server_component.restart()
+            if success:
+                self.status = "running"
+                return f"✓ {_DB_SERVER_OK} '{self.name}' restarted: {message}"
+            if self.server_component.status != "running":
+                self.status = "stopped"
+            return f"✗ Failed to restart database server: {message}"
+        except Exception as e:
+            return f"✗ Server restart error: {str(e)}"
 
     def uninstall(self) -> str:
         """卸载数据库服务端"""
-        if self.status == "running":
-            stop_result = self.stop()
-            if "✓" not in stop_result:
-                return stop_result
-
-        self.env_manager.logger.info(f"Removing database server: {self.name}")
+        self._log.info(f"Removing database server: {self.name}")
 
         try:
             managed_instance: dict[str, Any] = {}
             if self.server_component:
-                if self.server_component.status == "running":
-                    success, message = self.server_component.stop()
-                    if not success:
-                        return f"✗ Failed to stop database server during uninstall: {message}"
+                # 组件未运行时stop()直接返回，只需调用一次
+                success, message = self.server_component.stop()
+                if not success:
+                    return (
+                        f"✗ Failed to stop database server during uninstall: {message}"
+                    )
                 config = getattr(self.server_component, "config", {})
                 if isinstance(config, dict):
                     managed_instance = config.get("managed_instance", {})
@@ -510,9 +541,7 @@ class DatabaseServerObject(BaseManagedObject):
 
             self.installed = False
             self.status = "removed"
-            return (
-                f"✓ {get_colored_text('Database Server', 92)} '{self.name}' uninstalled"
-            )
+            return f"✓ {_DB_SERVER_OK} '{self.name}' uninstalled"
         except Exception as e:
             return f"✗ Server uninstall error: {str(e)}"
 
@@ -537,9 +566,9 @@ class DatabaseServerObject(BaseManagedObject):
         try:
             success, message = self.server_component.health_check()
             if success:
-                return f"✓ {get_colored_text('Database Server', 92)} '{self.name}' healthy: {message}"
+                return f"✓ {_DB_SERVER_OK} '{self.name}' healthy: {message}"
             else:
-                return f"✗ {get_colored_text('Database Server', 91)} '{self.name}' unhealthy: {message}"
+                return f"✗ {_DB_SERVER_ERR} '{self.name}' unhealthy: {message}"
         except Exception as e:
             return f"✗ Health check error: {str(e)}"
 
@@ -551,16 +580,7 @@ class DatabaseServerObject(BaseManagedObject):
 
     def _get_default_port(self, db_type: str) -> int:
         """获取数据库默认端口"""
-        port_mapping = {
-            "mysql": 3306,
-            "postgresql": 5432,
-            "postgres": 5432,
-            "mongodb": 27017,
-            "oracle": 1521,
-            "sqlserver": 1433,
-            "redis": 6379,
-        }
-        return port_mapping.get(db_type.lower(), 0)
+        return default_port(db_type)
 
 
 class DatabaseClientObject(BaseManagedObject):
@@ -575,20 +595,20 @@ class DatabaseClientObject(BaseManagedObject):
         if not params:
             return "✗ Database client installation requires parameters"
 
-        self.env_manager.logger.info(f"Installing database client: {self.name}")
+        self._log.info(f"Installing database client: {self.name}")
 
         # 准备客户端配置
+        db_type = params.get("db_type", "sqlite")
         client_config = {
-            "db_type": params.get("db_type", "sqlite"),
-            "server_host": params.get("server_host", "localhost"),
-            "server_port": params.get(
-                "server_port", self._get_default_port(params.get("db_type", "sqlite"))
-            ),
-            "database": params.get("database", ""),
-            "username": params.get("username", ""),
-            "password": params.get("password", ""),
-            "timeout": params.get("timeout", 30),
-            "connection_params": params.get("connection_params", {}),
+            "db_type": db_type,
+            "server_host": "localhost",
+            "server_port": self._get_default_port(db_type),
+            "database": "",
+            "username": "",
+            "password": "",
+            "timeout": 30,
+            "connection_params": {},
+            **{key: params[key] for key in CLIENT_PARAM_KEYS if key in params},
         }
 
         try:
@@ -596,8 +616,7 @@ class DatabaseClientObject(BaseManagedObject):
             self.installed = True
             self.status = "installed"
 
-            db_type = client_config["db_type"]
-            return f"✓ {get_colored_text('Database Client', 92)} object '{self.name}' ({db_type}) installed and ready"
+            return f"✓ {_DB_CLIENT_OK} object '{self.name}' ({db_type}) installed and ready"
 
         except Exception as e:
             return f"✗ Failed to install database client: {str(e)}"
@@ -607,13 +626,13 @@ class DatabaseClientObject(BaseManagedObject):
         if not self.installed or not self.client_component:
             return f"✗ Database client '{self.name}' not installed"
 
-        self.env_manager.logger.info(f"Starting database client: {self.name}")
+        self._log.info(f"Starting database client: {self.name}")
 
         try:
             success, message = self.client_component.start()
             if success:
                 self.status = "running"
-                return f"✓ {get_colored_text('Database Client', 92)} '{self.name}' connected: {message}"
+                return f"✓ {_DB_CLIENT_OK} '{self.name}' connected: {message}"
             else:
                 return f"✗ Failed to connect database client: {message}"
         except Exception as e:
@@ -624,13 +643,13 @@ class DatabaseClientObject(BaseManagedObject):
         if self.status != "running":
             return f"✗ Database client '{self.name}' not running"
 
-        self.env_manager.logger.info(f"Stopping database client: {self.name}")
+        self._log.info(f"Stopping database client: {self.name}")
 
         try:
             success, message = self.client_component.stop()  # type: ignore
             if success:
                 self.status = "stopped"
-                return f"✓ {get_colored_text('Database Client', 92)} '{self.name}' disconnected: {message}"
+                return f"✓ {_DB_CLIENT_OK} '{self.name}' disconnected: {message}"
             else:
                 return f"✗ Failed to disconnect database client: {message}"
         except Exception as e:
@@ -645,22 +664,17 @@ class DatabaseClientObject(BaseManagedObject):
 
     def uninstall(self) -> str:
         """卸载数据库客户端"""
-        if self.status == "running":
-            self.stop()
-
-        self.env_manager.logger.info(f"Removing database client: {self.name}")
+        self._log.info(f"Removing database client: {self.name}")
 
         try:
             if self.client_component:
-                if self.client_component.status == "running":
-                    self.client_component.stop()
+                # 组件未连接时stop()直接返回，只需调用一次
+                self.client_component.stop()
                 self.client_component = None
 
             self.installed = False
             self.status = "removed"
-            return (
-                f"✓ {get_colored_text('Database Client', 92)} '{self.name}' uninstalled"
-            )
+            return f"✓ {_DB_CLIENT_OK} '{self.name}' uninstalled"
         except Exception as e:
             return f"✗ Client uninstall error: {str(e)}"
 
@@ -685,19 +699,19 @@ class DatabaseClientObject(BaseManagedObject):
         try:
             success, message = self.client_component.health_check()
             if success:
-                return f"✓ {get_colored_text('Database Client', 92)} '{self.name}' healthy: {message}"
+                return f"✓ {_DB_CLIENT_OK} '{self.name}' healthy: {message}"
             else:
-                return f"✗ {get_colored_text('Database Client', 91)} '{self.name}' unhealthy: {message}"
+                return f"✗ {_DB_CLIENT_ERR} '{self.name}' unhealthy: {message}"
         except Exception as e:
             return f"✗ Health check error: {str(e)}"
 
-    def execute_query(self, query: str) -> Tuple[bool, Any]:  # type: ignore
+    def execute_query(self, query: str, params: Any = None) -> Tuple[bool, Any]:  # type: ignore
         """执行数据库查询"""
         if not self.installed or not self.client_component:
             return False, f"Database client '{self.name}' not properly installed"
 
         try:
-            return self.client_component.execute_query(query)
+            return self.client_component.execute_query(query, params)
         except Exception as e:
             return False, f"Query execution error: {str(e)}"
 
@@ -709,13 +723,4 @@ class DatabaseClientObject(BaseManagedObject):
 
     def _get_default_port(self, db_type: str) -> int:
         """获取数据库默认端口"""
-        port_mapping = {
-            "mysql": 3306,
-            "postgresql": 5432,
-            "postgres": 5432,
-            "mongodb": 27017,
-            "oracle": 1521,
-            "sqlserver": 1433,
-            "redis": 6379,
-        }
-        return port_mapping.get(db_type.lower(), 0)
+        return default_port(db_type)
@@ -3,19 +3,123 @@
 数据库服务端组件
 """
 
+import errno
+import hashlib
 import re
 from typing import Dict, Any, Tuple, Optional
 import importlib.util
 import socket
+import string
 import subprocess
+import tempfile
 import time
 import os
+import select
+import selectors
 import signal
 import ctypes
 from pathlib import Path
 from .service_base import ServiceServerComponent
 
 
+# SQLite HTTP API 服务脚本模板，启动时只替换 $HOST、$PORT、$PID_FILE、$DB_PATH 与 $QUERY_API
+_SQLITE_API_SCRIPT = string.Template(
+    """\
+import json
+import os
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HOST = $HOST
+PORT = $PORT
+PID_FILE = $PID_FILE
+DB_PATH = $DB_PATH
+# 执行任意SQL的 /api/query 接口，仅在配置 enable_query_api 时开启
+QUERY_API = $QUERY_API
+
+# 每个处理线程复用自己的SQLite连接，避免每个请求重新connect
+_tls = threading.local()
+
+
+def get_conn():
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _tls.conn = conn
+    return conn
+
+
+def run_query(sql, params):
+    conn = get_conn()
+    cursor = conn.execute(sql, params)
+    try:
+        if cursor.description is not None:
+            return {"rows": [dict(row) for row in cursor.fetchall()]}
+        conn.commit()
+        return {"rowcount": cursor.rowcount}
+    finally:
+        cursor.close()
+
+
+class SQLiteAPIHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith('/api/'):
+            self.handle_api_request()
+        else:
+            self.send_error(404, "Not Found")
+
+    def do_POST(self):
+        if self.path.startswith('/api/'):
+            self.handle_api_request()
+        else:
+            self.send_error(404, "Not Found")
+
+    def handle_api_request(self):
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            self.send_error(400, "Bad Request: invalid Content-Length")
+            return
+
+        try:
+            post_data = self.rfile.read(content_length).decode('utf-8') if content_length > 0 else ''
+
+            # 解析请求
+            path_parts = self.path.split('/')
+            if len(path_parts) >= 3:
+                operation = path_parts[2]
+
+                if operation == "query" and QUERY_API:
+                    payload = json.loads(post_data or "{}")
+                    response_data = run_query(payload["sql"], payload.get("params", []))
+                else:
+                    response_data = {"message": "SQLite API server running", "operation": operation}
+
+                self.send_response(200)
+                self.send_header('Content-type', 'application/json')
+                self.end_headers()
+                self.wfile.write(json.dumps(response_data).encode())
+            else:
+                self.send_error(400, "Bad Request")
+        except Exception as e:
+            self.send_error(500, f"Internal Server Error: {str(e)}")
+
+
+# 启动服务器
+with ThreadingHTTPServer((HOST, PORT), SQLiteAPIHandler) as httpd:
+    with open(PID_FILE, 'w') as f:
+        f.write(str(os.getpid()))
+    httpd.serve_forever()
+"""
+)
+
+
 class DatabaseServerComponent(ServiceServerComponent):
     """数据库服务端组件"""
 
@@ -26,6 +130,8 @@ class DatabaseServerComponent(ServiceServerComponent):
         self.config_file = config.get("config_file", "")
         self.log_file = config.get("log_file", "/tmp/test_db.log")
         self.pid_file = config.get("pid_file", f"/tmp/test_db_{self.db_type}.pid")
+        # 预先编码的PID文件路径，频繁 stat 时省去每次的编码转换
+        self._pid_file_b = os.fsencode(self.pid_file)
         self.socket_file = config.get("socket_file", "")
         self.database_name = config.get("database_name", "")
         self.install_root = config.get("install_root", "")
@@ -43,11 +149,27 @@ class DatabaseServerComponent(ServiceServerComponent):
         self.postgresql_config = config.get("postgresql_config", {})
         self.mongodb_config = config.get("mongodb_config", {})
 
+        # PID文件缓存：仅在文件 (mtime, size) 变化时重新读取
+        self._pid_cache: Optional[int] = None
+        self._pid_stamp: Optional[Tuple[int, int]] = None
+
+        # 健康检查结果缓存，TTL 内的重复轮询直接返回上次结果（0 表示不缓存）
+        self._hc_ttl = float(config.get("health_check_ttl", 2.0))
+        self._hc_cache: Optional[Tuple[bool, str]] = None
+        self._hc_ts = 0.0
+
+        # SQLite API 服务的 /api/query 可执行任意SQL，默认关闭
+        self.enable_query_api = bool(config.get("enable_query_api", False))
+
+        # 数据目录是否已初始化，首次启动时检查一次，初始化成功后置为True
+        self._initialized: Optional[bool] = None
+
     def start(self) -> Tuple[bool, str]:
         """启动数据库服务端"""
         if self.status == "running":
             return True, f"Database server already running on {self.endpoint}"
 
+        self._hc_cache = None
         try:
             if self.db_type == "mysql":
                 return self._start_mysql()
@@ -72,23 +194,22 @@ class DatabaseServerComponent(ServiceServerComponent):
             if pid is not None:
                 os.kill(pid, signal.SIGTERM)
 
-                timeout = 30
-                start_time = time.time()
-                while time.time() - start_time < timeout:
-                    if not self._is_process_running(pid):
-                        break
-                    time.sleep(1)
-
-                if self._is_process_running(pid):
+                if not self._wait_for_exit(pid, timeout=30):
                     return False, f"Database server process {pid} did not exit in time"
             elif self._is_port_open(self.host, self.port):
                 return (
                     False,
                     "Database server pid file is missing while port remains reachable",
                 )
+            else:
+                # 没有PID文件且端口已关闭，无需进入端口轮询
+                self._pid_cache = self._pid_stamp = None
+                self.status = "stopped"
+                return True, "Database server stopped successfully"
 
-            if os.path.exists(self.pid_file):
-                os.remove(self.pid_file)
+            if self._pid_file_exists():
+                os.remove(self._pid_file_b)
+            self._pid_cache = self._pid_stamp = None
 
             port_timeout = 10
             port_start = time.time()
@@ -111,11 +232,10 @@ class DatabaseServerComponent(ServiceServerComponent):
 
     def restart(self) -> Tuple[bool, str]:
         """重启数据库服务端"""
+        # stop() 已通过 _wait_for_exit 等到进程退出并删除PID文件，可直接启动
         stop_result = self.stop()
         if not stop_result[0]:
             return stop_result
-
-        time.sleep(2)  # 等待完全停止
         return self.start()
 
     def get_status(self) -> Dict[str, Any]:
@@ -141,10 +261,20 @@ class DatabaseServerComponent(ServiceServerComponent):
         return status_info
 
     def health_check(self) -> Tuple[bool, str]:
-        """健康检查"""
+        """健康检查（运行中时结果按 health_check_ttl 缓存）"""
         if self.status != "running":
             return False, f"Database server not running (status: {self.status})"
 
+        now = time.monotonic()
+        if self._hc_cache is not None and now - self._hc_ts < self._hc_ttl:
+            return self._hc_cache
+
+        result = self._check_health()
+        self._hc_cache, self._hc_ts = result, now
+        return result
+
+    def _check_health(self) -> Tuple[bool, str]:
+        """执行实际的健康检查"""
         try:
             # 检查进程是否存在
             pid = self._get_pid()
@@ -153,6 +283,9 @@ class DatabaseServerComponent(ServiceServerComponent):
                 return False, "Database server process not found"
             if self.db_type == "mysql":
                 return self._mysql_health_check(pid)
+            # 进程存在但未监听端口（如卡死）时同样视为不健康
+            if not self._probe_port(self.host, self.port):
+                return False, f"Database server port {self.port} is not reachable"
             return True, f"Database server healthy (PID: {pid})"
         except Exception as e:
             return False, f"Health check failed: {str(e)}"
@@ -181,7 +314,7 @@ class DatabaseServerComponent(ServiceServerComponent):
         os.makedirs(self.data_dir, exist_ok=True)
 
         # 初始化数据库（如果需要）
-        if not os.path.exists(f"{self.data_dir}/mysql"):
+        if not self._is_data_dir_initialized("mysql"):
             init_cmd = [str(mysql_binary)]
             if self.config_file:
                 init_cmd.append(f"--defaults-file={self.config_file}")
@@ -193,6 +326,7 @@ class DatabaseServerComponent(ServiceServerComponent):
                 ]
             )
             subprocess.run(init_cmd, check=True, env=process_env)
+            self._initialized = True
 
         # 启动MySQL服务
         start_cmd = [str(mysql_binary)]
@@ -216,27 +350,21 @@ class DatabaseServerComponent(ServiceServerComponent):
         }
         mysql_runtime_options = self._filter_mysql_server_options(mysql_config)
 
-        for key, value in mysql_runtime_options.items():
-            start_cmd.append(f"--{key}={value}")
-
-        result = subprocess.run(
-            start_cmd,
-            capture_output=True,
-            text=True,
-            env=process_env,
+        start_cmd.extend(
+            f"--{key}={value}" for key, value in mysql_runtime_options.items()
         )
 
-        if result.returncode == 0:
-            # 等待服务启动
-            time.sleep(3)
-            self.status = "running"
-            healthy, message = self.health_check()
+        returncode, stderr = self._run_launcher(start_cmd, env=process_env)
+
+        if returncode == 0:
+            # 轮询健康检查直至就绪，取代固定的等待时间
+            healthy, message = self._wait_until_healthy()
             if healthy:
                 return True, f"MySQL server started on {self.endpoint}"
             self.status = "error"
             return False, f"MySQL server started but health check failed: {message}"
         else:
-            return False, f"MySQL server failed to start: {result.stderr}"
+            return False, f"MySQL server failed to start: {stderr}"
 
     def _check_runtime_backend_capabilities(self) -> Tuple[bool, str]:
         if self.runtime_backend != "host":
@@ -346,7 +474,7 @@ class DatabaseServerComponent(ServiceServerComponent):
         }
 
     def _mysql_health_check(self, pid: int) -> Tuple[bool, str]:
-        if not self._is_port_open(self.host, self.port):
+        if not self._probe_port(self.host, self.port):
             return False, f"MySQL port {self.port} is not reachable"
         mode = str(self.mysql_config.get("health_check_mode", "sql")).lower()
         if mode == "tcp":
@@ -413,22 +541,105 @@ class DatabaseServerComponent(ServiceServerComponent):
         except Exception as exc:
             return False, f"MySQL scenario database init failed: {exc}"
 
-    def _is_port_open(self, host: str, port: int) -> bool:
+    def _run_launcher(
+        self, cmd: list[str], env: Optional[dict[str, str]] = None, timeout: float = 30
+    ) -> Tuple[int, str]:
+        """运行自行后台化（--daemonize/--fork）的启动命令，返回 (退出码, stderr)
+
+        stderr 写入临时文件而非管道：后台化的子进程会继承输出句柄，
+        读管道会一直阻塞到服务端退出。
+        """
+        with tempfile.TemporaryFile(mode="w+") as stderr_file:
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=stderr_file,
+                text=True,
+                env=env,
+            )
+            try:
+                returncode = proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                return -1, f"launcher did not exit within {timeout}s"
+            stderr_file.seek(0)
+            return returncode, stderr_file.read()
+
+    def _wait_until_healthy(self, timeout: float = 10.0) -> Tuple[bool, str]:
+        """每 50ms 执行一次健康检查，健康时立即返回最近一次的结果"""
+        deadline = time.monotonic() + timeout
+        while True:
+            # 健康检查失败时会改写状态，每轮按已启动重新检查且不读缓存
+            self.status = "running"
+            self._hc_cache = None
+            healthy, message = self.health_check()
+            if healthy or time.monotonic() >= deadline:
+                return healthy, message
+            time.sleep(0.05)
+
+    def _wait_for_port(self, timeout: float = 10.0) -> bool:
+        """每 50ms 探测一次服务端口，端口可连接时立即返回"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                with socket.create_connection((self.host, self.port), timeout=0.2):
+                    return True
+            except OSError:
+                pass
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+    def _is_port_open(self, host: str, port: int, timeout: float = 3) -> bool:
         try:
-            with socket.create_connection((host, port), timeout=3):
+            with socket.create_connection((host, port), timeout=timeout):
                 return True
         except OSError:
             return False
 
+    @staticmethod
+    def _probe_port(host: str, port: int, timeout: float = 0.2) -> bool:
+        """非阻塞 connect_ex 探测端口是否在监听
+
+        连接进行中时用 selectors 等待可写，总耗时不超过 timeout；
+        健康检查可能被并发批量调用，预算较短以免占用线程。
+        """
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError:
+            return False
+
+        for family, socktype, proto, _, addr in infos:
+            with socket.socket(family, socktype, proto) as sock:
+                sock.setblocking(False)
+                err = sock.connect_ex(addr)
+                if err in (errno.EINPROGRESS, errno.EALREADY, errno.EWOULDBLOCK):
+                    with selectors.DefaultSelector() as sel:
+                        sel.register(sock, selectors.EVENT_WRITE)
+                        if not sel.select(timeout):
+                            continue
+                    err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if err == 0:
+                    return True
+        return False
+
+    def _is_data_dir_initialized(self, marker: str) -> bool:
+        """数据目录是否已初始化，只在首次调用时检查标记文件"""
+        if self._initialized is None:
+            self._initialized = os.path.exists(os.path.join(self.data_dir, marker))
+        return self._initialized
+
     def _start_postgresql(self) -> Tuple[bool, str]:
         """启动PostgreSQL服务端"""
         # 创建数据目录
         os.makedirs(self.data_dir, exist_ok=True)
 
         # 初始化数据库集群（如果需要）
-        if not os.path.exists(f"{self.data_dir}/PG_VERSION"):
+        if not self._is_data_dir_initialized("PG_VERSION"):
             init_cmd = ["initdb", "-D", self.data_dir, "-U", "postgres"]
             subprocess.run(init_cmd, check=True)
+            self._initialized = True
 
         # 启动PostgreSQL服务
         start_cmd = [
@@ -442,15 +653,15 @@ class DatabaseServerComponent(ServiceServerComponent):
             f"-p {self.port} -h {self.host}",
         ]
 
-        result = subprocess.run(start_cmd, capture_output=True, text=True)
+        returncode, stderr = self._run_launcher(start_cmd)
 
-        if result.returncode == 0:
-            # 等待服务启动
-            time.sleep(3)
+        if returncode == 0:
+            if not self._wait_for_port():
+                return False, f"PostgreSQL server port {self.port} not reachable"
             self.status = "running"
             return True, f"PostgreSQL server started on {self.endpoint}"
         else:
-            return False, f"PostgreSQL server failed to start: {result.stderr}"
+            return False, f"PostgreSQL server failed to start: {stderr}"
 
     def _start_mongodb(self) -> Tuple[bool, str]:
         """启动MongoDB服务端"""
@@ -476,18 +687,21 @@ class DatabaseServerComponent(ServiceServerComponent):
         # 应用MongoDB配置
         mongodb_config = {"journal": "true", "syncdelay": "60", **self.mongodb_config}
 
-        for key, value in mongodb_config.items():
-            start_cmd.extend(["--" + key, str(value)])
+        start_cmd.extend(
+            arg
+            for key, value in mongodb_config.items()
+            for arg in (f"--{key}", str(value))
+        )
 
-        result = subprocess.run(start_cmd, capture_output=True, text=True)
+        returncode, stderr = self._run_launcher(start_cmd)
 
-        if result.returncode == 0:
-            # 等待服务启动
-            time.sleep(3)
+        if returncode == 0:
+            if not self._wait_for_port():
+                return False, f"MongoDB server port {self.port} not reachable"
             self.status = "running"
             return True, f"MongoDB server started on {self.endpoint}"
         else:
-            return False, f"MongoDB server failed to start: {result.stderr}"
+            return False, f"MongoDB server failed to start: {stderr}"
 
     def _start_sqlite(self) -> Tuple[bool, str]:
         """启动SQLite服务端（SQLite是文件数据库，不需要服务端）"""
@@ -496,90 +710,153 @@ class DatabaseServerComponent(ServiceServerComponent):
         return self._start_sqlite_api_server()
 
     def _start_sqlite_api_server(self) -> Tuple[bool, str]:
-        """启动SQLite API服务端"""
-        # 创建简单的HTTP API服务器
-        api_script = f"""
-import http.server
-import socketserver
-import sqlite3
-import json
-import urllib.parse
-from pathlib import Path
-
-class SQLiteAPIHandler(http.server.BaseHTTPRequestHandler):
-    def do_GET(self):
-        if self.path.startswith('/api/'):
-            self.handle_api_request()
-        else:
-            self.send_error(404, "Not Found")
-    
-    def do_POST(self):
-        if self.path.startswith('/api/'):
-            self.handle_api_request()
-        else:
-            self.send_error(404, "Not Found")
-    
-    def handle_api_request(self):
-        try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            post_data = self.rfile.read(content_length).decode('utf-8') if content_length > 0 else ''
-            
-            # 解析请求
-            path_parts = self.path.split('/')
-            if len(path_parts) >= 3:
-                operation = path_parts[2]
-                
-                # 这里可以添加SQLite操作逻辑
-                response_data = {{"message": "SQLite API server running", "operation": operation}}
-                
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(response_data).encode())
-            else:
-                self.send_error(400, "Bad Request")
-        except Exception as e:
-            self.send_error(500, f"Internal Server Error: {{str(e)}}")
+        """启动SQLite API服务端
 
-# 启动服务器
-PORT = {self.port}
-Handler = SQLiteAPIHandler
-with socketserver.TCPServer(("", PORT), Handler) as httpd:
-    with open('{self.pid_file}', 'w') as f:
-        f.write(str(os.getpid()))
-    httpd.serve_forever()
+        POST /api/query 接口无认证且可对数据库执行任意SQL，默认关闭，
+        需在配置中显式设置 enable_query_api=True 才会开启。
         """
+        # 仅替换端口、PID文件与数据库路径，脚本主体为模块级模板
+        os.makedirs(self.data_dir, exist_ok=True)
+        db_path = self.config.get("database") or os.path.join(
+            self.data_dir, "sqlite.db"
+        )
+        api_script = _SQLITE_API_SCRIPT.substitute(
+            HOST=repr(self.host),
+            PORT=int(self.port),
+            PID_FILE=repr(self.pid_file),
+            DB_PATH=repr(db_path),
+            QUERY_API=repr(self.enable_query_api),
+        )
 
-        # 写入API脚本
-        api_script_path = f"/tmp/sqlite_api_server_{self.port}.py"
-        with open(api_script_path, "w") as f:
-            f.write(api_script)
+        # 写入API脚本（内容未变化时跳过）
+        api_script_path = os.path.join("/tmp", f"sqlite_api_server_{self.port}.py")
+        self._write_api_script(api_script_path, api_script)
 
         # 启动API服务
+        # serve_forever() 不会返回，不能等待进程结束；输出写入日志文件，
+        # 避免请求日志写满未读取的管道而阻塞服务
+        if self._pid_file_exists():
+            os.remove(self._pid_file_b)
         start_cmd = ["python3", api_script_path]
-        result = subprocess.run(
-            start_cmd,
-            capture_output=True,
-            text=True,
-            preexec_fn=os.setsid if hasattr(os, "setsid") else None,
-        )
+        with open(self.log_file, "ab") as log:
+            proc = subprocess.Popen(
+                start_cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=log,
+                start_new_session=True,
+            )
 
-        if result.returncode == 0:
-            time.sleep(2)
-            self.status = "running"
-            return True, f"SQLite API server started on {self.endpoint}"
-        else:
-            return False, f"SQLite API server failed to start: {result.stderr}"
+        # 服务端绑定端口后才写PID文件，以此作为就绪信号
+        deadline = time.monotonic() + 5
+        while proc.poll() is None and time.monotonic() < deadline:
+            if self._pid_file_exists():
+                self.status = "running"
+                return True, f"SQLite API server started on {self.endpoint}"
+            time.sleep(0.05)
+
+        if proc.poll() is None:
+            proc.terminate()
+            proc.wait()
+        return False, f"SQLite API server failed to start: {self._read_log_tail()}"
+
+    @staticmethod
+    def _write_api_script(path: str, script: str) -> None:
+        """写入API脚本：首行记录内容摘要，摘要一致时不重写，否则原子替换"""
+        digest = hashlib.blake2b(script.encode(), digest_size=8).hexdigest()
+        header = f"# blake2b: {digest}\n"
+        try:
+            with open(path, "r") as f:
+                if f.readline() == header:
+                    return
+        except (OSError, UnicodeDecodeError):
+            pass
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(header)
+            f.write(script)
+        os.replace(tmp_path, path)
+
+    def _read_log_tail(self, limit: int = 2000) -> str:
+        """读取日志文件末尾用于错误信息"""
+        try:
+            with open(self.log_file, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(f.tell() - limit, 0))
+                return f.read().decode("utf-8", errors="replace").strip()
+        except OSError:
+            return ""
+
+    def _pid_file_exists(self) -> bool:
+        """PID文件是否存在"""
+        try:
+            os.stat(self._pid_file_b)
+        except FileNotFoundError:
+            return False
+        return True
 
     def _get_pid(self) -> Optional[int]:
-        """获取进程PID"""
+        """获取进程PID（PID文件未变化时只需一次 stat）"""
         try:
-            if os.path.exists(self.pid_file):
-                with open(self.pid_file, "r") as f:
-                    return int(f.read().strip())
-        except (FileNotFoundError, ValueError):
-            pass
-        return None
+            st = os.stat(self._pid_file_b)
+        except OSError:
+            self._pid_cache = self._pid_stamp = None
+            return None
+
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp != self._pid_stamp:
+            try:
+                with open(self._pid_file_b, "r") as f:
+                    self._pid_cache = int(f.read().strip())
+            except (FileNotFoundError, ValueError):
+                self._pid_cache = None
+            self._pid_stamp = stamp
+        return self._pid_cache
+
+    def _wait_for_exit(self, pid: int, timeout: float) -> bool:
+        """等待进程退出，返回是否在超时前退出
+
+        Linux 上通过 pidfd 由内核通知进程退出，无需轮询；
+        其他平台以 10ms 起步的指数退避轮询。
+        """
+        pidfd_open = getattr(os, "pidfd_open", None)
+        if pidfd_open is not None:
+            try:
+                fd = pidfd_open(pid)
+            except ProcessLookupError:
+                return True
+            except OSError:
+                fd = None
+            if fd is not None:
+                try:
+                    readable, _, _ = select.select([fd], [], [], timeout)
+                finally:
+                    os.close(fd)
+                if readable:
+                    self._has_exited(pid)  # 回收直接子进程
+                    return True
+                return self._has_exited(pid)
+
+        deadline = time.monotonic() + timeout
+        delay = 0.01
+        while not self._has_exited(pid):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.5)
+        return True
+
+    def _has_exited(self, pid: int) -> bool:
+        """进程是否已退出；直接子进程会被 waitpid 回收，避免僵尸进程被视为存活"""
+        if os.name != "nt":
+            try:
+                reaped, _ = os.waitpid(pid, os.WNOHANG)
+                if reaped == pid:
+                    return True
+            except ChildProcessError:
+                pass
+        return not self._is_process_running(pid)
 
     def _is_process_running(self, pid: int) -> bool:
         """检查进程是否运行"""
@@ -614,10 +891,8 @@ with socketserver.TCPServer(("", PORT), Handler) as httpd:
             return "0s"
 
         try:
-            if os.path.exists(self.pid_file):
-                stat_time = os.stat(self.pid_file).st_mtime
-                uptime_seconds = time.time() - stat_time
-                return f"{int(uptime_seconds)}s"
+            uptime_seconds = time.time() - os.stat(self._pid_file_b).st_mtime
+            return f"{int(uptime_seconds)}s"
         except Exception:
             pass
         return "unknown"
@@ -3,10 +3,21 @@
 数据库对象 v2.0 - 支持服务端和客户端分离管理
 """
 
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+
 from .base import BaseManagedObject
-from .db_server import DatabaseServerComponent
-from .db_client import DatabaseClientComponent
-from typing import Dict, Any, Optional, Tuple
+from .db_defaults import CLIENT_PARAM_KEYS, SERVER_PARAM_KEYS, default_port
+from typing import TYPE_CHECKING, Callable, Dict, Any, Optional, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    # 组件在 install() 中按部署模式按需导入
+    from .db_server import DatabaseServerComponent
+    from .db_client import DatabaseClientComponent
 
 
 try:
@@ -17,46 +28,175 @@ except ImportError:
         return str(text)
 
 
+# 状态消息中使用的彩色标签（常量，模块加载时生成一次）
+_DB_LABEL = get_colored_text("Enhanced Database", 92)
+
+T = TypeVar("T")
+
+# 需要服务端 / 客户端组件的部署模式
+_NEEDS_SERVER = frozenset(("server_only", "full_stack"))
+_NEEDS_CLIENT = frozenset(("client_only", "full_stack"))
+
+# 部署模式描述（只读）
+_MODE_DESCRIPTIONS = MappingProxyType(
+    {
+        "client_only": "Client Only",
+        "server_only": "Server Only",
+        "full_stack": "Full Stack (Server + Client)",
+    }
+)
+
+# 参与构建服务端 / 客户端配置的 install 参数
+_SERVER_ITEM_KEYS = ("db_type", *SERVER_PARAM_KEYS)
+_CLIENT_ITEM_KEYS = ("db_type", *CLIENT_PARAM_KEYS)
+
+
+def _params_items(
+    params: Dict[str, Any], keys: Tuple[str, ...]
+) -> Tuple[Tuple[str, Any], ...]:
+    """提取参与构建配置的参数项"""
+    return tuple((key, params[key]) for key in keys if key in params)
+
+
+def _is_hashable(items: Tuple[Tuple[str, Any], ...]) -> bool:
+    try:
+        hash(items)
+    except TypeError:
+        return False
+    return True
+
+
+@lru_cache(maxsize=64)
+def _build_server_config(
+    name: str, items: Tuple[Tuple[str, Any], ...]
+) -> MappingProxyType:
+    """按参数项构建服务端配置（参数可哈希时结果缓存，返回只读映射）"""
+    params = dict(items)
+    db_type = params.get("db_type", "sqlite")
+    server_config = {
+        "db_type": db_type,
+        "host": "localhost",
+        "port": default_port(db_type),
+        "data_dir": f"/tmp/{name}_data",
+        "log_file": f"/tmp/{name}.log",
+        "pid_file": f"/tmp/{name}.pid",
+        **{
+            key: params[name]
+            for name, key in SERVER_PARAM_KEYS.items()
+            if name in params
+        },
+    }
+    return MappingProxyType(server_config)
+
+
+@lru_cache(maxsize=64)
+def _build_client_config(items: Tuple[Tuple[str, Any], ...]) -> MappingProxyType:
+    """按参数项构建客户端配置（不含 connection_params 默认值，返回只读映射）"""
+    params = dict(items)
+    db_type = params.get("db_type", "sqlite")
+    client_config = {
+        "db_type": db_type,
+        "server_host": params.get("server_host", "localhost"),
+        "server_port": params.get("server_port", default_port(db_type)),
+        "database": params.get("database", ""),
+        "username": params.get("username", ""),
+        "password": params.get("password", ""),
+        "timeout": params.get("timeout", 30),
+    }
+    if "connection_params" in params:
+        client_config["connection_params"] = params["connection_params"]
+    return MappingProxyType(client_config)
+
+
+# install 参数 share_client=True 时，相同端点与账号的对象共用一个客户端组件：
+# 键 -> [客户端组件, 使用者集合, 已启动的使用者集合]
+_SHARED_CLIENTS: Dict[Tuple[Any, ...], list] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def _client_key(client_config: Dict[str, Any]) -> Tuple[Any, ...]:
+    """共享客户端的键：数据库类型、端点、库名与账号"""
+    return tuple(
+        client_config.get(key)
+        for key in (
+            "db_type",
+            "server_host",
+            "server_port",
+            "database",
+            "username",
+            "password",
+        )
+    )
+
+
 class EnhancedDBObject(BaseManagedObject):
     """增强的数据库对象，支持服务端和客户端管理"""
 
+    __slots__ = (
+        "server_component",
+        "client_component",
+        "mode",
+        "_status_cache",
+        "_status_cache_ts",
+        "_client_key",
+    )
+
+    # get_status() 结果的缓存时间（秒）
+    STATUS_CACHE_TTL = 0.5
+
+    # 服务端/客户端只读查询共用的线程池（组件的 get_status/health_check 需线程安全）
+    _IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ptest-db-v2")
+
     def __init__(self, name: str, env_manager):
         super().__init__(name, "database", env_manager)
-        self.server_component: Optional[DatabaseServerComponent] = None
-        self.client_component: Optional[DatabaseClientComponent] = None
+        self.server_component: Optional["DatabaseServerComponent"] = None
+        self.client_component: Optional["DatabaseClientComponent"] = None
         self.mode = "client_only"  # client_only, server_only, full_stack
 
+        # 状态缓存，生命周期操作时失效
+        self._status_cache: Optional[Dict[str, Any]] = None
+        self._status_cache_ts = 0.0
+
+        # 使用共享客户端时的注册键，独占客户端为 None
+        self._client_key: Optional[Tuple[Any, ...]] = None
+
     def install(self, params: Dict[str, Any] = None) -> str:  # type: ignore
         """安装数据库对象"""
         if not params:
             return "✗ Database installation requires parameters"
 
-        self.env_manager.logger.info(
-            f"Installing enhanced database object: {self.name}"
-        )
+        self._log.info("Installing enhanced database object: %s", self.name)
+        self._status_cache = None
+
+        # 重新安装时先释放之前持有的共享客户端，避免使用者登记泄漏
+        if self._client_key is not None:
+            self._detach_client()
 
         # 确定部署模式
         self.mode = params.get("mode", "client_only")
 
         # 安装服务端组件（如果需要）
-        if self.mode in ["server_only", "full_stack"]:
+        if self.mode in _NEEDS_SERVER:
+            from .db_server import DatabaseServerComponent
+
             server_config = self._prepare_server_config(params)
             try:
                 self.server_component = DatabaseServerComponent(server_config)
-                self.env_manager.logger.info(
-                    f"Server component initialized for {self.name}"
-                )
+                self._log.info("Server component initialized for %s", self.name)
             except Exception as e:
                 return f"✗ Failed to initialize server component: {str(e)}"
 
         # 安装客户端组件
-        if self.mode in ["client_only", "full_stack"]:
+        if self.mode in _NEEDS_CLIENT:
+            from .db_client import DatabaseClientComponent
+
             client_config = self._prepare_client_config(params)
             try:
-                self.client_component = DatabaseClientComponent(client_config)
-                self.env_manager.logger.info(
-                    f"Client component initialized for {self.name}"
-                )
+                if params.get("share_client", False):
+                    self.client_component = self._acquire_shared_client(client_config)
+                else:
+                    self.client_component = DatabaseClientComponent(client_config)
+                self._log.info("Client component initialized for %s", self.name)
             except Exception as e:
                 return f"✗ Failed to initialize client component: {str(e)}"
 
@@ -64,119 +204,127 @@ class EnhancedDBObject(BaseManagedObject):
         if self.client_component:
             success, message = self.client_component.test_connection()
             if not success:
+                if self._client_key is not None:
+                    self._detach_client()
                 return f"✗ Database connection test failed: {message}"
 
         self.installed = True
         self.status = "installed"
 
         mode_desc = self._get_mode_description()
-        return f"✓ {get_colored_text('Enhanced Database', 92)} object '{self.name}' ({mode_desc}) installed and ready"
+        return f"✓ {_DB_LABEL} object '{self.name}' ({mode_desc}) installed and ready"
 
     def start(self) -> str:
         """启动数据库对象"""
+        return self._format_result(self._start())
+
+    def _start(self) -> Tuple[bool, str]:
+        """启动数据库对象，返回 (是否成功, 消息)"""
         if not self.installed:
-            return f"✗ Database object '{self.name}' not installed"
+            return False, f"Database object '{self.name}' not installed"
 
-        self.env_manager.logger.info(f"Starting enhanced database object: {self.name}")
+        self._log.info("Starting enhanced database object: %s", self.name)
+        self._status_cache = None
 
-        results = []
+        server_msg = client_msg = ""
 
         # 启动服务端（如果有）
         if self.server_component:
             success, message = self.server_component.start()
-            if success:
-                results.append(f"Server: {message}")
-            else:
-                return f"✗ Failed to start server: {message}"
+            if not success:
+                return False, f"Failed to start server: {message}"
+            server_msg = f"Server: {message}"
 
         # 启动客户端（建立连接）
         if self.client_component:
+            self._mark_client_active(True)
             success, message = self.client_component.start()
-            if success:
-                results.append(f"Client: {message}")
-            else:
-                return f"✗ Failed to start client: {message}"
+            if not success:
+                self._mark_client_active(False)
+                return False, f"Failed to start client: {message}"
+            client_msg = f"Client: {message}"
 
         self.status = "running"
-        return (
-            f"✓ {get_colored_text('Enhanced Database', 92)} object '{self.name}' started:\n"
-            + "\n".join(results)
-        )
+        details = "\n".join(m for m in (server_msg, client_msg) if m)
+        return True, f"{_DB_LABEL} object '{self.name}' started:\n{details}"
 
     def stop(self) -> str:
         """停止数据库对象"""
+        return self._format_result(self._stop())
+
+    def _stop(self) -> Tuple[bool, str]:
+        """停止数据库对象，返回 (是否成功, 消息)"""
         if self.status != "running":
-            return f"✗ Database object '{self.name}' not running"
+            return False, f"Database object '{self.name}' not running"
 
-        self.env_manager.logger.info(f"Stopping enhanced database object: {self.name}")
+        self._log.info("Stopping enhanced database object: %s", self.name)
+        self._status_cache = None
 
-        results = []
+        client_msg = server_msg = ""
 
-        # 停止客户端
+        # 停止客户端（失败时同样记录消息；仍被其他对象共用时保持连接）
         if self.client_component:
-            success, message = self.client_component.stop()
-            if success:
-                results.append(f"Client: {message}")
+            if self._mark_client_active(False):
+                client_msg = "Client: shared connection kept open"
             else:
-                results.append(f"Client: {message}")
+                client_msg = f"Client: {self.client_component.stop()[1]}"
 
         # 停止服务端
         if self.server_component:
-            success, message = self.server_component.stop()
-            if success:
-                results.append(f"Server: {message}")
-            else:
-                results.append(f"Server: {message}")
+            server_msg = f"Server: {self.server_component.stop()[1]}"
 
         self.status = "stopped"
-        return (
-            f"✓ {get_colored_text('Enhanced Database', 92)} object '{self.name}' stopped:\n"
-            + "\n".join(results)
-        )
+        details = "\n".join(m for m in (client_msg, server_msg) if m)
+        return True, f"{_DB_LABEL} object '{self.name}' stopped:\n{details}"
 
     def restart(self) -> str:
         """重启数据库对象"""
-        result = self.stop()
-        if "✓" not in result:
-            return result
+        result = self._stop()
+        if not result[0]:
+            return self._format_result(result)
 
         return self.start()
 
     def uninstall(self) -> str:
         """卸载数据库对象"""
+        # stop() 已停止过全部组件时，清理阶段不再重复停止
+        components_stopped = False
         if self.status == "running":
             self.stop()
+            components_stopped = True
 
-        self.env_manager.logger.info(f"Removing enhanced database object: {self.name}")
+        self._log.info("Removing enhanced database object: %s", self.name)
+        self._status_cache = None
 
         # 清理服务端
         if self.server_component:
             try:
-                if self.server_component.status == "running":
+                if not components_stopped and self.server_component.status == "running":
                     self.server_component.stop()
                 self.server_component = None
             except Exception as e:
-                self.env_manager.logger.warning(
-                    f"Error cleaning server component: {str(e)}"
-                )
+                self._log.warning("Error cleaning server component: %s", e)
 
-        # 清理客户端
+        # 清理客户端（共享客户端仍有其他已启动的使用者时保持连接）
         if self.client_component:
             try:
-                if self.client_component.status == "running":
-                    self.client_component.stop()
-                self.client_component = None
+                self._detach_client()
             except Exception as e:
-                self.env_manager.logger.warning(
-                    f"Error cleaning client component: {str(e)}"
-                )
+                self._log.warning("Error cleaning client component: %s", e)
 
         self.installed = False
         self.status = "removed"
-        return f"✓ {get_colored_text('Enhanced Database', 92)} object '{self.name}' uninstalled"
+        return f"✓ {_DB_LABEL} object '{self.name}' uninstalled"
 
     def get_status(self) -> Dict[str, Any]:
-        """获取数据库对象状态"""
+        """获取数据库对象状态（STATUS_CACHE_TTL 内返回缓存结果的深拷贝）"""
+        now = time.monotonic()
+        if (
+            self._status_cache is not None
+            and now - self._status_cache_ts < self.STATUS_CACHE_TTL
+        ):
+            return copy.deepcopy(self._status_cache)
+
         status = {
             "name": self.name,
             "type_name": self.type_name,
@@ -188,39 +336,31 @@ class EnhancedDBObject(BaseManagedObject):
             "overall_health": "unknown",
         }
 
-        # 获取服务端状态
-        if self.server_component:
-            status["server_status"] = self.server_component.get_status()
-
-        # 获取客户端状态
-        if self.client_component:
-            status["client_status"] = self.client_component.get_status()
+        # 并发获取服务端与客户端状态
+        status["server_status"], status["client_status"] = self._call_components(
+            lambda component: component.get_status()
+        )
 
         # 评估整体健康状态
         status["overall_health"] = self._evaluate_health(status)
 
-        return status
+        self._status_cache, self._status_cache_ts = status, now
+        return copy.deepcopy(status)
 
     def health_check(self) -> Tuple[bool, str]:
         """执行健康检查"""
         if not self.installed:
             return False, "Database object not installed"
 
-        health_results = []
-
-        # 检查服务端健康状态
-        if self.server_component:
-            success, message = self.server_component.health_check()
-            health_results.append(
-                {"component": "server", "healthy": success, "message": message}
-            )
-
-        # 检查客户端健康状态
-        if self.client_component:
-            success, message = self.client_component.health_check()
-            health_results.append(
-                {"component": "client", "healthy": success, "message": message}
-            )
+        # 并发检查服务端与客户端健康状态
+        server_result, client_result = self._call_components(
+            lambda component: component.health_check()
+        )
+        health_results = [
+            {"component": name, "healthy": result[0], "message": result[1]}
+            for name, result in (("server", server_result), ("client", client_result))
+            if result is not None
+        ]
 
         # 评估整体健康状态
         all_healthy = all(result["healthy"] for result in health_results)
@@ -231,18 +371,18 @@ class EnhancedDBObject(BaseManagedObject):
         else:
             return False, f"Health issues detected: {'; '.join(messages)}"
 
-    def execute_query(self, query: str) -> Tuple[bool, Any]:
+    def execute_query(self, query: str, params: Any = None) -> Tuple[bool, Any]:
         """执行数据库查询（通过客户端）"""
         if not self.installed or not self.client_component:
             return False, f"Database '{self.name}' client not properly installed"
 
-        return self.client_component.execute_query(query)
+        return self.client_component.execute_query(query, params)
 
-    def get_server_component(self) -> Optional[DatabaseServerComponent]:
+    def get_server_component(self) -> Optional["DatabaseServerComponent"]:
         """获取服务端组件"""
         return self.server_component if self.installed else None
 
-    def get_client_component(self) -> Optional[DatabaseClientComponent]:
+    def get_client_component(self) -> Optional["DatabaseClientComponent"]:
         """获取客户端组件"""
         return self.client_component if self.installed else None
 
@@ -266,67 +406,105 @@ class EnhancedDBObject(BaseManagedObject):
 
         return info
 
-    def _prepare_server_config(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """准备服务端配置"""
-        server_config = {
-            "db_type": params.get("db_type", "sqlite"),
-            "host": params.get("server_host", "localhost"),
-            "port": params.get(
-                "server_port", self._get_default_port(params.get("db_type", "sqlite"))
-            ),
-            "data_dir": params.get("data_dir", f"/tmp/{self.name}_data"),
-            "log_file": params.get("log_file", f"/tmp/{self.name}.log"),
-            "pid_file": params.get("pid_file", f"/tmp/{self.name}.pid"),
-        }
-
-        # 添加数据库特定配置
-        if "mysql_config" in params:
-            server_config["mysql_config"] = params["mysql_config"]
-        if "postgresql_config" in params:
-            server_config["postgresql_config"] = params["postgresql_config"]
-        if "mongodb_config" in params:
-            server_config["mongodb_config"] = params["mongodb_config"]
+    def _acquire_shared_client(
+        self, client_config: Dict[str, Any]
+    ) -> "DatabaseClientComponent":
+        """获取（必要时创建）共享客户端组件并登记为使用者"""
+        from .db_client import DatabaseClientComponent
+
+        key = _client_key(client_config)
+        with _shared_clients_lock:
+            entry = _SHARED_CLIENTS.get(key)
+            if entry is None:
+                entry = _SHARED_CLIENTS[key] = [
+                    DatabaseClientComponent(client_config),
+                    set(),
+                    set(),
+                ]
+            entry[1].add(self)
+        self._client_key = key
+        return entry[0]
+
+    def _mark_client_active(self, active: bool) -> bool:
+        """登记或注销本对象对共享客户端的启动，返回是否还有其他已启动的使用者"""
+        if self._client_key is None:
+            return False
+        with _shared_clients_lock:
+            entry = _SHARED_CLIENTS.get(self._client_key)
+            if entry is None:
+                return False
+            if active:
+                entry[2].add(self)
+            else:
+                entry[2].discard(self)
+            return bool(entry[2] - {self})
+
+    def _release_client(self) -> bool:
+        """注销本对象对客户端组件的使用，返回是否已无其他已启动的使用者"""
+        key, self._client_key = self._client_key, None
+        if key is None:
+            return True
+        with _shared_clients_lock:
+            entry = _SHARED_CLIENTS.get(key)
+            if entry is None or entry[0] is not self.client_component:
+                return True
+            entry[1].discard(self)
+            entry[2].discard(self)
+            if not entry[1]:
+                del _SHARED_CLIENTS[key]
+            return not entry[2]
+
+    def _detach_client(self) -> None:
+        """释放客户端组件；没有其他已启动的使用者时断开连接"""
+        client = self.client_component
+        can_stop = self._release_client()
+        self.client_component = None
+        if can_stop and client is not None and client.status == "running":
+            client.stop()
+
+    def _call_components(
+        self, call: Callable[[Any], T]
+    ) -> Tuple[Optional[T], Optional[T]]:
+        """对服务端、客户端组件执行 call，返回 (服务端结果, 客户端结果)
+
+        两个组件都存在时并发执行（均为I/O等待），缺失的组件结果为 None。
+        """
+        server, client = self.server_component, self.client_component
+        if server and client:
+            server_future = self._IO_POOL.submit(call, server)
+            client_result = call(client)
+            return server_future.result(), client_result
+        return (
+            call(server) if server else None,
+            call(client) if client else None,
+        )
 
-        return server_config
+    def _prepare_server_config(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """准备服务端配置（相同的可哈希参数复用缓存结果）"""
+        items = _params_items(params, _SERVER_ITEM_KEYS)
+        if _is_hashable(items):
+            return dict(_build_server_config(self.name, items))
+        return dict(_build_server_config.__wrapped__(self.name, items))
 
     def _prepare_client_config(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """准备客户端配置"""
-        client_config = {
-            "db_type": params.get("db_type", "sqlite"),
-            "server_host": params.get("server_host", "localhost"),
-            "server_port": params.get(
-                "server_port", self._get_default_port(params.get("db_type", "sqlite"))
-            ),
-            "database": params.get("database", ""),
-            "username": params.get("username", ""),
-            "password": params.get("password", ""),
-            "timeout": params.get("timeout", 30),
-            "connection_params": params.get("connection_params", {}),
-        }
-
+        """准备客户端配置（相同的可哈希参数复用缓存结果）"""
+        items = _params_items(params, _CLIENT_ITEM_KEYS)
+        if _is_hashable(items):
+            client_config = dict(_build_client_config(items))
+        else:
+            client_config = dict(_build_client_config.__wrapped__(items))
+        # 每次返回新的默认 connection_params，避免共享可变对象
+        client_config.setdefault("connection_params", {})
         return client_config
 
-    def _get_default_port(self, db_type: str) -> int:
+    @staticmethod
+    def _get_default_port(db_type: str) -> int:
         """获取数据库默认端口"""
-        port_mapping = {
-            "mysql": 3306,
-            "postgresql": 5432,
-            "postgres": 5432,
-            "mongodb": 27017,
-            "oracle": 1521,
-            "sqlserver": 1433,
-            "redis": 6379,
-        }
-        return port_mapping.get(db_type.lower(), 0)
+        return default_port(db_type)
 
     def _get_mode_description(self) -> str:
         """获取模式描述"""
-        mode_descriptions = {
-            "client_only": "Client Only",
-            "server_only": "Server Only",
-            "full_stack": "Full Stack (Server + Client)",
-        }
-        return mode_descriptions.get(self.mode, "Unknown")
+        return _MODE_DESCRIPTIONS.get(self.mode, "Unknown")
 
     def _evaluate_health(self, status: Dict[str, Any]) -> str:
         """评估整体健康状态"""
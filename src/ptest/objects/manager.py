@@ -1,6 +1,9 @@
 # ptest/ptest/objects/manager.py - 修复版本
 
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, List, Optional, Tuple
 
 # 导入所有对象类型
 try:
@@ -57,6 +60,27 @@ except ImportError as e:
 
 from ..utils import get_colored_text
 
+# 对象别名 -> 对象类型（只读）
+_NAME_TO_TYPE = MappingProxyType(
+    {
+        "db": "database",
+        "mysql": "database_server",
+        "postgresql": "database",
+        "postgres": "database",
+        "sqlite": "database",
+        "mongodb": "database_server",
+        "redis": "service",
+        "nginx": "web",
+        "apache": "web",
+    }
+)
+
+
+@lru_cache(maxsize=256)
+def _resolve_type(name: str) -> Optional[str]:
+    """解析别名对应的对象类型（结果缓存）"""
+    return _NAME_TO_TYPE.get(name.lower())
+
 
 class ObjectManager:
     """对象管理器"""
@@ -77,33 +101,29 @@ class ObjectManager:
             "database_server": db_enhanced_module.DatabaseServerObject,
             "database_client": db_enhanced_module.DatabaseClientObject,
         }
-        self.object_aliases = {
-            "db": "database",
-            "mysql": "database_server",
-            "postgresql": "database",
-            "postgres": "database",
-            "sqlite": "database",
-            "mongodb": "database_server",
-            "redis": "service",
-            "nginx": "web",
-            "apache": "web",
+        self.object_aliases = _NAME_TO_TYPE
+        # 类型名与别名到对象类的扁平映射，create_object 只需一次查找
+        self._type_to_class = {
+            **self.object_types,
+            **{
+                alias: self.object_types[target]
+                for alias, target in self.object_aliases.items()
+            },
         }
 
     def get_object_type(self, name: str) -> Optional[str]:
         """获取对象类型"""
-        return self.object_aliases.get(name.lower())
+        return _resolve_type(name)
 
     def normalize_type(self, obj_type: str) -> str:
-        normalized = obj_type.lower()
-        return self.object_aliases.get(normalized, normalized)
+        return _resolve_type(obj_type) or obj_type.lower()
 
     def create_object(self, obj_type: str, name: str, params=None):
         """创建对象实例"""
-        normalized_type = self.normalize_type(obj_type)
-        if normalized_type not in self.object_types:
+        obj_class = self._type_to_class.get(obj_type.lower())
+        if obj_class is None:
             raise ValueError(f"Unknown object type: {obj_type}")
 
-        obj_class = self.object_types[normalized_type]
         obj = obj_class(name, self.env_manager)
         self.objects[name] = obj
         return obj
@@ -115,23 +135,23 @@ class ObjectManager:
             result = obj.install(params)
             if isinstance(result, str):
                 if result.startswith("✓"):
-                    self.logger.info(f"Successfully installed {name}")
+                    self.logger.info("Successfully installed %s", name)
                     return result
-                self.logger.error(f"Failed to install {name}: {result}")
+                self.logger.error("Failed to install %s: %s", name, result)
                 return result
             if result:
-                self.logger.info(f"Successfully installed {name}")
+                self.logger.info("Successfully installed %s", name)
                 return f"✓ Installed {name}"
             else:
-                self.logger.error(f"Failed to install {name}")
+                self.logger.error("Failed to install %s", name)
                 return f"✗ Failed to install {name}"
         except Exception as e:
-            self.logger.error(f"Error installing {name}: {e}")
+            self.logger.error("Error installing %s: %s", name, e)
             return f"✗ Error installing {name}: {e}"
 
     def start(self, name: str):
         """启动对象"""
-        self.logger.info(f"Starting test object: {name}")
+        self.logger.info("Starting test object: %s", name)
         if name not in self.objects:
             return f"✗ Object '{name}' does not exist"
 
@@ -140,7 +160,7 @@ class ObjectManager:
 
     def stop(self, name: str):
         """停止对象"""
-        self.logger.info(f"Stopping test object: {name}")
+        self.logger.info("Stopping test object: %s", name)
         if name not in self.objects:
             return f"✗ Object '{name}' does not exist"
 
@@ -149,7 +169,7 @@ class ObjectManager:
 
     def restart(self, name: str):
         """重启对象"""
-        self.logger.info(f"Restarting test object: {name}")
+        self.logger.info("Restarting test object: %s", name)
         if name not in self.objects:
             return f"✗ Object '{name}' does not exist"
 
@@ -158,28 +178,62 @@ class ObjectManager:
 
     def uninstall(self, name: str):
         """卸载对象"""
+        obj = self.objects.get(name)
+        if obj is None:
+            return f"✗ Object '{name}' does not exist"
+
         try:
-            obj = self.objects[name]
             result = obj.uninstall()
-            if result:
-                del self.objects[name]
-                self.logger.info(f"Successfully uninstalled {name}")
-                return f"✓ Uninstalled {name}"
-            else:
-                return f"✗ Failed to uninstall {name}"
         except Exception as e:
-            self.logger.error(f"Error uninstalling {name}: {e}")
+            self.logger.error("Error uninstalling %s: %s", name, e)
             return f"✗ Error uninstalling {name}"
 
+        if not result:
+            return f"✗ Failed to uninstall {name}"
+        # 卸载成功后才移除，期间对象保持可见且顺序不变
+        del self.objects[name]
+        self.logger.info("Successfully uninstalled %s", name)
+        return f"✓ Uninstalled {name}"
+
+    def _run_all(self, operation: str) -> List[Tuple[str, Any]]:
+        """并发对所有具备该方法的对象执行 operation，返回 [(name, 结果)]
+
+        生命周期操作以I/O等待为主，总耗时取决于最慢的对象；
+        对象自身的方法需保证线程安全。
+        """
+        targets = [
+            (name, getattr(obj, operation))
+            for name, obj in list(self.objects.items())
+            if hasattr(obj, operation)
+        ]
+        if not targets:
+            return []
+
+        self.logger.info("Running %s on %s objects", operation, len(targets))
+        with ThreadPoolExecutor(max_workers=min(8, len(targets))) as executor:
+            futures = [(name, executor.submit(method)) for name, method in targets]
+            return [(name, future.result()) for name, future in futures]
+
+    def start_all(self) -> List[Tuple[str, Any]]:
+        """并发启动所有对象"""
+        return self._run_all("start")
+
+    def stop_all(self) -> List[Tuple[str, Any]]:
+        """并发停止所有对象"""
+        return self._run_all("stop")
+
+    def health_check_all(self) -> List[Tuple[str, Any]]:
+        """并发检查所有支持健康检查的对象"""
+        return self._run_all("health_check")
+
     def list_objects(self):
         """列出所有对象"""
         if not self.objects:
             return "No objects found"
 
-        result = f"{get_colored_text('Objects:', 95)}\\n"
-        for name, obj in self.objects.items():
-            result += f"  {name}\\n"
-        return result.rstrip()
+        lines = [get_colored_text("Objects:", 95)]
+        lines.extend(f"  {name}" for name in self.objects)
+        return "\n".join(lines)
 
     def get_object(self, name: str):
         """获取对象"""
@@ -197,22 +251,17 @@ class ObjectManager:
 
     def delete_object(self, name: str):
         """删除对象"""
-        try:
-            if name in self.objects:
-                obj = self.objects[name]
-                if hasattr(obj, "delete"):
-                    result = obj.delete()
-                    if result:
-                        del self.objects[name]
-                        self.logger.info(f"Successfully deleted {name}")
-                        return f"✓ Deleted {name}"
-                    else:
-                        return f"✗ Failed to delete {name}"
-                else:
-                    return f"✗ Object '{name}' does not exist or cannot be deleted"
-            else:
-                return f"✗ Object '{name}' does not exist"
+        obj = self.objects.get(name)
+        if obj is None:
+            return f"✗ Object '{name}' does not exist"
 
+        try:
+            result = obj.delete()
+            if result:
+                del self.objects[name]
+                self.logger.info("Successfully deleted %s", name)
+                return f"✓ Deleted {name}"
+            return f"✗ Failed to delete {name}"
         except Exception as e:
-            self.logger.error(f"Error in object operations: {e}")
+            self.logger.error("Error in object operations: %s", e)
             return f"✗ Error: {e}"
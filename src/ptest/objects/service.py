@@ -2,43 +2,56 @@
 from .base import BaseManagedObject
 from ..utils import get_colored_text
 
+# 状态消息中使用的彩色标签（常量，模块加载时生成一次）
+_SVC_LABEL = get_colored_text("Service", 92)
+
 
 class ServiceObject(BaseManagedObject):
     """服务对象实现"""
 
+    __slots__ = ()
+
     def __init__(self, name: str, env_manager):
         super().__init__(name, "service", env_manager)
 
     def install(self, params=None):
-        self.env_manager.logger.info(f"Installing service object: {self.name}")
+        self._log.info("Installing service object: %s", self.name)
         self.installed = True
         self.status = "installed"
-        return f"✓ {get_colored_text('Service', 92)} object '{self.name}' installed"
+        return f"✓ {_SVC_LABEL} object '{self.name}' installed"
 
     def start(self):
+        return self._format_result(self._start())
+
+    def _start(self):
+        """启动服务对象，返回 (是否成功, 消息)"""
         if not self.installed:
-            return f"✗ Service object '{self.name}' not installed"
-        self.env_manager.logger.info(f"Starting service object: {self.name}")
+            return False, f"Service object '{self.name}' not installed"
+        self._log.info("Starting service object: %s", self.name)
         self.status = "running"
-        return f"✓ {get_colored_text('Service', 92)} object '{self.name}' started"
+        return True, f"{_SVC_LABEL} object '{self.name}' started"
 
     def stop(self):
+        return self._format_result(self._stop())
+
+    def _stop(self):
+        """停止服务对象，返回 (是否成功, 消息)"""
         if self.status != "running":
-            return f"✗ Service object '{self.name}' not running"
-        self.env_manager.logger.info(f"Stopping service object: {self.name}")
+            return False, f"Service object '{self.name}' not running"
+        self._log.info("Stopping service object: %s", self.name)
         self.status = "stopped"
-        return f"✓ {get_colored_text('Service', 92)} object '{self.name}' stopped"
+        return True, f"{_SVC_LABEL} object '{self.name}' stopped"
 
     def restart(self):
-        result = self.stop()
-        if "✓" in result:
+        result = self._stop()
+        if result[0]:
             return self.start()
-        return result
+        return self._format_result(result)
 
     def uninstall(self):
         if self.status == "running":
-            self.stop()
-        self.env_manager.logger.info(f"Removing service object: {self.name}")
+            self._stop()
+        self._log.info("Removing service object: %s", self.name)
         self.installed = False
         self.status = "removed"
-        return f"✓ {get_colored_text('Service', 92)} object '{self.name}' uninstalled"
+        return f"✓ {_SVC_LABEL} object '{self.name}' uninstalled"
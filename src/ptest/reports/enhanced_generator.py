@@ -6,252 +6,223 @@
 
 from __future__ import annotations
 
-import json
+import io
+import os
+from collections import Counter, deque
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from string import Template
+from typing import Any, TextIO
 
 from ptest.core import get_logger
+from ptest.utils import json_dumps as _json_dumps, json_loads as _json_loads
 
 logger = get_logger("reports")
 
-
-@dataclass
-class TestResult:
-    """测试结果数据类"""
-
-    case_id: str
-    status: str  # passed, failed, skipped
-    duration: float
-    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
-    error_message: str = ""
-    screenshot: str = ""
-    log_file: str = ""
-
-
-@dataclass
-class ReportData:
-    """报告数据"""
-
-    title: str = "Test Report"
-    total: int = 0
-    passed: int = 0
-    failed: int = 0
-    skipped: int = 0
-    duration: float = 0.0
-    results: list[TestResult] = field(default_factory=list)
-    metadata: dict[str, Any] = field(default_factory=dict)
-
-
-class EnhancedReportGenerator:
-    """增强版报告生成器"""
-
-    def __init__(self, output_dir: str = "reports"):
-        self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(exist_ok=True)
-
-    def generate(self, data: ReportData) -> Path:
-        """生成HTML报告"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_path = self.output_dir / f"ptest_report_{timestamp}.html"
-
-        html_content = self._generate_html(data)
-        report_path.write_text(html_content, encoding="utf-8")
-
-        logger.info(f"Report generated: {report_path}")
-        return report_path
-
-    def _generate_html(self, data: ReportData) -> str:
-        """生成HTML内容"""
-        pass_rate = (data.passed / data.total * 100) if data.total > 0 else 0
-
-        html = f"""<!DOCTYPE html>
+# 结果表格的行模板与附件链接片段，模块加载时构建一次
+_ROW_TMPL = (
+    "<tr><td>{r.case_id}</td>"
+    '<td><span class="status-badge status-{r.status}">{status_upper}</span></td>'
+    "<td>{r.duration:.3f}s</td><td>{attachments}</td></tr>"
+)
+_SCREENSHOT_LINK = '<a href="%s" class="attachment-link">📷 Screenshot</a>'
+_LOG_LINK = '<a href="%s" class="attachment-link">📄 Log</a>'
+
+# HTML 骨架：静态片段与 string.Template 模板均在模块加载时构建一次，生成时按块流式写出
+_HEAD_PRE = """<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{data.title}</title>
+    <title>"""
+_HEAD_POST = """</title>
     <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
     <style>
-        * {{
+"""
+_CSS = """        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
-        }}
+        }
         
-        .header {{
+        .header {
             background: white;
             border-radius: 20px;
             padding: 40px;
             margin-bottom: 30px;
             box-shadow: 0 20px 60px rgba(0,0,0,0.1);
-        }}
+        }
         
-        h1 {{
+        h1 {
             color: #333;
             margin-bottom: 20px;
             font-size: 2.5em;
-        }}
+        }
         
-        .summary {{
+        .summary {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin-bottom: 30px;
-        }}
+        }
         
-        .stat-card {{
+        .stat-card {
             background: white;
             border-radius: 15px;
             padding: 30px;
             text-align: center;
             box-shadow: 0 10px 30px rgba(0,0,0,0.1);
             transition: transform 0.3s;
-        }}
+        }
         
-        .stat-card:hover {{
+        .stat-card:hover {
             transform: translateY(-5px);
-        }}
+        }
         
-        .stat-value {{
+        .stat-value {
             font-size: 3em;
             font-weight: bold;
             margin-bottom: 10px;
-        }}
+        }
         
-        .stat-label {{
+        .stat-label {
             color: #666;
             font-size: 1.1em;
-        }}
+        }
         
-        .passed {{ color: #10b981; }}
-        .failed {{ color: #ef4444; }}
-        .skipped {{ color: #f59e0b; }}
-        .total {{ color: #3b82f6; }}
+        .passed { color: #10b981; }
+        .failed { color: #ef4444; }
+        .skipped { color: #f59e0b; }
+        .total { color: #3b82f6; }
         
-        .charts {{
+        .charts {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
             gap: 30px;
             margin-bottom: 30px;
-        }}
+        }
         
-        .chart-container {{
+        .chart-container {
             background: white;
             border-radius: 20px;
             padding: 30px;
             box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-        }}
+        }
         
-        .results-table {{
+        .results-table {
             background: white;
             border-radius: 20px;
             padding: 30px;
             box-shadow: 0 10px 30px rgba(0,0,0,0.1);
             overflow-x: auto;
-        }}
+        }
         
-        table {{
+        table {
             width: 100%;
             border-collapse: collapse;
-        }}
+        }
         
-        th, td {{
+        th, td {
             padding: 15px;
             text-align: left;
             border-bottom: 1px solid #eee;
-        }}
+        }
         
-        th {{
+        th {
             background: #f8f9fa;
             font-weight: 600;
             color: #333;
-        }}
+        }
         
-        tr:hover {{
+        tr:hover {
             background: #f8f9fa;
-        }}
+        }
         
-        .status-badge {{
+        .status-badge {
             padding: 5px 15px;
             border-radius: 20px;
             font-size: 0.85em;
             font-weight: 600;
-        }}
+        }
         
-        .status-passed {{
+        .status-passed {
             background: #d1fae5;
             color: #065f46;
-        }}
+        }
         
-        .status-failed {{
+        .status-failed {
             background: #fee2e2;
             color: #991b1b;
-        }}
+        }
         
-        .status-skipped {{
+        .status-skipped {
             background: #fef3c7;
             color: #92400e;
-        }}
+        }
         
-        .attachment-link {{
+        .attachment-link {
             color: #3b82f6;
             text-decoration: none;
             margin-right: 10px;
-        }}
+        }
         
-        .attachment-link:hover {{
+        .attachment-link:hover {
             text-decoration: underline;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .charts {{
+        @media (max-width: 768px) {
+            .charts {
                 grid-template-columns: 1fr;
-            }}
-        }}
-    </style>
+            }
+        }
+"""
+_HEADER_TEMPLATE = Template(
+    """    </style>
 </head>
 <body>
     <div class="container">
         <div class="header">
-            <h1>📊 {data.title}</h1>
-            <p>Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-            <p>Duration: {data.duration:.2f}s | Pass Rate: {pass_rate:.1f}%</p>
+            <h1>📊 $title</h1>
+            <p>Generated: $generated</p>
+            <p>Duration: ${duration}s | Pass Rate: $pass_rate%</p>
         </div>
         
         <div class="summary">
             <div class="stat-card">
-                <div class="stat-value total">{data.total}</div>
+                <div class="stat-value total">$total</div>
                 <div class="stat-label">Total Tests</div>
             </div>
             <div class="stat-card">
-                <div class="stat-value passed">{data.passed}</div>
+                <div class="stat-value passed">$passed</div>
                 <div class="stat-label">Passed</div>
             </div>
             <div class="stat-card">
-                <div class="stat-value failed">{data.failed}</div>
+                <div class="stat-value failed">$failed</div>
                 <div class="stat-label">Failed</div>
             </div>
             <div class="stat-card">
-                <div class="stat-value skipped">{data.skipped}</div>
+                <div class="stat-value skipped">$skipped</div>
                 <div class="stat-label">Skipped</div>
             </div>
         </div>
         
-        <div class="charts">
+"""
+)
+_TABLE_PRE = """        <div class="charts">
             <div class="chart-container">
                 <h3>Test Results Distribution</h3>
                 <canvas id="resultChart"></canvas>
@@ -274,8 +245,9 @@ class EnhancedReportGenerator:
                     </tr>
                 </thead>
                 <tbody>
-                    {self._generate_table_rows(data.results)}
-                </tbody>
+"""
+_SCRIPT_TEMPLATE = Template(
+    """                </tbody>
             </table>
         </div>
     </div>
@@ -283,114 +255,260 @@ class EnhancedReportGenerator:
     <script>
         // Results distribution chart
         const resultCtx = document.getElementById('resultChart').getContext('2d');
-        new Chart(resultCtx, {{
+        new Chart(resultCtx, {
             type: 'doughnut',
-            data: {{
+            data: {
                 labels: ['Passed', 'Failed', 'Skipped'],
-                datasets: [{{
-                    data: [{data.passed}, {data.failed}, {data.skipped}],
+                datasets: [{
+                    data: [$passed, $failed, $skipped],
                     backgroundColor: ['#10b981', '#ef4444', '#f59e0b'],
                     borderWidth: 0
-                }}]
-            }},
-            options: {{
+                }]
+            },
+            options: {
                 responsive: true,
-                plugins: {{
-                    legend: {{
+                plugins: {
+                    legend: {
                         position: 'bottom'
-                    }}
-                }}
-            }}
-        }});
+                    }
+                }
+            }
+        });
         
         // Duration trend chart
-        const durationData = {json.dumps([r.duration for r in data.results[:20]])};
-        const durationLabels = {json.dumps([f"Test {i + 1}" for i in range(min(20, len(data.results)))])};
+        const durationData = $duration_data;
+        const durationLabels = $duration_labels;
         
         const durationCtx = document.getElementById('durationChart').getContext('2d');
-        new Chart(durationCtx, {{
+        new Chart(durationCtx, {
             type: 'line',
-            data: {{
+            data: {
                 labels: durationLabels,
-                datasets: [{{
+                datasets: [{
                     label: 'Duration (s)',
                     data: durationData,
                     borderColor: '#3b82f6',
                     backgroundColor: 'rgba(59, 130, 246, 0.1)',
                     tension: 0.4,
                     fill: true
-                }}]
-            }},
-            options: {{
+                }]
+            },
+            options: {
                 responsive: true,
-                scales: {{
-                    y: {{
+                scales: {
+                    y: {
                         beginAtZero: true
-                    }}
-                }}
-            }}
-        }});
+                    }
+                }
+            }
+        });
     </script>
 </body>
 </html>"""
+)
+
+
+@dataclass(slots=True)
+class TestResult:
+    """测试结果数据类"""
+
+    case_id: str
+    status: str  # passed, failed, skipped
+    duration: float
+    # 默认留空，由已知结束时间的调用方填写；需要当前时间时使用 now_stamped()
+    timestamp: str = ""
+    error_message: str = ""
+    screenshot: str = ""
+    log_file: str = ""
+
+    @classmethod
+    def now_stamped(
+        cls, case_id: str, status: str, duration: float, **kwargs: Any
+    ) -> TestResult:
+        """创建以当前时间为时间戳的测试结果"""
+        return cls(
+            case_id, status, duration, timestamp=datetime.now().isoformat(), **kwargs
+        )
+
+
+@dataclass(slots=True)
+class ReportData:
+    """报告数据"""
+
+    title: str = "Test Report"
+    total: int = 0
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    duration: float = 0.0
+    results: list[TestResult] = field(default_factory=list)
+    metadata: dict[str, Any] = field(default_factory=dict)
+
 
-        return html
+class EnhancedReportGenerator:
+    """增强版报告生成器"""
+
+    # 历史记录保留条数
+    HISTORY_LIMIT = 50
+
+    def __init__(self, output_dir: str = "reports"):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(exist_ok=True)
+        self.history_file = self.output_dir / "history.jsonl"
+        self._migrate_legacy_history()
+
+    def generate(self, data: ReportData) -> Path:
+        """生成HTML报告"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_path = self.output_dir / f"ptest_report_{timestamp}.html"
+
+        # 直接流式写入文件，不在内存中拼出完整HTML
+        with report_path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+            self._write_html(f, data)
+
+        logger.info(f"Report generated: {report_path}")
+        return report_path
+
+    def _generate_html(self, data: ReportData) -> str:
+        """生成HTML内容"""
+        buffer = io.StringIO()
+        self._write_html(buffer, data)
+        return buffer.getvalue()
+
+    def _write_html(self, out: TextIO, data: ReportData) -> None:
+        """按块写出HTML内容，只在动态片段处插值"""
+        pass_rate = (data.passed / data.total * 100) if data.total > 0 else 0
+        durations = [r.duration for r in data.results[:20]]
+
+        write = out.write
+        write(_HEAD_PRE)
+        write(data.title)
+        write(_HEAD_POST)
+        write(_CSS)
+        write(
+            _HEADER_TEMPLATE.substitute(
+                title=data.title,
+                generated=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                duration=f"{data.duration:.2f}",
+                pass_rate=f"{pass_rate:.1f}",
+                total=data.total,
+                passed=data.passed,
+                failed=data.failed,
+                skipped=data.skipped,
+            )
+        )
+        write(_TABLE_PRE)
+        for row in self._iter_table_rows(data.results):
+            write(row)
+            write("\n")
+        write(
+            _SCRIPT_TEMPLATE.substitute(
+                passed=data.passed,
+                failed=data.failed,
+                skipped=data.skipped,
+                duration_data=_json_dumps(durations),
+                duration_labels=_json_dumps(
+                    [f"Test {i + 1}" for i in range(len(durations))]
+                ),
+            )
+        )
 
     def _generate_table_rows(self, results: list[TestResult]) -> str:
         """生成表格行"""
-        rows = []
-        for result in results:
-            attachments = []
-            if result.screenshot:
-                attachments.append(
-                    f'<a href="{result.screenshot}" class="attachment-link">📷 Screenshot</a>'
-                )
-            if result.log_file:
-                attachments.append(
-                    f'<a href="{result.log_file}" class="attachment-link">📄 Log</a>'
-                )
-
-            rows.append(f"""
-                <tr>
-                    <td>{result.case_id}</td>
-                    <td><span class="status-badge status-{result.status}">{result.status.upper()}</span></td>
-                    <td>{result.duration:.3f}s</td>
-                    <td>{"".join(attachments)}</td>
-                </tr>
-            """)
-
-        return "\n".join(rows)
-
-    def save_history(self, data: ReportData) -> None:
-        """保存测试历史"""
-        history_file = self.output_dir / "history.json"
-
-        history = []
-        if history_file.exists():
-            history = json.loads(history_file.read_text())
-
-        history.append(
-            {
-                "timestamp": datetime.now().isoformat(),
-                "total": data.total,
-                "passed": data.passed,
-                "failed": data.failed,
-                "duration": data.duration,
-            }
+        return "\n".join(self._iter_table_rows(results))
+
+    @staticmethod
+    def _iter_table_rows(results: list[TestResult]) -> Iterator[str]:
+        """逐行产出表格行"""
+        return (
+            _ROW_TMPL.format(
+                r=r,
+                status_upper=r.status.upper(),
+                attachments=(_SCREENSHOT_LINK % r.screenshot if r.screenshot else "")
+                + (_LOG_LINK % r.log_file if r.log_file else ""),
+            )
+            for r in results
         )
 
-        # 只保留最近50条记录
-        history = history[-50:]
-        history_file.write_text(json.dumps(history, indent=2))
+    def _migrate_legacy_history(self) -> None:
+        """将旧版 history.json 一次性迁移为 JSON Lines，并重命名旧文件"""
+        legacy_file = self.output_dir / "history.json"
+        if not legacy_file.exists():
+            return
+
+        try:
+            legacy = _json_loads(legacy_file.read_bytes())
+        except ValueError as e:
+            logger.warning(f"Skipping history migration, unreadable {legacy_file}: {e}")
+            return
+        if not isinstance(legacy, list):
+            logger.warning(
+                f"Skipping history migration, unexpected format in {legacy_file}"
+            )
+            return
+
+        # 旧记录早于已有的 JSON Lines 记录，写在前面并原子替换
+        lines = [_json_dumps(r).encode() + b"\n" for r in legacy[-self.HISTORY_LIMIT :]]
+        if self.history_file.exists():
+            lines.append(self.history_file.read_bytes())
+        tmp_path = self.history_file.with_suffix(".jsonl.tmp")
+        tmp_path.write_bytes(b"".join(lines))
+        os.replace(tmp_path, self.history_file)
+        legacy_file.replace(legacy_file.with_suffix(".json.migrated"))
+        logger.info(f"Migrated {len(legacy)} history records to {self.history_file}")
+
+    def save_history(self, data: ReportData) -> None:
+        """保存测试历史（JSON Lines，追加写入）"""
+        record = {
+            "timestamp": datetime.now().isoformat(),
+            "total": data.total,
+            "passed": data.passed,
+            "failed": data.failed,
+            "duration": data.duration,
+        }
+        line = _json_dumps(record).encode() + b"\n"
+
+        with self.history_file.open("ab") as f:
+            f.write(line)
+            size = f.tell()
+
+        # 按文件大小估算记录数，约超过两倍上限时才压缩回最近50条记录
+        if size > len(line) * self.HISTORY_LIMIT * 2:
+            self._compact_history()
+
+    def _compact_history(self) -> None:
+        """只保留最近的历史记录，原子替换历史文件"""
+        with self.history_file.open("rb") as f:
+            recent = deque(f, maxlen=self.HISTORY_LIMIT)
+
+        tmp_path = self.history_file.with_suffix(".jsonl.tmp")
+        tmp_path.write_bytes(b"".join(recent))
+        os.replace(tmp_path, self.history_file)
+
+    def _read_last_records(self, count: int) -> list[dict[str, Any]]:
+        """从文件末尾按块反向读取最近的若干条历史记录"""
+        with self.history_file.open("rb") as f:
+            end = f.seek(0, os.SEEK_END)
+            pos = end
+            chunk = b""
+            # 多读一个换行符，保证最前面的一行是完整的
+            while pos > 0 and chunk.count(b"\n") <= count:
+                step = min(4096, pos)
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step) + chunk
+
+        lines = chunk.splitlines()
+        if pos > 0:
+            lines = lines[1:]
+        return [_json_loads(line) for line in lines[-count:] if line.strip()]
 
     def compare_with_previous(self, current: ReportData) -> dict[str, Any]:
         """与上一次测试对比"""
-        history_file = self.output_dir / "history.json"
-
-        if not history_file.exists():
+        if not self.history_file.exists():
             return {"has_previous": False}
 
-        history = json.loads(history_file.read_text())
+        history = self._read_last_records(2)
         if len(history) < 2:
             return {"has_previous": False}
 
@@ -415,11 +533,12 @@ def generate_sample_report():
         for i in range(20)
     ]
 
+    status_counts = Counter(r.status for r in results)
     data = ReportData(
         title="Sample Test Report",
         total=len(results),
-        passed=sum(1 for r in results if r.status == "passed"),
-        failed=sum(1 for r in results if r.status == "failed"),
+        passed=status_counts["passed"],
+        failed=status_counts["failed"],
         duration=sum(r.duration for r in results),
         results=results,
     )
@@ -1,17 +1,30 @@
 # ptest/reports/generator.py
 from pathlib import Path
-import json
 from datetime import datetime
-from typing import Optional
+from typing import Any, NamedTuple, Optional
 from .templates import (
     TEST_SUMMARY_TEMPLATE,
     TEST_RESULTS_TABLE_TEMPLATE,
-    TEST_RESULT_ROW_TEMPLATE,
+    TEST_RESULT_ROW_FORMAT,
     ENVIRONMENT_INFO_TEMPLATE,
-    REPORT_STYLES,
-    FULL_REPORT_TEMPLATE,
+    STYLED_REPORT_TEMPLATE,
     MARKDOWN_REPORT_TEMPLATE,
+    MARKDOWN_RESULT_ROW_FORMAT,
 )
+from ..utils import json_dumps_pretty as _dump_report_json
+
+# 结果状态到样式类、显示文本与Markdown图标的映射，未知状态按失败展示
+_STATUS_CSS = {"passed": "passed", "failed": "failed", "skipped": "skipped"}
+_STATUS_TEXT = {"passed": "PASSED", "failed": "FAILED", "skipped": "SKIPPED"}
+_STATUS_ICON = {"passed": "[PASS]", "failed": "[FAIL]", "skipped": "[SKIP]"}
+
+
+class _ResultCounts(NamedTuple):
+    """测试结果计数"""
+
+    total: int
+    passed: int
+    duration: float
 
 
 class ReportGenerator:
@@ -21,6 +34,12 @@ class ReportGenerator:
         self.env_manager = env_manager
         self.case_manager = case_manager
         self.version = version
+        # 测试路径与日志器在环境初始化后不再变化，构造时绑定一次
+        self._test_path = str(env_manager.test_path)
+        self._log = env_manager.logger
+        self._isolation_engine = self._resolve_isolation_engine(
+            getattr(env_manager, "config", None)
+        )
 
     def generate_report(
         self, format_type: str = "html", output_path: Optional[Path] = None
@@ -41,6 +60,9 @@ class ReportGenerator:
     def _generate_html_report(self, output_path: Optional[Path] = None) -> str:
         """生成HTML格式报告"""
 
+        # 同一份报告的文件名与正文共用一个时间点
+        now = datetime.now()
+
         # 收集测试数据
         test_data = self._collect_test_data()
 
@@ -55,35 +77,33 @@ class ReportGenerator:
         )
 
         # 生成结果表格
-        results_rows = ""
-        for case_id, result in self.case_manager.results.items():
-            status_class = "passed" if result.status == "passed" else "failed"
-            status_text = "PASSED" if result.status == "passed" else "FAILED"
-            error_msg = result.error_message or ""
-            duration = f"{result.duration:.2f}" if result.duration > 0 else "N/A"
-
-            results_rows += TEST_RESULT_ROW_TEMPLATE.format(
-                case_id=case_id,
-                status_class=status_class,
-                status_text=status_text,
-                duration_text=duration,
-                error_msg=error_msg,
-            )
+        rows = [
+            {
+                "case_id": case_id,
+                "status_class": _STATUS_CSS.get(result.status, "failed"),
+                "status_text": _STATUS_TEXT.get(result.status, "FAILED"),
+                "duration_text": f"{result.duration:.2f}"
+                if result.duration > 0
+                else "N/A",
+                "error_msg": result.error_message or "",
+            }
+            for case_id, result in self.case_manager.results.items()
+        ]
+        results_rows = "".join(map(TEST_RESULT_ROW_FORMAT.format_map, rows))
 
         results_html = TEST_RESULTS_TABLE_TEMPLATE.format(results_rows=results_rows)
 
         # 生成环境信息
         env_html = ENVIRONMENT_INFO_TEMPLATE.format(
-            env_path=str(self.env_manager.test_path),
+            env_path=self._test_path,
             isolation_engine=test_data["isolation_engine"],
-            test_date=datetime.now().strftime("%Y-%m-%d %H:%M"),
+            test_date=now.strftime("%Y-%m-%d %H:%M"),
             python_version=test_data["python_version"],
         )
 
         # 组合完整报告
-        full_html = FULL_REPORT_TEMPLATE.format(
-            styles=REPORT_STYLES,
-            generated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        full_html = STYLED_REPORT_TEMPLATE.format(
+            generated_at=now.strftime("%Y-%m-%d %H:%M:%S"),
             test_env=test_data["test_environment"],
             version=self.version,
             summary_section=summary_html,
@@ -95,24 +115,23 @@ class ReportGenerator:
         if not output_path:
             base_dir = getattr(self.env_manager, "report_dir", None) or Path.cwd()
             output_path = (
-                base_dir
-                / f"ptest_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+                base_dir / f"ptest_report_{now.strftime('%Y%m%d_%H%M%S')}.html"
             )
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w") as f:
-            f.write(full_html)
+        output_path.write_bytes(full_html.encode("utf-8"))
 
-        self.env_manager.logger.info(f"HTML report generated: {output_path}")
+        self._log.info(f"HTML report generated: {output_path}")
         return str(output_path)
 
     def _generate_json_report(self, output_path: Optional[Path] = None) -> str:
         """生成JSON格式报告"""
 
+        now = datetime.now()
         report_data = {
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": now.isoformat(),
             "ptest_version": self.version,
-            "test_environment": str(self.env_manager.test_path),
+            "test_environment": self._test_path,
             "summary": self._collect_summary_data(),
             "results": self._collect_results_data(),
         }
@@ -120,41 +139,47 @@ class ReportGenerator:
         if not output_path:
             base_dir = getattr(self.env_manager, "report_dir", None) or Path.cwd()
             output_path = (
-                base_dir
-                / f"ptest_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                base_dir / f"ptest_report_{now.strftime('%Y%m%d_%H%M%S')}.json"
             )
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w") as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+        output_path.write_bytes(_dump_report_json(report_data))
 
-        self.env_manager.logger.info(f"JSON report generated: {output_path}")
+        self._log.info(f"JSON report generated: {output_path}")
         return str(output_path)
 
     def _generate_markdown_report(self, output_path: Optional[Path] = None) -> str:
         """生成Markdown格式报告"""
 
+        now = datetime.now()
         test_data = self._collect_test_data()
 
         # 生成结果表格
-        results_table = ""
-        for case_id, result in self.case_manager.results.items():
-            status_icon = "[PASS]" if result.status == "passed" else "[FAIL]"
-            duration = f"{result.duration:.2f}s" if result.duration > 0 else "N/A"
-            error_msg = result.error_message or ""
-            results_table += f"| {case_id} | {status_icon} {result.status.upper()} | {duration} | {error_msg} |\n"
+        rows = [
+            {
+                "case_id": case_id,
+                "status_icon": _STATUS_ICON.get(result.status, "[FAIL]"),
+                "status_upper": result.status.upper(),
+                "duration_text": f"{result.duration:.2f}s"
+                if result.duration > 0
+                else "N/A",
+                "error_msg": result.error_message or "",
+            }
+            for case_id, result in self.case_manager.results.items()
+        ]
+        results_table = "".join(map(MARKDOWN_RESULT_ROW_FORMAT.format_map, rows))
 
         markdown_content = MARKDOWN_REPORT_TEMPLATE.format(
-            generated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            test_env=str(self.env_manager.test_path),
+            generated_at=now.strftime("%Y-%m-%d %H:%M:%S"),
+            test_env=self._test_path,
             total_duration=test_data["total_duration"],
             total_cases=test_data["total_cases"],
             passed_count=test_data["passed_count"],
             failed_count=test_data["failed_count"],
             success_rate=test_data["success_rate"],
-            env_path=str(self.env_manager.test_path),
+            env_path=self._test_path,
             isolation_engine=test_data["isolation_engine"],
-            test_date=datetime.now().strftime("%Y-%m-%d"),
+            test_date=now.strftime("%Y-%m-%d"),
             python_version=test_data["python_version"],
             results_table=results_table,
             version=self.version,
@@ -162,42 +187,21 @@ class ReportGenerator:
 
         if not output_path:
             base_dir = getattr(self.env_manager, "report_dir", None) or Path.cwd()
-            output_path = (
-                base_dir / f"ptest_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-            )
+            output_path = base_dir / f"ptest_report_{now.strftime('%Y%m%d_%H%M%S')}.md"
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w") as f:
-            f.write(markdown_content)
+        output_path.write_bytes(markdown_content.encode("utf-8"))
 
-        self.env_manager.logger.info(f"Markdown report generated: {output_path}")
+        self._log.info(f"Markdown report generated: {output_path}")
         return str(output_path)
 
     def _collect_test_data(self) -> dict:
         """收集测试数据"""
-        isolation_engine = "basic"
-        if hasattr(self.env_manager, "config") and self.env_manager.config:
-            if isinstance(self.env_manager.config, dict):
-                isolation_engine = str(
-                    self.env_manager.config.get("default_isolation_level", "basic")
-                )
-            else:
-                config_isolation = getattr(
-                    self.env_manager.config, "isolation_level", "basic"
-                )
-                isolation_engine = str(config_isolation)
-
-        total_cases = len(self.case_manager.results) or len(self.case_manager.cases)
-        passed_count = sum(
-            1
-            for result in self.case_manager.results.values()
-            if result.status == "passed"
-        )
+        counts = self._count_results()
+        total_cases = counts.total or len(self.case_manager.cases)
+        passed_count = counts.passed
         failed_count = total_cases - passed_count if total_cases else 0
-        total_duration = round(
-            sum(result.duration for result in self.case_manager.results.values()),
-            2,
-        )
+        total_duration = round(counts.duration, 2)
         success_rate = (
             round((passed_count / total_cases) * 100, 2) if total_cases else 0
         )
@@ -212,11 +216,31 @@ class ReportGenerator:
             "success_rate": success_rate,
             "failure_rate": failure_rate,
             "total_duration": total_duration,
-            "test_environment": str(self.env_manager.test_path),
-            "isolation_engine": isolation_engine,
+            "test_environment": self._test_path,
+            "isolation_engine": self._isolation_engine,
             "python_version": "3.12",
         }
 
+    @staticmethod
+    def _resolve_isolation_engine(config: Any) -> str:
+        """从环境配置解析隔离引擎名称"""
+        if not config:
+            return "basic"
+        if isinstance(config, dict):
+            return str(config.get("default_isolation_level", "basic"))
+        return str(getattr(config, "isolation_level", "basic"))
+
+    def _count_results(self) -> _ResultCounts:
+        """单次遍历结果，统计总数、通过数和总耗时"""
+        total = passed = 0
+        duration = 0.0
+        for result in self.case_manager.results.values():
+            total += 1
+            duration += result.duration
+            if result.status == "passed":
+                passed += 1
+        return _ResultCounts(total, passed, duration)
+
     def _collect_summary_data(self) -> dict:
         """收集摘要数据"""
         test_data = self._collect_test_data()
@@ -230,49 +254,36 @@ class ReportGenerator:
 
     def _collect_results_data(self) -> dict:
         """收集结果数据"""
-        results = {}
-        for case_id, result in self.case_manager.results.items():
-            results[case_id] = {
+        return {
+            case_id: {
                 "status": result.status,
                 "duration": result.duration,
                 "error_message": result.error_message,
-                "start_time": result.start_time.isoformat()
-                if result.start_time
-                else None,
-                "end_time": result.end_time.isoformat() if result.end_time else None,
+                "start_time": result.start_time,
+                "end_time": result.end_time,
             }
-        return results
+            for case_id, result in self.case_manager.results.items()
+        }
 
     def generate_json_report(self):
         """生成JSON报告"""
+        now = datetime.now()
         report_data = {
-            "generated_at": datetime.now().isoformat(),
-            "test_environment": str(self.env_manager.test_path),
+            "generated_at": now.isoformat(),
+            "test_environment": self._test_path,
             "summary": {
                 "total_cases": len(self.case_manager.cases),
                 "passed": len(self.case_manager.passed_cases),
                 "failed": len(self.case_manager.failed_cases),
             },
-            "results": {},
+            "results": self._collect_results_data(),
         }
 
-        for case_id, result in self.case_manager.results.items():
-            report_data["results"][case_id] = {
-                "status": result.status,
-                "duration": result.duration,
-                "error_message": result.error_message,
-                "start_time": result.start_time.isoformat()
-                if result.start_time
-                else None,
-                "end_time": result.end_time.isoformat() if result.end_time else None,
-            }
-
         report_file = (
             self.env_manager.report_dir
-            / f"test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            / f"test_report_{now.strftime('%Y%m%d_%H%M%S')}.json"
         )
-        with open(report_file, "w") as f:
-            json.dump(report_data, f, indent=2)
+        report_file.write_bytes(_dump_report_json(report_data))
 
-        self.env_manager.logger.info(f"JSON report generated: {report_file}")
+        self._log.info(f"JSON report generated: {report_file}")
         return str(report_file)
@@ -4,6 +4,10 @@ ptest 报告模板
 提供美观、专业的HTML报告模板
 """
 
+from collections.abc import Mapping
+from string import Formatter
+from typing import Any
+
 TEST_SUMMARY_TEMPLATE = """
 <div class="summary-section">
     <h2>[STATS] Test Summary</h2>
@@ -433,3 +437,59 @@ MARKDOWN_REPORT_TEMPLATE = """
 ---
 *Generated by ptest v{version}*
 """
+
+
+MARKDOWN_RESULT_ROW_TEMPLATE = (
+    "| {case_id} | {status_icon} {status_upper} | {duration_text} | {error_msg} |\n"
+)
+
+
+_CONVERTERS = {"r": repr, "s": str, "a": ascii}
+
+
+class CompiledTemplate:
+    """预先解析的格式模板，用法与 str.format/format_map 相同，渲染时不再重复解析
+
+    仅用于逐行渲染的简单模板：只支持按名称引用的字段，不支持 {a.b}、{a[0]}
+    和嵌套格式说明，遇到时在构造阶段报错
+    """
+
+    __slots__ = ("_segments",)
+
+    def __init__(self, template: str):
+        segments = []
+        for literal, field, spec, conversion in Formatter().parse(template):
+            if field is not None and (not field.isidentifier() or "{" in (spec or "")):
+                raise ValueError(f"Unsupported replacement field: {{{field}}}")
+            segments.append(
+                (
+                    literal,
+                    field,
+                    spec or "",
+                    _CONVERTERS[conversion] if conversion else None,
+                )
+            )
+        self._segments = tuple(segments)
+
+    def format(self, **fields: Any) -> str:
+        return self.format_map(fields)
+
+    def format_map(self, mapping: Mapping[str, Any]) -> str:
+        parts = []
+        append = parts.append
+        for literal, field, spec, convert in self._segments:
+            append(literal)
+            if field is not None:
+                value = mapping[field]
+                if convert is not None:
+                    value = convert(value)
+                append(format(value, spec))
+        return "".join(parts)
+
+
+# 模块加载时解析一次的逐行模板；整页模板每份报告只渲染一次，仍用 str.format
+TEST_RESULT_ROW_FORMAT = CompiledTemplate(TEST_RESULT_ROW_TEMPLATE)
+MARKDOWN_RESULT_ROW_FORMAT = CompiledTemplate(MARKDOWN_RESULT_ROW_TEMPLATE)
+
+# 样式表是常量且已按格式字符串转义，预先嵌入完整报告模板，渲染后花括号恢复为单层
+STYLED_REPORT_TEMPLATE = FULL_REPORT_TEMPLATE.replace("{styles}", REPORT_STYLES)
@@ -38,6 +38,7 @@ from collections.abc import Callable
 from typing import Any
 
 from ..core import get_logger
+from ..utils import json_loads as _json_loads
 
 logger = get_logger("suites")
 
@@ -135,18 +136,28 @@ class TestSuite:
         if not self.cases:
             errors.append("套件至少需要一个用例 / Suite must have at least one case")
 
-        orders = [case.order for case in self.cases]
-        if len(orders) != len(set(orders)):
-            errors.append(f"用例执行顺序重复: {orders} / Duplicate execution orders")
-
-        case_ids = set(case.case_id for case in self.cases)
+        # 单次遍历同时检查执行顺序重复与依赖缺失
+        case_ids = {case.case_id for case in self.cases}
+        seen_orders: set[int] = set()
+        duplicate_orders: set[int] = set()
+        dependency_errors = []
         for case in self.cases:
-            for dep in case.depends_on:
-                if dep not in case_ids:
-                    errors.append(
-                        f"用例 '{case.case_id}' 依赖不存在的用例 '{dep}' / "
-                        f"Case '{case.case_id}' depends on non-existent case"
-                    )
+            if case.order in seen_orders:
+                duplicate_orders.add(case.order)
+            seen_orders.add(case.order)
+            dependency_errors.extend(
+                f"用例 '{case.case_id}' 依赖不存在的用例 '{dep}' / "
+                f"Case '{case.case_id}' depends on non-existent case"
+                for dep in case.depends_on
+                if dep not in case_ids
+            )
+
+        if duplicate_orders:
+            errors.append(
+                f"用例执行顺序重复: {sorted(duplicate_orders)} / "
+                "Duplicate execution orders"
+            )
+        errors.extend(dependency_errors)
 
         return len(errors) == 0, errors
 
@@ -168,6 +179,30 @@ class SuiteManager:
 
     def create_suite(self, suite_data: dict[str, Any]) -> TestSuite:
         """创建测试套件 / Create test suite"""
+        suite = TestSuite.from_dict(self._read_suite_data(suite_data))
+        self._save_suite(suite)
+        self._suites[suite.name] = suite
+
+        logger.info(f"测试套件创建成功: {suite.name}")
+        return suite
+
+    def create_suites_bulk(self, suites_data: list[Any]) -> list[TestSuite]:
+        """批量创建测试套件 / Create test suites in bulk
+
+        先解析全部输入，任一输入无效时不写入任何套件；随后一次性写出所有套件文件。
+        """
+        suites = [TestSuite.from_dict(self._read_suite_data(d)) for d in suites_data]
+
+        for suite in suites:
+            self._save_suite(suite)
+        self._suites.update((suite.name, suite) for suite in suites)
+
+        logger.info(f"批量创建测试套件成功: {len(suites)} 个")
+        return suites
+
+    @staticmethod
+    def _read_suite_data(suite_data: Any) -> dict[str, Any]:
+        """读取套件输入（字典或JSON文件路径）/ Read suite input"""
         if isinstance(suite_data, (str, Path)):
             suite_path = Path(suite_data)
             if not suite_path.exists():
@@ -175,23 +210,15 @@ class SuiteManager:
                     f"套件文件不存在: {suite_path} / Suite file not found"
                 )
 
-            with open(suite_path, "r", encoding="utf-8") as f:
-                suite_dict = json.load(f)
-        else:
-            suite_dict = suite_data
-
-        suite = TestSuite.from_dict(suite_dict)
-        self._save_suite(suite)
-        self._suites[suite.name] = suite
-
-        logger.info(f"测试套件创建成功: {suite.name}")
-        return suite
+            return _json_loads(suite_path.read_bytes())
+        return suite_data
 
     def _save_suite(self, suite: TestSuite) -> None:
         """保存套件到文件 / Save suite to file"""
         suite_file = self.storage_dir / f"{suite.name}.json"
-        with open(suite_file, "w", encoding="utf-8") as f:
-            json.dump(suite.to_dict(), f, ensure_ascii=False, indent=2)
+        suite_file.write_bytes(
+            json.dumps(suite.to_dict(), ensure_ascii=False, indent=2).encode("utf-8")
+        )
         logger.debug(f"套件保存到: {suite_file}")
 
     def load_suite(self, name: str) -> TestSuite | None:
@@ -204,9 +231,7 @@ class SuiteManager:
             return None
 
         try:
-            with open(suite_file, "r", encoding="utf-8") as f:
-                suite_dict = json.load(f)
-            suite = TestSuite.from_dict(suite_dict)
+            suite = TestSuite.from_dict(_json_loads(suite_file.read_bytes()))
             self._suites[name] = suite
             return suite
         except Exception as e:
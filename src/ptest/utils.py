@@ -1,12 +1,47 @@
 # ptest/utils.py
+import json
 import sys
 from dataclasses import dataclass
-from typing import Optional
+from datetime import datetime
+from typing import Any, Optional
 
 from .core import get_logger
 
 logger = get_logger("utils")
 
+# 可选使用 orjson 加速JSON的解析与序列化，未安装时回退到标准库 json；
+# orjson 的解析异常继承自 json.JSONDecodeError，调用方无需区分
+try:
+    import orjson  # type: ignore[import-not-found]
+
+    json_loads = orjson.loads
+
+    def json_dumps(obj: Any) -> str:
+        """序列化为紧凑的JSON字符串"""
+        return orjson.dumps(obj).decode()
+
+    def json_dumps_pretty(obj: Any) -> bytes:
+        """序列化为缩进的UTF-8 JSON字节，datetime 输出为ISO格式"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+except ImportError:
+    json_loads = json.loads
+
+    def _json_default(obj: Any) -> Any:
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def json_dumps(obj: Any) -> str:
+        """序列化为紧凑的JSON字符串"""
+        return json.dumps(obj, separators=(",", ":"))
+
+    def json_dumps_pretty(obj: Any) -> bytes:
+        """序列化为缩进的UTF-8 JSON字节，datetime 输出为ISO格式"""
+        return json.dumps(
+            obj, indent=2, ensure_ascii=False, default=_json_default
+        ).encode("utf-8")
+
 
 @dataclass
 class CommandResult:
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def env_manager() -> SimpleNamespace:
+    """只提供 logger 与 test_path 的最小环境管理器"""
+    return SimpleNamespace(
+        logger=logging.getLogger("ptest-test-objects"), test_path=Path(".")
+    )
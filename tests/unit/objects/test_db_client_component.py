@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from ptest.objects.db_client import DatabaseClientComponent
+
+
+def _client(tmp_path: Path, **extra: object) -> DatabaseClientComponent:
+    config = {
+        "db_type": "sqlite",
+        "database": str(tmp_path / "client.db"),
+        **extra,
+    }
+    return DatabaseClientComponent(config)
+
+
+def test_client_connector_uses_configured_pool_size(tmp_path: Path) -> None:
+    assert _client(tmp_path).connector.config["pool_size"] == 10
+    assert _client(tmp_path, pool_size=3).connector.config["pool_size"] == 3
+
+    client = _client(tmp_path, pool_size=3, connection_params={"pool_size": 7})
+    assert client.connector.config["pool_size"] == 7
+
+
+def test_client_queries_share_pooled_connections(tmp_path: Path) -> None:
+    client = _client(tmp_path, pool_size=2, max_overflow=0)
+    assert client.start()[0]
+    results: list[tuple[bool, object]] = []
+
+    def worker() -> None:
+        for _ in range(5):
+            results.append(client.execute_query("SELECT 1 AS one"))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 20
+    assert all(success for success, _ in results)
+    assert client.connector._pool._created <= 2
+    client.stop()
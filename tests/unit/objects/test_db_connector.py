@@ -0,0 +1,446 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+from ptest.objects.db import GenericDatabaseConnector, _ConnectionPool
+
+
+def _sqlite_connector(tmp_path: Path, **extra: object) -> GenericDatabaseConnector:
+    config = {"driver": "sqlite", "database": str(tmp_path / "test.db"), **extra}
+    return GenericDatabaseConnector(config)
+
+
+def test_connection_pool_reuses_released_connections() -> None:
+    created: list[object] = []
+
+    def factory() -> object:
+        conn = object()
+        created.append(conn)
+        return conn
+
+    pool = _ConnectionPool(factory, pool_size=2, max_overflow=0, timeout=0.1)
+    first = pool.acquire()
+    pool.release(first)
+
+    assert pool.acquire() is first
+    assert len(created) == 1
+
+
+def test_connection_pool_times_out_when_exhausted() -> None:
+    pool = _ConnectionPool(object, pool_size=1, max_overflow=0, timeout=0.05)
+    pool.acquire()
+
+    try:
+        pool.acquire()
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("expected TimeoutError")
+
+
+def test_sqlite_queries_share_pooled_connection(tmp_path: Path) -> None:
+    connector = _sqlite_connector(tmp_path, pool_size=2)
+
+    assert connector.execute_query("CREATE TABLE t (id INTEGER)")[0]
+    assert connector.execute_query("INSERT INTO t VALUES (1)")[0]
+    success, rows = connector.execute_query("SELECT id FROM t")
+
+    assert success
+    assert [dict(row) for row in rows] == [{"id": 1}]
+    connector.close()
+    assert connector.connection is None
+
+
+def test_sqlite_queries_from_multiple_threads(tmp_path: Path) -> None:
+    connector = _sqlite_connector(tmp_path, pool_size=2, max_overflow=2)
+    connector.execute_query("CREATE TABLE t (id INTEGER)")
+    results: list[bool] = []
+
+    def worker() -> None:
+        results.append(connector.execute_query("SELECT COUNT(*) FROM t")[0])
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 4
+    connector.close()
+
+
+def test_sqlite_memory_database_uses_single_connection() -> None:
+    connector = GenericDatabaseConnector({"driver": "sqlite"})
+    connector.execute_query("CREATE TABLE t (id INTEGER)")
+
+    success, _ = connector.execute_query("SELECT * FROM t")
+
+    assert success
+    connector.close()
+
+
+def test_driver_module_resolution_is_cached(monkeypatch) -> None:
+    GenericDatabaseConnector({"driver": "sqlite"}).connect()
+    assert GenericDatabaseConnector._MODULE_REGISTRY["sqlite"] is sqlite3
+
+    def fail_import(name: str) -> None:
+        raise AssertionError(f"unexpected import of {name}")
+
+    monkeypatch.setattr("importlib.import_module", fail_import)
+    connector = GenericDatabaseConnector({"driver": "sqlite"})
+    connector.connect()
+    assert connector.connection_module is sqlite3
+    connector.close()
+
+
+def test_missing_driver_reports_install_hint(monkeypatch) -> None:
+    monkeypatch.setattr(GenericDatabaseConnector, "_MODULE_REGISTRY", {})
+    available: dict[str, types.ModuleType] = {}
+
+    def fake_import(name: str) -> types.ModuleType:
+        if name not in available:
+            raise ImportError(name)
+        return available[name]
+
+    monkeypatch.setattr(
+        GenericDatabaseConnector, "_import_module", staticmethod(fake_import)
+    )
+
+    connector = GenericDatabaseConnector({"driver": "mysql"})
+    try:
+        connector.connect()
+    except ImportError as e:
+        assert "Neither pymysql nor mysql.connector is available" in str(e)
+        assert "pip install pymysql" in str(e)
+    else:
+        raise AssertionError("expected ImportError")
+
+    # 导入失败不被缓存，之后安装的驱动可以被解析
+    available["pymysql"] = types.ModuleType("pymysql")
+    assert GenericDatabaseConnector._resolve_module("mysql") is available["pymysql"]
+
+
+def test_driver_aliases_are_normalized_once() -> None:
+    connector = GenericDatabaseConnector({"db_type": "SQLite"})
+    assert connector.config["driver"] == "sqlite"
+
+    try:
+        GenericDatabaseConnector({"driver": "unknown"})
+    except ValueError as e:
+        assert "Unsupported driver: unknown" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_config_key_aliases_are_normalized_once() -> None:
+    config = {"driver": "mysql", "user": "admin", "username": "", "db": "app"}
+    connector = GenericDatabaseConnector(config)
+
+    assert connector.config == {
+        "driver": "mysql",
+        "username": "admin",
+        "database": "app",
+    }
+    assert "database" not in config
+
+
+def test_stream_select_yields_rows_in_batches(tmp_path: Path) -> None:
+    connector = _sqlite_connector(tmp_path, stream=True, fetch_size=2)
+    connector.execute_query("CREATE TABLE t (id INTEGER)")
+    for i in range(5):
+        connector.execute_query(f"INSERT INTO t VALUES ({i})")
+
+    success, rows = connector.execute_query("SELECT id FROM t ORDER BY id")
+
+    assert success
+    assert not isinstance(rows, list)
+    assert [row["id"] for row in rows] == [0, 1, 2, 3, 4]
+    connector.close()
+
+
+def test_closed_stream_returns_its_connection_to_the_pool() -> None:
+    connector = GenericDatabaseConnector(
+        {"driver": "sqlite", "database": ":memory:", "stream": True, "pool_timeout": 1}
+    )
+    connector.connect()
+
+    success, rows = connector.execute_query("SELECT 1")
+    assert success
+    with rows:
+        pass  # 未迭代即关闭
+
+    success, rows = connector.execute_query("SELECT 2 AS n")
+    assert success
+    rows.close()
+    rows.close()
+
+    success, rows = connector.execute_query("SELECT 3 AS n")
+    assert success
+    assert [row["n"] for row in rows] == [3]
+    connector.close()
+
+
+def test_select_detection_ignores_case_and_leading_whitespace() -> None:
+    assert GenericDatabaseConnector._is_select("  select 1")
+    assert GenericDatabaseConnector._is_select("\nSELECT * FROM t")
+    assert not GenericDatabaseConnector._is_select("SELECTED_ROWS")
+    assert not GenericDatabaseConnector._is_select("INSERT INTO t SELECT 1")
+
+
+def test_execute_query_binds_params_and_batches_rows(tmp_path: Path) -> None:
+    connector = _sqlite_connector(tmp_path)
+    connector.execute_query("CREATE TABLE t (id INTEGER, name TEXT)")
+
+    success, message = connector.execute_query(
+        "INSERT INTO t VALUES (?, ?)", [(1, "a"), (2, "b"), (3, "c")]
+    )
+    assert success, message
+    assert "Rows affected: 3" in message
+
+    success, rows = connector.execute_query("SELECT name FROM t WHERE id = ?", (2,))
+    assert success
+    assert [row["name"] for row in rows] == ["b"]
+    connector.close()
+
+
+def test_execute_query_closes_cursor(monkeypatch, tmp_path: Path) -> None:
+    connector = _sqlite_connector(tmp_path)
+    opened = []
+    open_cursor = GenericDatabaseConnector._open_cursor
+
+    def tracking_open_cursor(self, conn, server_side=False):
+        cursor = open_cursor(self, conn, server_side)
+        opened.append(cursor)
+        return cursor
+
+    monkeypatch.setattr(GenericDatabaseConnector, "_open_cursor", tracking_open_cursor)
+    connector.execute_query("SELECT 1")
+    connector.execute_query("SELECT missing_column")
+
+    assert len(opened) == 2
+    for cursor in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            cursor.execute("SELECT 1")
+    connector.close()
+
+
+def test_execute_many_inserts_rows_in_one_call(tmp_path: Path) -> None:
+    connector = _sqlite_connector(tmp_path)
+    connector.execute_query("CREATE TABLE t (id INTEGER)")
+
+    success, message = connector.execute_many(
+        "INSERT INTO t VALUES (?)", ((i,) for i in range(5))
+    )
+    assert success, message
+    assert "Rows affected: 5" in message
+
+    success, rows = connector.execute_query("SELECT COUNT(*) AS n FROM t")
+    assert rows[0]["n"] == 5
+    connector.close()
+
+
+class _FakeObjectId:
+    def __init__(self, value: str) -> None:
+        self.value = value
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class _FakeCursor(list):
+    def limit(self, count: int) -> "_FakeCursor":
+        return _FakeCursor(self[:count])
+
+
+class _FakeCollection:
+    def __init__(self, docs: list[dict]) -> None:
+        self.docs = docs
+
+    def find(self, query_filter: dict, projection: object = None) -> _FakeCursor:
+        return _FakeCursor(dict(doc) for doc in self.docs)
+
+    def insert_many(self, docs: list[dict], ordered: bool = True) -> object:
+        self.ordered = ordered
+        self.docs.extend(docs)
+        return types.SimpleNamespace(inserted_ids=[doc.get("_id") for doc in docs])
+
+
+def _mongo_connector(monkeypatch, docs: list[dict]) -> GenericDatabaseConnector:
+    bson = types.ModuleType("bson")
+    bson.ObjectId = _FakeObjectId  # type: ignore[attr-defined]
+    monkeypatch.setitem(__import__("sys").modules, "bson", bson)
+    monkeypatch.setitem(
+        GenericDatabaseConnector._MODULE_REGISTRY, "mongodb", types.ModuleType("m")
+    )
+
+    connector = GenericDatabaseConnector({"driver": "mongodb"})
+    connector.connection = {"users": _FakeCollection(docs)}
+    return connector
+
+
+def test_mongodb_query_stringifies_object_ids(monkeypatch) -> None:
+    connector = _mongo_connector(
+        monkeypatch, [{"_id": _FakeObjectId("abc"), "name": "a"}, {"_id": 7}]
+    )
+
+    success, docs = connector.execute_query('{"collection": "users"}')
+
+    assert success
+    assert docs == [{"_id": "abc", "name": "a"}, {"_id": 7}]
+
+
+def test_mongodb_raw_query_keeps_bson_documents(monkeypatch) -> None:
+    class FakeDatabase(dict):
+        def get_collection(self, name: str, codec_options: object) -> object:
+            self.codec_options = codec_options
+            return self[name]
+
+    codec_options = types.ModuleType("bson.codec_options")
+    codec_options.CodecOptions = lambda document_class: document_class  # type: ignore[attr-defined]
+    raw_bson = types.ModuleType("bson.raw_bson")
+    raw_bson.RawBSONDocument = object  # type: ignore[attr-defined]
+    connector = _mongo_connector(monkeypatch, [{"_id": _FakeObjectId("abc")}])
+    monkeypatch.setitem(__import__("sys").modules, "bson.codec_options", codec_options)
+    monkeypatch.setitem(__import__("sys").modules, "bson.raw_bson", raw_bson)
+    connector.connection = FakeDatabase(connector.connection)
+
+    success, docs = connector.execute_query('{"collection": "users", "raw": true}')
+
+    assert success
+    assert isinstance(docs[0]["_id"], _FakeObjectId)
+    assert connector.connection.codec_options is object
+
+
+def test_mongodb_query_can_stream_documents(monkeypatch) -> None:
+    connector = _mongo_connector(monkeypatch, [{"_id": 1}, {"_id": 2}, {"_id": 3}])
+
+    success, docs = connector.execute_query(
+        '{"collection": "users", "limit": 2, "stream": true}'
+    )
+
+    assert success
+    assert not isinstance(docs, list)
+    assert list(docs) == [{"_id": 1}, {"_id": 2}]
+
+
+def test_mongodb_execute_many_inserts_unordered(monkeypatch) -> None:
+    connector = _mongo_connector(monkeypatch, [])
+    collection = connector.connection["users"]
+
+    success, message = connector.execute_many("users", [{"_id": 1}, {"_id": 2}])
+
+    assert success, message
+    assert message == "Inserted 2 documents"
+    assert collection.ordered is False
+    assert collection.docs == [{"_id": 1}, {"_id": 2}]
+
+
+def test_test_connection_reuses_pooled_connection(tmp_path: Path) -> None:
+    connector = _sqlite_connector(tmp_path)
+
+    assert connector.test_connection() == (True, "Sqlite connection successful")
+    first = connector.connection
+    assert connector.test_connection()[0]
+
+    assert connector.connection is first
+    connector.close()
+
+
+def test_test_connection_reconnects_when_connection_is_broken(tmp_path: Path) -> None:
+    connector = _sqlite_connector(tmp_path)
+    connector.test_connection()
+    connector.connection.close()
+
+    assert connector.test_connection()[0]
+    assert connector.execute_query("SELECT 1")[0]
+    connector.close()
+
+
+def test_driver_module_is_imported_on_first_connect(monkeypatch) -> None:
+    monkeypatch.setattr(GenericDatabaseConnector, "_MODULE_REGISTRY", {})
+
+    connector = GenericDatabaseConnector({"driver": "sqlite"})
+    assert connector.connection_module is None
+
+    connector.connect()
+    assert connector.connection_module is not None
+    connector.close()
+
+
+def test_odbc_connection_string_quotes_special_values() -> None:
+    connector = GenericDatabaseConnector(
+        {
+            "driver": "sqlserver",
+            "host": "db",
+            "database": "app",
+            "username": "sa",
+            "password": "p;w}d",
+        }
+    )
+
+    assert connector._odbc_connection_string() == (
+        "DRIVER={ODBC Driver 17 for SQL Server};SERVER=db;DATABASE=app;"
+        "UID=sa;PWD={p;w}}d}"
+    )
+
+
+def test_custom_module_capabilities_are_probed_once(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(GenericDatabaseConnector, "_probed_caps", {})
+    connector = GenericDatabaseConnector(
+        {
+            "connection_module": "sqlite3",
+            "connection_config": {"database": str(tmp_path / "c.db")},
+        }
+    )
+    connector.connect()
+    connector.execute_query("CREATE TABLE t (id INTEGER)")
+    connector.execute_query("INSERT INTO t VALUES (1)")
+
+    assert GenericDatabaseConnector._probed_caps == {
+        "sqlite3": {"fetchmany": True, "commit": True, "rowcount": True}
+    }
+    assert connector._caps is GenericDatabaseConnector._probed_caps["sqlite3"]
+    connector.close()
+
+
+def test_execute_query_async_runs_queries_concurrently(
+    monkeypatch, tmp_path: Path
+) -> None:
+    connector = _sqlite_connector(tmp_path, pool_size=2, max_overflow=0)
+    lock = threading.Lock()
+    active = peak = 0
+    execute_query = GenericDatabaseConnector.execute_query
+
+    def tracking_execute_query(self, query, params=None):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        try:
+            return execute_query(self, query, params)
+        finally:
+            with lock:
+                active -= 1
+
+    monkeypatch.setattr(
+        GenericDatabaseConnector, "execute_query", tracking_execute_query
+    )
+
+    async def run() -> list:
+        return await asyncio.gather(
+            *(connector.execute_query_async("SELECT ? AS n", (i,)) for i in range(6))
+        )
+
+    results = asyncio.run(run())
+
+    assert [rows[0]["n"] for _, rows in results] == list(range(6))
+    assert peak == 2
+    connector.close()
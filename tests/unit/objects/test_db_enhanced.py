@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+
+from ptest.objects.db_enhanced import DatabaseServerObject, batch_health_check
+
+
+def test_batch_health_check_runs_checks_concurrently() -> None:
+    # 五个检查都到达屏障后才能返回，串行执行时屏障超时失败
+    barrier = threading.Barrier(5, timeout=5)
+
+    def blocking_check(name: str) -> SimpleNamespace:
+        def health_check() -> str:
+            barrier.wait()
+            return f"✓ {name} healthy"
+
+        return SimpleNamespace(name=name, health_check=health_check)
+
+    results = batch_health_check([blocking_check(f"db{i}") for i in range(5)])
+
+    assert results == [(f"db{i}", f"✓ db{i} healthy") for i in range(5)]
+    assert not barrier.broken
+
+
+def test_batch_health_check_accepts_empty_input() -> None:
+    assert batch_health_check([]) == []
+
+
+def test_server_uninstall_stops_component_once(env_manager) -> None:
+    obj = DatabaseServerObject("db", env_manager)
+    calls: list[str] = []
+
+    def stop() -> tuple[bool, str]:
+        calls.append("stop")
+        component.status = "stopped"
+        return True, "stopped"
+
+    component = SimpleNamespace(status="running", config={}, stop=stop)
+    obj.server_component = component  # type: ignore[assignment]
+    obj.status = "running"
+
+    assert "uninstalled" in obj.uninstall()
+    assert calls == ["stop"]
+    assert obj.status == "removed"
+
+
+def test_server_restart_calls_component_restart_directly(env_manager) -> None:
+    obj = DatabaseServerObject("db", env_manager)
+    calls: list[str] = []
+
+    def restart() -> tuple[bool, str]:
+        calls.append("restart")
+        return True, "restarted"
+
+    def unexpected() -> tuple[bool, str]:
+        raise AssertionError("restart must not go through stop()/start()")
+
+    obj.server_component = SimpleNamespace(  # type: ignore[assignment]
+        status="running", restart=restart, stop=unexpected, start=unexpected
+    )
+    obj.installed = True
+    obj.status = "running"
+
+    result = obj.restart()
+
+    assert result.startswith("✓") and "restarted" in result
+    assert calls == ["restart"]
+    assert obj.status == "running"
+
+
+def test_server_install_merges_params_over_defaults(env_manager) -> None:
+    obj = DatabaseServerObject("db", env_manager)
+
+    result = obj.install(
+        {"db_type": "postgresql", "server_port": 6543, "mongodb_config": {"a": 1}}
+    )
+
+    assert result.startswith("✓")
+    config = obj.server_component.config  # type: ignore[union-attr]
+    assert config["host"] == "localhost"
+    assert config["port"] == 6543
+    assert config["pid_file"] == "/tmp/db.pid"
+    assert config["mongodb_config"] == {"a": 1}
+    assert "mysql_config" not in config
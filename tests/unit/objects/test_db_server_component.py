@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from ptest.objects.db_server import _SQLITE_API_SCRIPT, DatabaseServerComponent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _server(tmp_path: Path, **extra: object) -> DatabaseServerComponent:
+    config = {
+        "db_type": "sqlite",
+        "host": "127.0.0.1",
+        "port": _free_port(),
+        "data_dir": str(tmp_path / "data"),
+        "log_file": str(tmp_path / "server.log"),
+        "pid_file": str(tmp_path / "server.pid"),
+        **extra,
+    }
+    return DatabaseServerComponent(config)
+
+
+def test_stop_returns_as_soon_as_process_exits(tmp_path: Path) -> None:
+    server = _server(tmp_path)
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    Path(server.pid_file).write_text(str(proc.pid))
+    server.status = "running"
+
+    started = time.monotonic()
+    success, message = server.stop()
+
+    assert success, message
+    assert time.monotonic() - started < 1
+    assert not Path(server.pid_file).exists()
+    assert server.status == "stopped"
+
+
+def test_stop_without_pid_file_returns_immediately(tmp_path: Path) -> None:
+    server = _server(tmp_path)
+    server.status = "running"
+
+    assert server.stop() == (True, "Database server stopped successfully")
+    assert server.status == "stopped"
+
+
+def test_restart_starts_without_fixed_delay(monkeypatch, tmp_path: Path) -> None:
+    server = _server(tmp_path)
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    Path(server.pid_file).write_text(str(proc.pid))
+    server.status = "running"
+    monkeypatch.setattr(DatabaseServerComponent, "start", lambda self: (True, "ok"))
+
+    started = time.monotonic()
+    assert server.restart() == (True, "ok")
+    assert time.monotonic() - started < 1
+    assert proc.poll() is not None
+    assert not Path(server.pid_file).exists()
+
+
+def test_wait_for_exit_times_out_for_live_process(tmp_path: Path) -> None:
+    server = _server(tmp_path)
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        assert not server._wait_for_exit(proc.pid, timeout=0.05)
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def test_wait_for_exit_polls_without_pidfd(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.delattr("os.pidfd_open", raising=False)
+    server = _server(tmp_path)
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+
+    assert server._wait_for_exit(proc.pid, timeout=5)
+
+
+def test_run_launcher_does_not_wait_for_daemonized_children(tmp_path: Path) -> None:
+    server = _server(tmp_path)
+    script = (
+        "import subprocess, sys;"
+        "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(5)']);"
+        "sys.stderr.write('boom'); sys.exit(3)"
+    )
+
+    started = time.monotonic()
+    returncode, stderr = server._run_launcher([sys.executable, "-c", script])
+
+    assert (returncode, stderr) == (3, "boom")
+    assert time.monotonic() - started < 3
+
+
+def test_wait_for_port_returns_once_listening(tmp_path: Path) -> None:
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        server = _server(tmp_path, port=listener.getsockname()[1])
+
+        assert server._wait_for_port(timeout=1)
+
+
+def test_get_pid_rereads_only_when_pid_file_changes(
+    monkeypatch, tmp_path: Path
+) -> None:
+    server = _server(tmp_path)
+    pid_file = Path(server.pid_file)
+    pid_file.write_text("123")
+    assert server._get_pid() == 123
+
+    def fail_open(*args: object, **kwargs: object) -> None:
+        raise AssertionError("pid file should not be reopened")
+
+    monkeypatch.setattr("builtins.open", fail_open)
+    assert server._get_pid() == 123
+    monkeypatch.undo()
+
+    pid_file.write_text("45678")
+    assert server._get_pid() == 45678
+    pid_file.unlink()
+    assert server._get_pid() is None
+
+
+def test_data_dir_initialization_is_checked_once(tmp_path: Path) -> None:
+    server = _server(tmp_path)
+
+    assert not server._is_data_dir_initialized("PG_VERSION")
+    Path(server.data_dir).mkdir()
+    (Path(server.data_dir) / "PG_VERSION").write_text("16")
+    assert not server._is_data_dir_initialized("PG_VERSION")
+
+    server._initialized = True
+    assert server._is_data_dir_initialized("PG_VERSION")
+
+
+def test_health_check_results_are_cached_for_ttl(monkeypatch, tmp_path: Path) -> None:
+    listener = socket.create_server(("127.0.0.1", 0))
+    server = _server(tmp_path, health_check_ttl=60, port=listener.getsockname()[1])
+    Path(server.pid_file).write_text(str(os.getpid()))
+    server.status = "running"
+    assert server.health_check()[0] is True
+    listener.close()
+
+    calls = []
+    monkeypatch.setattr(
+        DatabaseServerComponent,
+        "_is_process_running",
+        lambda self, pid: calls.append(pid) or False,
+    )
+    assert server.health_check()[0] is True
+    assert calls == []
+
+    server._hc_ttl = 0
+    assert server.health_check() == (False, "Database server process not found")
+    assert server.status == "stopped"
+
+
+def test_health_check_requires_listening_port(tmp_path: Path) -> None:
+    server = _server(tmp_path, health_check_ttl=0)
+    Path(server.pid_file).write_text(str(os.getpid()))
+    server.status = "running"
+
+    assert server.health_check() == (
+        False,
+        f"Database server port {server.port} is not reachable",
+    )
+
+    with socket.create_server(("127.0.0.1", server.port)):
+        assert server.health_check()[0] is True
+
+
+def test_sqlite_api_script_template_is_valid_python() -> None:
+    script = _SQLITE_API_SCRIPT.substitute(
+        HOST=repr("localhost"),
+        PORT=8123,
+        PID_FILE=repr("/tmp/a'b.pid"),
+        DB_PATH=repr("/tmp/a.db"),
+        QUERY_API=repr(False),
+    )
+
+    compile(script, "sqlite_api_server.py", "exec")
+    assert "import os\n" in script
+    assert "HOST = 'localhost'\n" in script
+    assert "PORT = 8123\n" in script
+
+
+def test_sqlite_api_server_binds_only_configured_host(tmp_path: Path) -> None:
+    server = _server(tmp_path)
+
+    success, message = server.start()
+    try:
+        assert success, message
+        script = Path(f"/tmp/sqlite_api_server_{server.port}.py").read_text()
+        assert "HOST = '127.0.0.1'\n" in script
+        with socket.socket() as other:
+            other.bind(("127.0.0.2", server.port))
+    finally:
+        assert server.stop()[0]
+
+
+def test_api_script_is_rewritten_only_when_content_changes(tmp_path: Path) -> None:
+    path = tmp_path / "api.py"
+
+    DatabaseServerComponent._write_api_script(str(path), "print(1)\n")
+    first = path.stat()
+    DatabaseServerComponent._write_api_script(str(path), "print(1)\n")
+    assert path.stat().st_ino == first.st_ino
+    assert path.stat().st_mtime_ns == first.st_mtime_ns
+
+    DatabaseServerComponent._write_api_script(str(path), "print(2)\n")
+    assert path.read_text().endswith("print(2)\n")
+    assert path.stat().st_ino != first.st_ino
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_sqlite_api_server_starts_and_stops(tmp_path: Path) -> None:
+    server = _server(tmp_path)
+
+    success, message = server.start()
+    try:
+        assert success, message
+        assert server._is_process_running(server._get_pid())
+    finally:
+        assert server.stop()[0]
+
+
+def test_sqlite_api_server_serves_queries_from_database(tmp_path: Path) -> None:
+    db_path = tmp_path / "api.db"
+    server = _server(tmp_path, database=str(db_path), enable_query_api=True)
+
+    def query(sql: str, params: list | None = None) -> dict:
+        body = json.dumps({"sql": sql, "params": params or []}).encode()
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.port}/api/query", data=body, method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return json.loads(response.read())
+
+    success, message = server.start()
+    try:
+        assert success, message
+        query("CREATE TABLE t (v INTEGER)")
+        assert query("INSERT INTO t VALUES (?)", [7]) == {"rowcount": 1}
+        assert query("SELECT v FROM t") == {"rows": [{"v": 7}]}
+        assert query("PRAGMA journal_mode") == {"rows": [{"journal_mode": "wal"}]}
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(f"http://127.0.0.1:{server.port}/other", timeout=5)
+        assert excinfo.value.code == 404
+    finally:
+        assert server.stop()[0]
+
+
+@pytest.mark.parametrize("length", ["abc", "-5"])
+def test_sqlite_api_server_rejects_invalid_content_length(
+    tmp_path: Path, length: str
+) -> None:
+    server = _server(tmp_path)
+
+    success, message = server.start()
+    try:
+        assert success, message
+        with socket.create_connection(("127.0.0.1", server.port), timeout=5) as conn:
+            conn.sendall(
+                f"POST /api/query HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode()
+            )
+            response = b""
+            while chunk := conn.recv(4096):
+                response += chunk
+        assert response.split(b"\r\n", 1)[0].split(b" ", 2)[1] == b"400"
+        assert b"Connection: close\r\n" in response
+        assert server.health_check()[0] is True
+    finally:
+        assert server.stop()[0]
+
+
+def test_sqlite_api_server_query_endpoint_is_off_by_default(tmp_path: Path) -> None:
+    db_path = tmp_path / "api.db"
+    server = _server(tmp_path, database=str(db_path))
+    body = json.dumps({"sql": "CREATE TABLE t (v INTEGER)"}).encode()
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{server.port}/api/query", data=body, method="POST"
+    )
+
+    success, message = server.start()
+    try:
+        assert success, message
+        with urllib.request.urlopen(request, timeout=5) as response:
+            assert json.loads(response.read()) == {
+                "message": "SQLite API server running",
+                "operation": "query",
+            }
+        assert not db_path.exists()
+    finally:
+        assert server.stop()[0]
+
+
+def test_sqlite_api_server_reports_startup_failure(tmp_path: Path) -> None:
+    with socket.socket() as listener:
+        listener.bind(("", 0))
+        listener.listen()
+        server = _server(tmp_path, port=listener.getsockname()[1])
+
+        success, message = server.start()
+
+    assert not success
+    assert "Address already in use" in message
+    assert server.status == "stopped"
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import logging
+import subprocess
+import sys
+import threading
+from types import SimpleNamespace
+
+from ptest.objects.db_v2 import _SHARED_CLIENTS, EnhancedDBObject
+
+
+class _Component:
+    def __init__(self) -> None:
+        self.status = "stopped"
+        self.status_calls = 0
+
+    def start(self) -> tuple[bool, str]:
+        self.status = "running"
+        return True, "started"
+
+    def stop(self) -> tuple[bool, str]:
+        self.status = "stopped"
+        return True, "stopped"
+
+    def get_status(self) -> dict:
+        self.status_calls += 1
+        return {"status": self.status, "connected": self.status == "running"}
+
+
+def test_get_status_is_cached_until_lifecycle_change(monkeypatch, env_manager) -> None:
+    obj = EnhancedDBObject("db", env_manager)
+    component = _Component()
+    obj.client_component = component  # type: ignore[assignment]
+    obj.installed = True
+
+    first = obj.get_status()
+    first["status"] = "mutated"
+    first["client_status"]["status"] = "mutated"
+    cached = obj.get_status()
+    assert cached["status"] == obj.status
+    assert cached["client_status"]["status"] == "stopped"
+    cached["client_status"]["status"] = "mutated"
+    assert obj.get_status()["client_status"]["status"] == "stopped"
+    assert component.status_calls == 1
+
+    obj.start()
+    assert obj.get_status()["client_status"]["status"] == "running"
+    assert component.status_calls == 2
+
+    monkeypatch.setattr(EnhancedDBObject, "STATUS_CACHE_TTL", 0)
+    obj.get_status()
+    assert component.status_calls == 3
+
+
+def test_health_check_queries_components_concurrently(env_manager) -> None:
+    obj = EnhancedDBObject("db", env_manager)
+    # 两个检查都到达屏障后才能返回，串行执行时屏障超时失败
+    barrier = threading.Barrier(2, timeout=5)
+
+    def blocking_check(message: str):
+        def health_check() -> tuple[bool, str]:
+            barrier.wait()
+            return True, message
+
+        return SimpleNamespace(health_check=health_check)
+
+    obj.server_component = blocking_check("server ok")  # type: ignore[assignment]
+    obj.client_component = blocking_check("client ok")  # type: ignore[assignment]
+    obj.installed = True
+
+    result = obj.health_check()
+
+    assert result == (True, "All components healthy: server ok; client ok")
+    assert not barrier.broken
+
+
+def test_enhanced_db_object_has_no_instance_dict(env_manager) -> None:
+    obj = EnhancedDBObject("db", env_manager)
+
+    assert not hasattr(obj, "__dict__")
+
+
+def test_importing_db_v2_defers_component_modules() -> None:
+    code = (
+        "import sys, ptest.objects.db_v2; "
+        "print('ptest.objects.db_server' in sys.modules, "
+        "'ptest.objects.db_client' in sys.modules)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+    assert output.split() == ["False", "False"]
+
+
+def test_start_and_stop_report_each_component_on_its_own_line(env_manager) -> None:
+    obj = EnhancedDBObject("db", env_manager)
+    obj.server_component = _Component()  # type: ignore[assignment]
+    obj.client_component = _Component()  # type: ignore[assignment]
+    obj.installed = True
+
+    started = obj.start()
+    assert started.endswith("started:\nServer: started\nClient: started")
+
+    stopped = obj.stop()
+    assert stopped.endswith("stopped:\nClient: stopped\nServer: stopped")
+
+
+def test_uninstall_stops_running_components_once(env_manager) -> None:
+    obj = EnhancedDBObject("db", env_manager)
+    stops: list[str] = []
+
+    class _StickyComponent(_Component):
+        def stop(self) -> tuple[bool, str]:
+            stops.append("stop")
+            return True, "stopped"
+
+    obj.server_component = _StickyComponent()  # type: ignore[assignment]
+    obj.installed = True
+    obj.start()
+
+    assert obj.uninstall().endswith("uninstalled")
+    assert stops == ["stop"]
+    assert obj.server_component is None
+
+
+def test_share_client_reuses_one_component_until_last_uninstall(
+    tmp_path, env_manager
+) -> None:
+    params = {
+        "mode": "client_only",
+        "db_type": "sqlite",
+        "database": str(tmp_path / "shared.db"),
+        "share_client": True,
+    }
+    first = EnhancedDBObject("first", env_manager)
+    second = EnhancedDBObject("second", env_manager)
+    assert first.install(params).startswith("✓")
+    assert second.install(params).startswith("✓")
+    assert first.client_component is second.client_component
+    component = first.client_component
+
+    first.start()
+    second.start()
+    assert "shared connection kept open" in first.stop()
+    assert component.status == "running"  # type: ignore[union-attr]
+
+    first.uninstall()
+    assert component.status == "running"  # type: ignore[union-attr]
+    second.uninstall()
+    assert component.status == "stopped"  # type: ignore[union-attr]
+
+    third = EnhancedDBObject("third", env_manager)
+    third.install(params)
+    assert third.client_component is not component
+    third.uninstall()
+
+
+def test_shared_client_closes_when_all_sharers_stop(tmp_path, env_manager) -> None:
+    params = {
+        "mode": "client_only",
+        "db_type": "sqlite",
+        "database": str(tmp_path / "shared.db"),
+        "share_client": True,
+    }
+    first = EnhancedDBObject("first", env_manager)
+    second = EnhancedDBObject("second", env_manager)
+    first.install(params)
+    second.install(params)
+    component = first.client_component
+
+    first.start()
+    second.start()
+    first.stop()
+    second.stop()
+    assert component.status == "stopped"  # type: ignore[union-attr]
+
+    # 换库重新安装会先注销旧的使用者登记，卸载后不残留共享条目
+    other = {**params, "database": str(tmp_path / "other.db")}
+    assert first.install(other).startswith("✓")
+    assert first.client_component is not component
+    second.uninstall()
+    first.uninstall()
+    assert not _SHARED_CLIENTS
+
+
+def test_prepared_configs_are_cached_and_returned_as_fresh_dicts(env_manager) -> None:
+    obj = EnhancedDBObject("db", env_manager)
+    params = {"db_type": "MySQL", "server_port": 3307, "mode": "full_stack"}
+
+    first = obj._prepare_server_config(params)
+    second = obj._prepare_server_config(params)
+    assert first == second and first is not second
+    assert first["port"] == 3307 and first["pid_file"] == "/tmp/db.pid"
+
+    client = obj._prepare_client_config({"db_type": "mysql"})
+    assert client["server_port"] == 3306
+    client["connection_params"]["x"] = 1
+    assert obj._prepare_client_config({"db_type": "mysql"})["connection_params"] == {}
+
+    server = obj._prepare_server_config({"mysql_config": {"health_check_mode": "tcp"}})
+    assert server["mysql_config"] == {"health_check_mode": "tcp"}
+
+
+def test_restart_decides_on_stop_result_not_message_text(env_manager) -> None:
+    obj = EnhancedDBObject("db", env_manager)
+    component = _Component()
+    component.stop = lambda: (False, "✓ looks fine")  # type: ignore[method-assign]
+    obj.client_component = component  # type: ignore[assignment]
+    obj.installed = True
+
+    assert obj.restart() == "✗ Database object 'db' not running"
+
+    obj.start()
+    assert obj.restart().startswith("✓") and obj.status == "running"
+
+
+def test_logger_is_bound_once_at_construction(env_manager) -> None:
+    obj = EnhancedDBObject("db", env_manager)
+    assert obj._log is env_manager.logger
+
+    # 之后替换 env_manager.logger 不影响已创建对象的日志器
+    env_manager.logger = logging.getLogger("ptest-test-db-v2-other")
+    obj.stop()
+    assert obj._log is not env_manager.logger
+
+
+def test_prepare_server_config_maps_install_params(env_manager) -> None:
+    obj = EnhancedDBObject("db", env_manager)
+
+    config = obj._prepare_server_config(
+        {"db_type": "mysql", "server_host": "10.0.0.1", "config_file": "/etc/my.cnf"}
+    )
+
+    assert config["host"] == "10.0.0.1"
+    assert config["port"] == 3306
+    assert config["config_file"] == "/etc/my.cnf"
+    assert obj._prepare_client_config({"db_type": "postgres"})["server_port"] == 5432
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import logging
+import threading
 from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
+
 from ptest.objects.db_server import DatabaseServerComponent
-from ptest.objects.manager import ObjectManager
+from ptest.objects.manager import ObjectManager, _resolve_type
 
 
 class _MockEnvManager:
@@ -28,6 +31,100 @@ def test_sqlite_alias_remains_database() -> None:
     assert manager.get_object_type("sqlite") == "database"
 
 
+def test_get_object_type_lookups_are_memoized() -> None:
+    manager = ObjectManager(_MockEnvManager())
+    manager.get_object_type("Nginx")
+    hits = _resolve_type.cache_info().hits
+
+    assert manager.get_object_type("Nginx") == "web"
+    assert manager.get_object_type("unknown") is None
+    assert _resolve_type.cache_info().hits == hits + 1
+
+
+def test_create_object_resolves_types_and_aliases_case_insensitively() -> None:
+    manager = ObjectManager(_MockEnvManager())
+
+    assert type(manager.create_object("MySQL", "db1")).__name__ == (
+        "DatabaseServerObject"
+    )
+    assert manager.create_object("service", "svc").type_name == "service"
+    assert set(manager.objects) == {"db1", "svc"}
+
+    with pytest.raises(ValueError, match="Unknown object type: unknown"):
+        manager.create_object("unknown", "x")
+
+
+def test_lifecycle_all_runs_objects_concurrently() -> None:
+    manager = ObjectManager(_MockEnvManager())
+    # 四个对象都到达屏障后才能返回，串行执行时屏障超时失败
+    barrier = threading.Barrier(4, timeout=5)
+
+    def blocking(result: str):
+        def call() -> str:
+            barrier.wait()
+            return result
+
+        return call
+
+    for i in range(4):
+        manager.objects[f"obj{i}"] = SimpleNamespace(
+            start=blocking(f"started {i}"), stop=blocking(f"stopped {i}")
+        )
+
+    assert manager.start_all() == [(f"obj{i}", f"started {i}") for i in range(4)]
+    assert manager.stop_all() == [(f"obj{i}", f"stopped {i}") for i in range(4)]
+    assert not barrier.broken
+    assert manager.health_check_all() == []
+
+
+def test_delete_object_uninstalls_managed_object() -> None:
+    manager = ObjectManager(_MockEnvManager())
+    obj = manager.create_object("service", "svc")
+    obj.install()
+
+    assert manager.delete_object("svc") == "✓ Deleted svc"
+    assert obj.status == "removed"
+    assert manager.delete_object("svc") == "✗ Object 'svc' does not exist"
+
+
+def test_uninstall_keeps_object_when_uninstall_fails() -> None:
+    manager = ObjectManager(_MockEnvManager())
+    manager.objects["bad"] = SimpleNamespace(uninstall=lambda: "")
+    manager.objects["good"] = SimpleNamespace(uninstall=lambda: "✓ done")
+
+    assert manager.uninstall("bad") == "✗ Failed to uninstall bad"
+    assert manager.uninstall("good") == "✓ Uninstalled good"
+    assert manager.uninstall("missing") == "✗ Object 'missing' does not exist"
+    assert set(manager.objects) == {"bad"}
+
+
+def test_object_stays_visible_and_in_place_during_uninstall() -> None:
+    manager = ObjectManager(_MockEnvManager())
+    seen = []
+
+    def uninstall() -> str:
+        seen.append(list(manager.objects))
+        raise RuntimeError("boom")
+
+    manager.objects["first"] = SimpleNamespace(uninstall=uninstall, delete=uninstall)
+    manager.objects["second"] = SimpleNamespace()
+
+    assert manager.uninstall("first") == "✗ Error uninstalling first"
+    assert manager.delete_object("first") == "✗ Error: boom"
+    assert seen == [["first", "second"], ["first", "second"]]
+    assert list(manager.objects) == ["first", "second"]
+
+
+def test_list_objects_puts_each_object_on_its_own_line() -> None:
+    manager = ObjectManager(_MockEnvManager())
+    assert manager.list_objects() == "No objects found"
+
+    manager.create_object("service", "a")
+    manager.create_object("web", "b")
+
+    assert manager.list_objects().splitlines()[1:] == ["  a", "  b"]
+
+
 def test_mysql_component_places_defaults_file_before_runtime_flags(
     tmp_path: Path,
     monkeypatch,
@@ -66,6 +163,11 @@ def test_mysql_component_places_defaults_file_before_runtime_flags(
     )
     monkeypatch.setattr("ptest.objects.db_server.time.sleep", lambda *_args: None)
     monkeypatch.setattr("ptest.objects.db_server.subprocess.run", fake_run)
+    monkeypatch.setattr(
+        DatabaseServerComponent,
+        "_run_launcher",
+        lambda self, cmd, env=None, timeout=30: (fake_run(cmd).returncode, ""),
+    )
 
     component = DatabaseServerComponent(
         {
@@ -0,0 +1,171 @@
+"""增强版报告生成器测试"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+from ptest.reports.enhanced_generator import (
+    EnhancedReportGenerator,
+    ReportData,
+    TestResult,
+)
+
+
+def _data(count: int = 3) -> ReportData:
+    results = [
+        TestResult(
+            f"test_{i}",
+            "passed" if i % 2 == 0 else "failed",
+            0.25 * i,
+            screenshot="shot.png" if i == 1 else "",
+            log_file="run.log" if i == 2 else "",
+        )
+        for i in range(count)
+    ]
+    return ReportData(
+        title="Unit Report",
+        total=count,
+        passed=sum(r.status == "passed" for r in results),
+        failed=sum(r.status == "failed" for r in results),
+        duration=sum(r.duration for r in results),
+        results=results,
+    )
+
+
+def _without_timestamp(html: str) -> list[str]:
+    # 只有生成时间戳一行可能不同
+    return [line for line in html.splitlines() if "Generated:" not in line]
+
+
+def test_table_rows_render_one_line_per_result(tmp_path) -> None:
+    generator = EnhancedReportGenerator(output_dir=str(tmp_path))
+    rows = generator._generate_table_rows(_data().results).split("\n")
+
+    assert len(rows) == 3
+    assert rows[0] == (
+        '<tr><td>test_0</td><td><span class="status-badge status-passed">'
+        "PASSED</span></td><td>0.000s</td><td></td></tr>"
+    )
+    assert 'href="shot.png"' in rows[1] and "FAILED" in rows[1]
+    assert 'href="run.log"' in rows[2] and "0.500s" in rows[2]
+
+
+def test_generate_streams_same_html_as_generate_html(tmp_path) -> None:
+    generator = EnhancedReportGenerator(output_dir=str(tmp_path))
+    data = _data(25)
+
+    html = generator._generate_html(data)
+    report = generator.generate(data).read_text(encoding="utf-8")
+
+    assert _without_timestamp(report) == _without_timestamp(html)
+    assert html.count("<tr><td>test_") == 25
+    assert "margin: 0;" in html and "{{" not in html
+    assert "const durationData = [0.0,0.25," in html
+    assert html.rstrip().endswith("</html>")
+
+
+def test_dollar_signs_in_report_values_are_not_template_placeholders(
+    tmp_path,
+) -> None:
+    generator = EnhancedReportGenerator(output_dir=str(tmp_path))
+    data = _data(1)
+    data.title = "Cost $total ${passed}"
+
+    html = generator._generate_html(data)
+
+    assert "<title>Cost $total ${passed}</title>" in html
+    assert "📊 Cost $total ${passed}</h1>" in html
+    assert "data: [1, 0, 0]" in html
+
+
+def test_history_round_trip_and_comparison(tmp_path) -> None:
+    generator = EnhancedReportGenerator(output_dir=str(tmp_path))
+    assert generator.compare_with_previous(_data(2)) == {"has_previous": False}
+
+    generator.save_history(_data(2))
+    generator.save_history(_data(4))
+    comparison = generator.compare_with_previous(_data(4))
+
+    assert comparison["has_previous"] is True
+    assert comparison["total_diff"] == 2
+    assert comparison["passed_diff"] == 1
+
+
+def test_history_is_appended_as_json_lines_and_compacted(tmp_path) -> None:
+    generator = EnhancedReportGenerator(output_dir=str(tmp_path))
+    limit = generator.HISTORY_LIMIT
+
+    for i in range(limit * 3):
+        generator.save_history(_data(i + 1))
+
+    lines = generator.history_file.read_bytes().splitlines()
+    assert limit <= len(lines) <= limit * 2 + 1
+    assert json.loads(lines[-1])["total"] == limit * 3
+
+    # 最近两条记录跨越多个 4 KiB 读块时也能正确对比
+    comparison = generator.compare_with_previous(_data(limit * 3 + 5))
+    assert comparison["total_diff"] == 6
+
+
+def test_legacy_history_json_is_migrated_once(tmp_path) -> None:
+    legacy = [
+        {"timestamp": "t", "total": n, "passed": n, "failed": 0, "duration": 1.0}
+        for n in (1, 2, 3)
+    ]
+    (tmp_path / "history.json").write_text(json.dumps(legacy, indent=2))
+
+    generator = EnhancedReportGenerator(output_dir=str(tmp_path))
+
+    assert not (tmp_path / "history.json").exists()
+    assert (tmp_path / "history.json.migrated").exists()
+    lines = generator.history_file.read_bytes().splitlines()
+    assert [json.loads(line)["total"] for line in lines] == [1, 2, 3]
+
+    # 迁移后的记录参与对比，再次创建生成器不会重复迁移
+    generator.save_history(_data(5))
+    assert generator.compare_with_previous(_data(5))["total_diff"] == 2
+    EnhancedReportGenerator(output_dir=str(tmp_path))
+    assert len(generator.history_file.read_bytes().splitlines()) == 4
+
+
+def test_unreadable_legacy_history_is_left_in_place(tmp_path) -> None:
+    (tmp_path / "history.json").write_text("{broken")
+
+    generator = EnhancedReportGenerator(output_dir=str(tmp_path))
+
+    assert (tmp_path / "history.json").exists()
+    assert not generator.history_file.exists()
+
+
+def test_report_dataclasses_are_slotted() -> None:
+    result = TestResult("test_0", "passed", 0.1)
+    data = ReportData(results=[result])
+
+    assert not hasattr(result, "__dict__")
+    assert not hasattr(data, "__dict__")
+
+
+def test_compare_with_previous_parses_only_the_last_two_records(tmp_path) -> None:
+    generator = EnhancedReportGenerator(output_dir=str(tmp_path))
+    # 较早的记录即使无法解析也不会被读取
+    generator.history_file.write_bytes(b"not json\n" * 2000)
+    generator.save_history(_data(3))
+    generator.save_history(_data(5))
+
+    comparison = generator.compare_with_previous(_data(5))
+
+    assert comparison["has_previous"] is True
+    assert comparison["total_diff"] == 2
+
+
+def test_timestamp_is_only_taken_when_requested() -> None:
+    assert TestResult("test_0", "passed", 0.1).timestamp == ""
+
+    result = TestResult.now_stamped("test_1", "failed", 0.2, error_message="boom")
+    assert datetime.fromisoformat(result.timestamp)
+    assert (result.case_id, result.status, result.error_message) == (
+        "test_1",
+        "failed",
+        "boom",
+    )
@@ -4,6 +4,7 @@
 测试报告生成器的HTML、JSON、Markdown格式生成功能
 """
 
+import os
 import unittest
 from pathlib import Path
 import tempfile
@@ -16,6 +17,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from ptest.reports.generator import ReportGenerator
+from ptest.reports.templates import CompiledTemplate
 from ptest.cases.result import TestCaseResult
 
 
@@ -170,6 +172,10 @@ class TestReportGenerator(unittest.TestCase):
 
     def test_default_output_path(self):
         """测试默认输出路径"""
+        # 在临时目录中运行，避免报告文件留在仓库根目录
+        cwd = Path.cwd()
+        os.chdir(self.temp_dir)
+        self.addCleanup(os.chdir, cwd)
         report_path = self.report_generator.generate_report(format_type="html")
 
         # 验证报告文件存在
@@ -180,3 +186,117 @@ class TestReportGenerator(unittest.TestCase):
         """测试不支持的格式"""
         with self.assertRaises(ValueError):
             self.report_generator.generate_report(format_type="unsupported")
+
+    def test_result_rows_rendered_for_each_case(self):
+        """测试每个用例生成一行结果"""
+        html_path = self.report_generator.generate_report(
+            format_type="html", output_path=Path(self.temp_dir) / "rows.html"
+        )
+        md_path = self.report_generator.generate_report(
+            format_type="markdown", output_path=Path(self.temp_dir) / "rows.md"
+        )
+
+        html = Path(html_path).read_text(encoding="utf-8")
+        self.assertEqual(html.count('<tr class="result-row'), 3)
+        self.assertIn('<td class="result-error">Assertion failed</td>', html)
+
+        markdown = Path(md_path).read_text(encoding="utf-8")
+        self.assertIn("| test_001 | [PASS] PASSED | 1.50s |  |\n", markdown)
+        self.assertIn(
+            "| test_002 | [FAIL] FAILED | 2.30s | Assertion failed |\n", markdown
+        )
+
+    def test_default_file_name_matches_generated_timestamp(self):
+        """测试默认文件名与报告正文使用同一时间点"""
+        self.env_manager.report_dir = Path(self.temp_dir)
+        report_path = Path(self.report_generator.generate_report(format_type="json"))
+
+        data = json.loads(report_path.read_bytes())
+        generated = datetime.fromisoformat(data["generated_at"])
+        self.assertEqual(
+            report_path.name, f"ptest_report_{generated:%Y%m%d_%H%M%S}.json"
+        )
+
+    def test_summary_counts_results(self):
+        """测试摘要统计"""
+        summary = self.report_generator._collect_summary_data()
+        self.assertEqual(summary["total_cases"], 3)
+        self.assertEqual(summary["passed"], 2)
+        self.assertEqual(summary["failed"], 1)
+        self.assertEqual(summary["total_duration"], 4.6)
+        self.assertEqual(summary["success_rate"], 66.67)
+
+    def test_skipped_results_are_not_rendered_as_failures(self):
+        """测试跳过的用例按跳过状态展示"""
+        result = TestCaseResult("test_004")
+        result.status = "skipped"
+        self.case_manager.results["test_004"] = result
+
+        html_path = self.report_generator.generate_report(
+            format_type="html", output_path=Path(self.temp_dir) / "skip.html"
+        )
+        md_path = self.report_generator.generate_report(
+            format_type="markdown", output_path=Path(self.temp_dir) / "skip.md"
+        )
+
+        html = Path(html_path).read_text(encoding="utf-8")
+        self.assertIn('<span class="status-badge skipped">SKIPPED</span>', html)
+        markdown = Path(md_path).read_text(encoding="utf-8")
+        self.assertIn("| test_004 | [SKIP] SKIPPED | N/A |  |\n", markdown)
+
+    def test_styles_are_embedded_with_single_braces(self):
+        """测试样式表以单层花括号嵌入HTML报告"""
+        report_path = self.report_generator.generate_report(
+            format_type="html", output_path=Path(self.temp_dir) / "styles.html"
+        )
+        html = Path(report_path).read_text(encoding="utf-8")
+
+        self.assertIn("/* Global Styles */\n* {\n    margin: 0;", html)
+        self.assertNotIn("{{", html)
+        self.assertNotIn("}}", html)
+
+    def test_json_report_serializes_result_times_as_iso_strings(self):
+        """测试JSON报告中的时间以ISO格式输出"""
+        report_path = self.report_generator.generate_report(
+            format_type="json", output_path=Path(self.temp_dir) / "times.json"
+        )
+        data = json.loads(Path(report_path).read_bytes())
+
+        result = self.case_manager.results["test_002"]
+        self.assertEqual(
+            data["results"]["test_002"]["start_time"], result.start_time.isoformat()
+        )
+        self.assertEqual(
+            data["results"]["test_002"]["end_time"], result.end_time.isoformat()
+        )
+
+    def test_test_data_reflects_status_changes(self):
+        """测试结果状态变化（数量不变）时统计数据随之更新"""
+        self.assertEqual(self.report_generator._collect_test_data()["passed_count"], 2)
+
+        self.case_manager.results["test_002"].status = "passed"
+        test_data = self.report_generator._collect_test_data()
+        self.assertEqual(test_data["passed_count"], 3)
+        self.assertEqual(test_data["failed_count"], 0)
+        self.assertEqual(test_data["success_rate"], 100.0)
+
+
+class TestCompiledTemplate(unittest.TestCase):
+    """预解析模板测试"""
+
+    def test_matches_str_format(self):
+        template = "{{literal}} {name!r} {value:.2f}% {name}\n"
+        compiled = CompiledTemplate(template)
+        fields = {"name": "case", "value": 66.666}
+
+        self.assertEqual(compiled.format(**fields), template.format(**fields))
+        self.assertEqual(compiled.format_map(fields), template.format_map(fields))
+
+    def test_missing_field_raises_key_error(self):
+        with self.assertRaises(KeyError):
+            CompiledTemplate("{missing}").format()
+
+    def test_rejects_fields_it_cannot_render(self):
+        for template in ("{a.b}", "{a[0]}", "{value:{width}}", "{}"):
+            with self.subTest(template=template), self.assertRaises(ValueError):
+                CompiledTemplate(template)
@@ -206,6 +206,24 @@ class TestTestSuite:
         has_error = any("依赖不存在" in error for error in errors)
         assert_that(has_error).is_true()
 
+    def test_suite_validate_reports_duplicates_before_dependencies(self):
+        """测试套件验证 - 同时存在重复顺序与缺失依赖"""
+        suite = TestSuite(
+            name="suite",
+            cases=[
+                CaseRef(case_id="case_1", order=1, depends_on=["case_3"]),
+                CaseRef(case_id="case_2", order=1, depends_on=["missing"]),
+                CaseRef(case_id="case_3", order=2),
+                CaseRef(case_id="case_4", order=2),
+            ],
+        )
+
+        is_valid, errors = suite.validate()
+        assert_that(is_valid).is_false()
+        assert_that(len(errors)).equals(2)
+        assert_that(errors[0]).contains("[1, 2]")
+        assert_that(errors[1]).contains("'missing'")
+
     def test_get_sorted_cases(self):
         """测试获取排序后的用例"""
         suite = TestSuite(
@@ -280,6 +298,54 @@ class TestSuiteManager:
             assert_that(loaded_suite).not_none()
             assert_that(loaded_suite.name).equals("load_test")
 
+    def test_load_suite_from_disk(self):
+        """测试从磁盘加载套件（含非ASCII内容）"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            SuiteManager(storage_dir=tmpdir).create_suite(
+                {
+                    "name": "disk_suite",
+                    "description": "磁盘套件",
+                    "cases": [{"case_id": "case_1", "order": 1}],
+                }
+            )
+
+            loaded_suite = SuiteManager(storage_dir=tmpdir).load_suite("disk_suite")
+            assert_that(loaded_suite).not_none()
+            assert_that(loaded_suite.description).equals("磁盘套件")
+            assert_that(loaded_suite.cases[0].case_id).equals("case_1")
+
+    def test_create_suites_bulk(self):
+        """测试批量创建套件"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            suite_file = Path(tmpdir) / "input.json"
+            suite_file.write_text(
+                json.dumps({"name": "from_file", "cases": []}), encoding="utf-8"
+            )
+            manager = SuiteManager(storage_dir=Path(tmpdir) / "suites")
+
+            suites = manager.create_suites_bulk(
+                [{"name": f"bulk_{i}", "cases": []} for i in range(3)] + [suite_file]
+            )
+
+            assert_that([s.name for s in suites]).equals(
+                ["bulk_0", "bulk_1", "bulk_2", "from_file"]
+            )
+            assert_that(
+                SuiteManager(storage_dir=manager.storage_dir).list_suites()
+            ).equals(["bulk_0", "bulk_1", "bulk_2", "from_file"])
+
+    def test_create_suites_bulk_writes_nothing_on_invalid_input(self):
+        """测试批量创建时任一输入无效则不写入"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = SuiteManager(storage_dir=tmpdir)
+
+            with assert_raises(FileNotFoundError):
+                manager.create_suites_bulk(
+                    [{"name": "ok", "cases": []}, Path(tmpdir) / "missing.json"]
+                )
+
+            assert_that(manager.list_suites()).equals([])
+
     def test_load_nonexistent_suite(self):
         """测试加载不存在的套件"""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -22,6 +22,31 @@ class TestMockServer:
         assert route.method == "GET"
         assert route.response["status"] == 200
 
+    def test_mock_route_matches(self):
+        """测试路由自身的匹配逻辑"""
+        from ptest.mock import MockRoute
+
+        literal = MockRoute(path="/api/test", method="GET", response={})
+        assert literal.match_target("/api/test", "GET")
+        assert not literal.match_target("/api/test/1", "GET")
+        assert not literal.match_target("/api/test", "POST")
+        assert literal.check_conditions({}, lambda: None)
+
+        param = MockRoute(
+            path="/users/{id}",
+            method="POST",
+            response={},
+            when={"headers": {"X-Token": "t"}, "body": {"role": "admin"}},
+        )
+        assert param.match_target("/users/7", "POST")
+        assert not param.match_target("/users/7/x", "POST")
+        assert param.check_conditions({"x-token": "t"}, lambda: {"role": "admin"})
+        assert not param.check_conditions({"x-token": "t"}, lambda: {"role": "guest"})
+
+        dotted = MockRoute(path="/files/{name}.json", method="GET", response={})
+        assert dotted.match_target("/files/a.json", "GET")
+        assert not dotted.match_target("/files/aXjson", "GET")
+
     def test_mock_config_serialization(self):
         """测试Mock配置序列化"""
         from ptest.mock import MockConfig, MockRoute
@@ -63,6 +88,154 @@ class TestMockServer:
         assert request.path == "/api/test"
         assert request.headers["Content-Type"] == "application/json"
 
+    def test_find_matching_route_lazy_body(self):
+        """测试仅在需要时解析请求体"""
+        from ptest.mock import MockConfig, MockServer
+
+        server = MockServer(MockConfig(name="lazy_body"))
+        server.add_route("/api/pay", "POST", {"status": 200})
+        server.add_route(
+            "/api/pay", "POST", {"status": 201}, when={"body": {"amount": 1}}
+        )
+
+        calls = []
+
+        def get_body():
+            calls.append(1)
+            return {"amount": 1}
+
+        route = server.find_matching_route("/api/pay", "POST", {}, get_body)
+        assert route is not None
+        assert route.response["status"] == 201
+        assert len(calls) == 1
+
+        calls.clear()
+        assert server.find_matching_route("/missing", "POST", {}, get_body) is None
+        assert calls == []
+
+    def test_find_matching_route_priority(self):
+        """测试条件路由优先于无条件路由"""
+        from ptest.mock import MockConfig, MockServer
+
+        server = MockServer(MockConfig(name="priority"))
+        plain_id = server.add_route("/users/{id}", "GET", {"status": 200})
+        cond_id = server.add_route(
+            "/users/{id}",
+            "GET",
+            {"status": 202},
+            when={"headers": {"X-Mode": "special"}},
+        )
+
+        route = server.find_matching_route(
+            "/users/1", "get", {"X-Mode": "special"}, None
+        )
+        assert route.route_id == cond_id
+        route = server.find_matching_route(
+            "/users/1", "GET", {"x-mode": "special"}, None
+        )
+        assert route.route_id == cond_id
+        route = server.find_matching_route("/users/1", "GET", {}, None)
+        assert route.route_id == plain_id
+        assert server.find_matching_route("/users/1", "DELETE", {}, None) is None
+
+    def test_mock_config_record_headers(self):
+        """测试关闭请求头记录"""
+        from ptest.mock import MockConfig, MockServer
+
+        config = MockConfig(name="no_headers", record_headers=False)
+        assert MockConfig.from_dict(config.to_dict()).record_headers is False
+
+        server = MockServer(config)
+        server._record_request("GET", "/a", {"X-Token": "t"}, "")
+        assert server.get_request_history()[0].headers == {}
+
+    def test_process_template(self):
+        """测试响应体模板变量替换"""
+        from ptest.mock import MockConfig, MockRoute, MockServer
+
+        route = MockRoute(
+            path="/api/order",
+            method="POST",
+            response={"body": {"id": "{{uuid}}", "raw": "{x} {{other}}", "n": 1}},
+        )
+        assert route._template_plan == {"id": "{uuid}"}
+        assert route._encoded_body is None
+
+        static = MockRoute(
+            path="/api/static",
+            method="GET",
+            response={"status": 201, "body": {"ok": True}},
+        )
+        assert static._status == 201
+        assert static._encoded_body == b'{"ok":true}\n'
+        assert static._response_headers["Content-Length"] == "12"
+
+        server = MockServer(MockConfig(name="template"))
+        body = server._process_template(route.response["body"], route._template_plan)
+        assert len(body["id"]) == 36
+        assert body["raw"] == "{x} {{other}}"
+        assert body["n"] == 1
+
+        body = server._process_template(
+            {"ts": "t={{timestamp}}", "ts2": "{{timestamp}}"}
+        )
+        assert body["ts"].startswith("t=") and body["ts"][2:].isdigit()
+        assert body["ts"][2:] == body["ts2"]
+
+        body = server._process_template(
+            {"id": "{{uuid}}", "ref": "o-{{uuid}}-{{uuid}}"}
+        )
+        assert body["ref"] == f"o-{body['id']}-{body['id']}"
+        again = server._process_template({"id": "{{uuid}}"})
+        assert again["id"] != body["id"]
+
+    def test_encoded_body_matches_jsonify(self):
+        """测试预编码响应体与 jsonify 输出一致，且随 response 重新赋值刷新"""
+        flask = pytest.importorskip("flask")
+        from ptest.mock import MockRoute
+
+        body = {"z": 1, "a": "é", "nested": {"b": [1, 2], "a": None}}
+        route = MockRoute(path="/s", method="GET", response={"body": body})
+        with flask.Flask("encoded").app_context():
+            assert route._encoded_body == flask.jsonify(body).get_data()
+
+        route.response = {"status": 202, "body": {"id": "{{uuid}}"}}
+        assert route._status == 202
+        assert route._template_plan == {"id": "{uuid}"}
+        assert route._encoded_body is None
+
+        route.response = {"body": {"ok": False}}
+        assert route._encoded_body == b'{"ok":false}\n'
+        assert route._response_headers["Content-Length"] == "13"
+
+    def test_malformed_json_body_returns_400(self, monkeypatch):
+        """测试格式错误的JSON请求体返回400"""
+        flask = pytest.importorskip("flask")
+        from ptest.mock import MockConfig, MockServer
+
+        monkeypatch.setattr(flask.Flask, "run", lambda self, **kwargs: None)
+        server = MockServer(MockConfig(name="bad_json", request_history_limit=0))
+        server.add_route("/api/items", "POST", {"body": {"ok": True}})
+        server.start()
+        client = server._app.test_client()
+
+        bad = client.post(
+            "/api/items", data="{not json", content_type="application/json"
+        )
+        assert bad.status_code == 400
+
+        good = client.post("/api/items", json={"a": 1})
+        assert good.status_code == 200
+        assert good.get_json() == {"ok": True}
+
+    def test_request_history_disabled(self):
+        """测试历史记录上限为0时不记录请求"""
+        from ptest.mock import MockConfig, MockServer
+
+        server = MockServer(MockConfig(name="no_history", request_history_limit=0))
+        server._record_request("GET", "/a", {}, "")
+        assert server.get_request_history() == []
+
 
 class TestParallelExecution:
     """并行执行测试"""